@@ -0,0 +1,89 @@
+"""
+インメモリキャッシュ
+"""
+
+from collections import OrderedDict
+from typing import Generic, Hashable, List, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    最大件数を超えると最も長く参照されていないエントリから破棄するキャッシュ
+
+    イベントループのスレッドからのみ操作されることを前提としており、ロックは使用しません。
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        """
+        初期化
+
+        Args:
+            max_entries: 保持する最大エントリ数
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        エントリを取得
+
+        Args:
+            key: キー
+
+        Returns:
+            キャッシュされた値。存在しない場合はNone
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        エントリを登録
+
+        Args:
+            key: キー
+            value: 値
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def keys(self) -> List[Hashable]:
+        """
+        全てのキーを取得（参照が古い順）
+
+        Returns:
+            キーの一覧
+        """
+        return list(self._entries)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """
+        エントリを削除
+
+        Args:
+            key: キー
+
+        Returns:
+            削除した値。存在しない場合はNone
+        """
+        return self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        全てのエントリを削除
+        """
+        self._entries.clear()
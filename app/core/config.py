@@ -1,11 +1,94 @@
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     READ_ONLY_MODE: bool = False
 
+    # GET /api/examples のページサイズ（limit 未指定時の既定値と上限）
+    EXAMPLES_DEFAULT_PAGE_SIZE: int = 100
+    EXAMPLES_MAX_PAGE_SIZE: int = 1000
+    # バッチ取得（/api/examples/batch, /api/examples:batchGet）で一度に指定できるIDの最大数
+    EXAMPLES_MAX_BATCH_SIZE: int = 100
+    # エクスポート（/api/examples/export, MCPリソース）で1回に読み出す件数
+    EXAMPLES_EXPORT_CHUNK_SIZE: int = 500
+    # 全文検索（/api/examples/search）の取得件数（limit 未指定時の既定値と上限）
+    EXAMPLES_SEARCH_DEFAULT_LIMIT: int = 10
+    EXAMPLES_SEARCH_MAX_LIMIT: int = 100
+
+    # 読み取り専用モードでキャッシュするレスポンスの最大件数
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # レスポンス圧縮（gzip / brotli）。COMPRESSION_MIN_SIZE バイト未満のレスポンスは圧縮しない
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # 圧縮済みのボディをキャッシュする最大件数
+    COMPRESSION_CACHE_MAX_ENTRIES: int = 256
+
+    # JSONエンコーダー（"auto", "stdlib", "orjson", "msgspec"）
+    JSON_RESPONSE_CLASS: str = "auto"
+
+    # MCPサーバーの構築を /mcp への最初のリクエストまで遅延させる（Lambdaのコールドスタート短縮用）
+    MCP_LAZY_INIT: bool = False
+
+    # MCPツールの結果キャッシュ（ツール名 -> TTL秒。指定したツールのみ結果をキャッシュする）
+    # 未指定の場合、EXAMPLES_STORAGE が "memory" のときは参照系のツールをキャッシュし、
+    # 複数のプロセスから書き込まれる "sqlite" のときはキャッシュしない（tool_cache.py を参照）
+    MCP_TOOL_CACHE_ENABLED: bool = True
+    MCP_TOOL_CACHE_TTLS: Optional[Dict[str, float]] = None
+    MCP_TOOL_CACHE_MAX_ENTRIES: int = 1024
+
+    # 起動時に読み込むOpenAPIスナップショット（.json/.yaml）。ルート定義と一致しない場合は無視される
+    OPENAPI_SNAPSHOT_PATH: Optional[str] = None
+
+    # ロギング（LOG_LEVELS はモジュールごとのレベル。例: {"app.main": "DEBUG", "fastapi_mcp": "WARNING"}）
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {}
+    LOG_FORMAT: str = "json"
+    # 例外発生時にログへ出力するリクエストボディの最大バイト数（0の場合は出力しない）
+    LOG_REQUEST_BODY_MAX_BYTES: int = 1024
+
+    # レイテンシメトリクスの収集（/metrics とMCPリソースで公開）と、保持する系列の最大数
+    METRICS_ENABLED: bool = True
+    METRICS_MAX_SERIES: int = 1000
+
+    # サンプルデータのストレージ（"memory" または "sqlite"）
+    EXAMPLES_STORAGE: str = "memory"
+    # SQLiteのデータベースファイルと、コネクションプール（クエリを実行するスレッド数）の大きさ
+    SQLITE_PATH: str = "data/examples.db"
+    SQLITE_POOL_SIZE: int = 4
+
+    # 本番サーバー（gunicorn + uvicorn ワーカー。app.core.gunicorn_conf で使用）
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # ワーカー数（0 の場合は利用可能なCPU数。コンテナのCPUクォータを考慮）
+    SERVER_WORKERS: int = 0
+    # イベントループ（"auto", "uvloop", "asyncio"）とHTTPパーサー（"auto", "httptools", "h11"）
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    # キープアライブの秒数（ロードバランサーのアイドルタイムアウト（ALB は60秒）より長くし、
+    # ロードバランサーが再利用しようとした接続をサーバーが先に閉じないようにする）
+    SERVER_KEEPALIVE_SECONDS: int = 65
+    # 受け付け待ちの接続の最大数（listen のバックログ）
+    SERVER_BACKLOG: int = 2048
+    # ワーカーが処理するリクエスト数の上限（メモリの断片化やリーク対策。ジッターで再起動を分散）
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    # ワーカーが応答しない場合に再起動するまでの秒数と、終了時に処理中のリクエストを待つ秒数
+    SERVER_WORKER_TIMEOUT_SECONDS: int = 60
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # X-Forwarded-* ヘッダーを信頼する送信元（カンマ区切り、"*" は全て）
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    SERVER_ACCESS_LOG: bool = False
+    # マスタープロセスでアプリケーションを構築してからワーカーを fork する（preload）。
+    # gc.freeze() で構築済みのオブジェクトを GC の対象外にし、コピーオンライトでメモリを共有する
+    SERVER_PRELOAD: bool = True
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,244 @@
+"""
+本番サーバー（gunicorn + uvicorn ワーカー）の設定
+
+gunicorn の設定ファイルとして読み込まれ、Settings の SERVER_* から各設定値を決定します。
+
+    gunicorn -c python:app.core.gunicorn_conf app.main:app
+
+- ワーカー数: SERVER_WORKERS（0 の場合は利用可能なCPU数。コンテナのCPUクォータを考慮）
+- イベントループ / HTTPパーサー: uvloop / httptools がインストールされていれば使用
+- キープアライブ・バックログ・max-requests による再起動・グレースフルシャットダウン
+- preload（SERVER_PRELOAD）: マスタープロセスでアプリケーションを構築し、gc.freeze() してから
+  ワーカーを fork する。ワーカーはコピーオンライトでメモリを共有し、再起動時の読み込みも不要になる
+- 各ワーカーの起動時間と RSS / PSS をログに出力
+"""
+
+import gc
+import importlib.util
+import math
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def _read_cgroup_cpu_limit(cgroup_root: str) -> Optional[float]:
+    """
+    cgroup のCPUクォータ（CPU数換算）を読み込む
+
+    Args:
+        cgroup_root: cgroup ファイルシステムのマウント先
+
+    Returns:
+        クォータのCPU数（制限がない場合や読み込めない場合は None）
+    """
+    try:
+        # cgroup v2: "<quota> <period>"（制限なしの場合は "max <period>"）
+        with open(os.path.join(cgroup_root, "cpu.max"), encoding="ascii") as f:
+            quota, period = f.read().split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: 制限なしの場合は quota が -1
+        cpu_dir = os.path.join(cgroup_root, "cpu")
+        with open(os.path.join(cpu_dir, "cpu.cfs_quota_us"), encoding="ascii") as f:
+            quota_us = int(f.read())
+        with open(os.path.join(cpu_dir, "cpu.cfs_period_us"), encoding="ascii") as f:
+            period_us = int(f.read())
+    except (OSError, ValueError):
+        return None
+    if quota_us <= 0 or period_us <= 0:
+        return None
+    return quota_us / period_us
+
+
+def available_cpus(cgroup_root: str = CGROUP_ROOT) -> int:
+    """
+    このプロセスが利用できるCPU数
+
+    CPUアフィニティとコンテナのCPUクォータのうち小さい方です（クォータは切り上げ）。
+
+    Args:
+        cgroup_root: cgroup ファイルシステムのマウント先
+
+    Returns:
+        CPU数（1以上）
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _read_cgroup_cpu_limit(cgroup_root)
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def resolve_workers(configured: int, cgroup_root: str = CGROUP_ROOT) -> int:
+    """
+    ワーカー数を決定
+
+    uvicorn ワーカーは非同期で I/O 待ちの間も他のリクエストを処理できるため、
+    同期ワーカーの定番の「2 * CPU + 1」ではなく CPU数と同じ数にします。
+
+    Args:
+        configured: SERVER_WORKERS の値（0 以下の場合は自動）
+        cgroup_root: cgroup ファイルシステムのマウント先
+
+    Returns:
+        ワーカー数
+    """
+    if configured > 0:
+        return configured
+    return available_cpus(cgroup_root)
+
+
+def _resolve_implementation(configured: str, fast: str, fallback: str) -> str:
+    if configured != "auto":
+        return configured
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
+def resolve_loop(configured: str) -> str:
+    """
+    uvicorn のイベントループの実装を決定
+
+    Args:
+        configured: SERVER_LOOP の値（"auto", "uvloop", "asyncio"）
+
+    Returns:
+        "auto" の場合は uvloop がインストールされていれば "uvloop"、なければ "asyncio"
+    """
+    return _resolve_implementation(configured, "uvloop", "asyncio")
+
+
+def resolve_http(configured: str) -> str:
+    """
+    uvicorn のHTTPパーサーの実装を決定
+
+    Args:
+        configured: SERVER_HTTP の値（"auto", "httptools", "h11"）
+
+    Returns:
+        "auto" の場合は httptools がインストールされていれば "httptools"、なければ "h11"
+    """
+    return _resolve_implementation(configured, "httptools", "h11")
+
+
+def process_memory(pid: Any = "self") -> Dict[str, int]:
+    """
+    プロセスのメモリ使用量を /proc/<pid>/smaps_rollup から取得
+
+    PSS（Proportional Set Size）は共有ページをプロセス数で按分した値で、fork したワーカー間で
+    コピーオンライトにより共有されているメモリを重複して数えません。
+
+    Args:
+        pid: プロセスID（既定は自プロセス）
+
+    Returns:
+        rss_kib, pss_kib, shared_kib, private_kib（取得できない場合は空）
+    """
+    fields: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.endswith("kB\n"):
+                    fields[name] = int(value.split()[0])
+    except OSError:
+        return {}
+    return {
+        "rss_kib": fields.get("Rss", 0),
+        "pss_kib": fields.get("Pss", 0),
+        "shared_kib": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_kib": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+# gunicorn の設定値（https://docs.gunicorn.org/en/stable/settings.html）
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = resolve_workers(settings.SERVER_WORKERS)
+worker_class = "app.core.uvicorn_worker.TunedUvicornWorker"
+preload_app = settings.SERVER_PRELOAD
+backlog = settings.SERVER_BACKLOG
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+timeout = settings.SERVER_WORKER_TIMEOUT_SECONDS
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+# ロードバランサーからの X-Forwarded-* を信頼する送信元
+forwarded_allow_ips = settings.SERVER_FORWARDED_ALLOW_IPS
+# コンテナではディスクではなく共有メモリにハートビートのファイルを置く
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+accesslog = "-" if settings.SERVER_ACCESS_LOG else None
+errorlog = "-"
+loglevel = settings.LOG_LEVEL.lower()
+proc_name = "fastapi-mcp"
+
+
+def on_starting(server) -> None:  # type: ignore[no-untyped-def]
+    """
+    マスタープロセスの起動時に、決定した設定を出力
+    """
+    server.log.info(
+        "Starting %d workers (loop=%s, http=%s, keepalive=%ds, backlog=%d, "
+        "max_requests=%d+%d)",
+        workers,
+        resolve_loop(settings.SERVER_LOOP),
+        resolve_http(settings.SERVER_HTTP),
+        keepalive,
+        backlog,
+        max_requests,
+        max_requests_jitter,
+    )
+
+
+def when_ready(server) -> None:  # type: ignore[no-untyped-def]
+    """
+    ワーカーを fork する前に、preload したアプリケーションを準備して凍結
+
+    OpenAPIスキーマとミドルウェアスタックは最初のリクエストで構築されるため、ここで構築して
+    全ワーカーで共有します。その後 gc.freeze() で全オブジェクトを GC の対象外にし、
+    ワーカーの GC がオブジェクトのヘッダーに書き込んで共有ページが複製されるのを防ぎます。
+    """
+    if not server.cfg.preload_app:
+        return
+    app = server.app.wsgi()
+    if hasattr(app, "openapi"):
+        app.openapi()
+    if getattr(app, "middleware_stack", True) is None:
+        app.middleware_stack = app.build_middleware_stack()
+    gc.collect()
+    gc.freeze()
+    server.log.info(
+        "Preloaded the application and froze %d objects (master rss=%d KiB)",
+        gc.get_freeze_count(),
+        process_memory().get("rss_kib", 0),
+    )
+
+
+def pre_fork(server, worker) -> None:  # type: ignore[no-untyped-def]
+    """
+    fork の直前の時刻を記録（ワーカーの起動時間の計測用）
+    """
+    worker.forked_at = time.monotonic()
+
+
+def post_worker_init(worker) -> None:  # type: ignore[no-untyped-def]
+    """
+    ワーカーの起動完了時に、起動時間（fork からアプリケーションの読み込みまで）とメモリを出力
+    """
+    memory = process_memory()
+    worker.log.info(
+        "Worker %d booted in %.1f ms (rss=%d KiB, pss=%d KiB)",
+        worker.pid,
+        (time.monotonic() - worker.forked_at) * 1000,
+        memory.get("rss_kib", 0),
+        memory.get("pss_kib", 0),
+    )
@@ -0,0 +1,140 @@
+"""
+JSONレスポンスクラスの選択
+
+settings.JSON_RESPONSE_CLASS で使用するJSONエンコーダーを切り替えます。
+
+- "stdlib": 標準ライブラリの json（Starlette の JSONResponse）
+- "orjson": orjson
+- "msgspec": msgspec
+- "auto": インストールされているものから msgspec -> orjson -> stdlib の順に選択
+
+指定したライブラリがインストールされていない場合は stdlib にフォールバックします。
+"""
+
+import importlib.util
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StdlibJSONResponse(JSONResponse):
+    """
+    標準ライブラリの json を使用するJSONレスポンス
+    """
+
+
+class OrjsonJSONResponse(JSONResponse):
+    """
+    orjson を使用するJSONレスポンス
+    """
+
+    def render(self, content: Any) -> bytes:
+        import orjson
+
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """
+    msgspec を使用するJSONレスポンス
+    """
+
+    def render(self, content: Any) -> bytes:
+        import msgspec
+
+        return msgspec.json.encode(content)
+
+
+JSON_RESPONSE_CLASSES: Dict[str, Type[JSONResponse]] = {
+    "stdlib": StdlibJSONResponse,
+    "orjson": OrjsonJSONResponse,
+    "msgspec": MsgspecJSONResponse,
+}
+
+# "auto" 指定時の優先順位
+_AUTO_PREFERENCE = ("msgspec", "orjson", "stdlib")
+
+
+def is_encoder_available(name: str) -> bool:
+    """
+    エンコーダーが利用可能か判定
+
+    Args:
+        name: エンコーダー名
+
+    Returns:
+        利用可能な場合はTrue
+    """
+    return name == "stdlib" or importlib.util.find_spec(name) is not None
+
+
+@lru_cache(maxsize=None)
+def get_json_response_class(name: str = "auto") -> Type[JSONResponse]:
+    """
+    JSONレスポンスクラスを取得
+
+    Args:
+        name: エンコーダー名（"auto", "stdlib", "orjson", "msgspec"）
+
+    Returns:
+        JSONレスポンスクラス
+
+    Raises:
+        ValueError: 未知のエンコーダー名が指定された場合
+    """
+    if name == "auto":
+        name = next(candidate for candidate in _AUTO_PREFERENCE if is_encoder_available(candidate))
+    if name not in JSON_RESPONSE_CLASSES:
+        raise ValueError(
+            f"Unknown JSON encoder: {name}. Choose from auto, {', '.join(JSON_RESPONSE_CLASSES)}"
+        )
+    if not is_encoder_available(name):
+        logger.warning("%s がインストールされていないため、stdlib のJSONエンコーダーを使用します", name)
+        name = "stdlib"
+    return JSON_RESPONSE_CLASSES[name]
+
+
+@lru_cache(maxsize=None)
+def get_json_encoder(name: str = "auto") -> Callable[[Any], bytes]:
+    """
+    JSONレスポンスクラスと同じエンコーダーでバイト列に変換する関数を取得
+
+    ストリーミングレスポンスのように、レスポンスクラスを経由せずにエンコードする場合に使用します。
+
+    Args:
+        name: エンコーダー名（"auto", "stdlib", "orjson", "msgspec"）
+
+    Returns:
+        JSONのバイト列に変換する関数
+    """
+    # render() はインスタンスの状態を参照しないため、1つのインスタンスのメソッドを使い回す
+    return get_json_response_class(name)(content=None).render
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> JSONResponse:
+    """
+    設定されたJSONエンコーダーでレスポンスを生成
+
+    dict/list などJSONにそのまま変換できるペイロードを返すエンドポイント向けです。
+    Responseを直接返すことで、FastAPIの response_model の検証と jsonable_encoder を省略します。
+
+    Args:
+        content: JSONに変換するペイロード
+        status_code: ステータスコード
+        headers: 追加のレスポンスヘッダー
+
+    Returns:
+        JSONレスポンス
+    """
+    response_class = get_json_response_class(settings.JSON_RESPONSE_CLASS)
+    return response_class(content=content, status_code=status_code, headers=headers)
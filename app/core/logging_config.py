@@ -0,0 +1,188 @@
+"""
+ロギング設定
+
+ログレコードはキュー（QueueHandler）に積むだけで呼び出し元に戻り、フォーマットと出力は
+バックグラウンドスレッドの QueueListener が行います。イベントループ上での同期的な
+I/Oを避け、エラーが集中した場合でも正常なリクエストのレイテンシに影響しないようにします。
+
+- 出力形式: JSON Lines（LOG_FORMAT="json"）またはテキスト（LOG_FORMAT="text"）
+- ログレベル: LOG_LEVEL（ルート）と LOG_LEVELS（モジュールごと）で設定
+- fork した子プロセス（gunicorn の preload 後のワーカーなど）ではリスナースレッドを作り直す
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from starlette.requests import Request
+
+from app.core.config import Settings
+
+# LogRecord の標準属性（extra で渡された属性と区別するため）
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__.keys()
+) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """
+    1レコードを1行のJSONとして出力するフォーマッター
+
+    logger.info("...", extra={"path": "/api"}) のように extra で渡した値もフィールドとして出力します。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """
+    フォーマット処理をリスナースレッドに委ねる QueueHandler
+
+    標準の QueueHandler は呼び出し元のスレッドでトレースバックを含めてフォーマットしますが、
+    同一プロセス内のキューではピクル化が不要なため、メッセージの展開のみ行います。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(settings: Settings) -> None:
+    """
+    ロギングを設定
+
+    複数回呼び出した場合は、ハンドラーを作り直さずにログレベルのみ再設定します。
+
+    Args:
+        settings: アプリケーション設定
+    """
+    global _listener, _queue_handler
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JSONLinesFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _queue_handler = DeferredFormattingQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    root.handlers = [_queue_handler]
+    atexit.register(shutdown_logging)
+
+
+def _restart_listener_after_fork() -> None:
+    """
+    fork した子プロセスでリスナースレッドを作り直す
+
+    スレッドは fork で複製されないため、そのままではキューに積んだログが出力されません。
+    親プロセスのスレッドが使用中だった可能性があるキューも新しいものに置き換えます。
+    """
+    global _listener
+
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def shutdown_logging() -> None:
+    """
+    キューに残っているログを出力し、リスナースレッドを停止
+    """
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+    _listener.stop()
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
+
+
+# ログに出力しないリクエストヘッダー
+_SENSITIVE_HEADERS = frozenset(("authorization", "proxy-authorization", "cookie", "x-api-key"))
+
+
+def redact_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """
+    認証情報を含むヘッダーをマスクした辞書を作成
+
+    Args:
+        headers: リクエストヘッダー
+
+    Returns:
+        マスク済みのヘッダー
+    """
+    return {
+        name: "***" if name.lower() in _SENSITIVE_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+async def capture_request_body(request: Request, max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    リクエストボディを先頭から最大 max_bytes まで読み込む
+
+    上限に達した時点で読み込みを打ち切るため、大きなボディ全体をメモリに載せることはありません。
+
+    Args:
+        request: リクエスト
+        max_bytes: 読み込む最大バイト数
+
+    Returns:
+        (読み込んだボディ, 上限で切り詰めた場合はTrue)
+    """
+    if max_bytes <= 0:
+        return b"", False
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            break
+    body = b"".join(chunks)
+    return body[:max_bytes], size > max_bytes
@@ -0,0 +1,263 @@
+"""
+インプロセスのメトリクス収集
+
+ルート・MCPツール・ステータスコードごとのレイテンシを HDR 形式のヒストグラムで集計し、
+Prometheus のテキスト形式または JSON で出力します。
+
+記録処理はバケット位置の計算と整数の加算のみで、ロックもメモリ確保も行いません。
+イベントループのスレッドからのみ記録されることを前提としています（LRUCache と同様）。
+系列数は max_series で制限し、超過した観測は破棄して件数のみを数えます。
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# 2の累乗ごとの区間を 16 分割する（相対誤差は最大 1/16）
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+# 記録できる最大値（マイクロ秒、約71分）。これを超える値は最大値として記録する
+_MAX_VALUE_US = (1 << 32) - 1
+_MAX_SHIFT = _MAX_VALUE_US.bit_length() - _SUB_BUCKET_BITS
+BUCKET_COUNT = _SUB_BUCKET_COUNT + _MAX_SHIFT * _SUB_BUCKET_HALF
+
+# 出力するパーセンタイル
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+# メトリクス名と、それぞれのラベル名
+HTTP_REQUEST_DURATION = "http_request_duration_seconds"
+MCP_TOOL_DURATION = "mcp_tool_duration_seconds"
+METRIC_LABELS: Dict[str, Tuple[str, ...]] = {
+    HTTP_REQUEST_DURATION: ("method", "route", "status", "source"),
+    MCP_TOOL_DURATION: ("tool", "status"),
+}
+METRIC_HELP: Dict[str, str] = {
+    HTTP_REQUEST_DURATION: "HTTP request latency by route, status code and caller (rest or mcp).",
+    MCP_TOOL_DURATION: "MCP tool call latency by tool name and result.",
+}
+
+LabelValues = Tuple[str, ...]
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < _SUB_BUCKET_COUNT:
+        return value_us if value_us > 0 else 0
+    if value_us > _MAX_VALUE_US:
+        value_us = _MAX_VALUE_US
+    shift = value_us.bit_length() - _SUB_BUCKET_BITS
+    return _SUB_BUCKET_COUNT + (shift - 1) * _SUB_BUCKET_HALF + (value_us >> shift) - _SUB_BUCKET_HALF
+
+
+def _bucket_value(index: int) -> int:
+    # バケットの代表値（区間の中央値）
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = (index - _SUB_BUCKET_COUNT) // _SUB_BUCKET_HALF + 1
+    sub_bucket = (index - _SUB_BUCKET_COUNT) % _SUB_BUCKET_HALF + _SUB_BUCKET_HALF
+    return (sub_bucket << shift) + (1 << (shift - 1))
+
+
+class LatencyHistogram:
+    """
+    対数線形バケット（HDR Histogram 方式）のレイテンシヒストグラム
+
+    マイクロ秒単位で記録し、バケット数は固定（BUCKET_COUNT）です。
+    """
+
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, value_us: int) -> None:
+        """
+        値を記録
+
+        Args:
+            value_us: レイテンシ（マイクロ秒）
+        """
+        self.counts[_bucket_index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, quantile: float) -> int:
+        """
+        パーセンタイルを計算
+
+        Args:
+            quantile: 0〜1 の割合
+
+        Returns:
+            パーセンタイル値（マイクロ秒）。記録がない場合は0
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, int(quantile * self.count + 0.5))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return min(_bucket_value(index), self.max_us)
+        return self.max_us
+
+
+class MetricsRegistry:
+    """
+    メトリクスのレジストリ
+
+    メトリクス名とラベル値の組ごとに LatencyHistogram を保持します。
+    """
+
+    def __init__(self, max_series: int = 1000) -> None:
+        """
+        初期化
+
+        Args:
+            max_series: 保持する系列（メトリクス名とラベル値の組）の最大数
+        """
+        self.max_series = max_series
+        self.dropped = 0
+        self._series: Dict[Tuple[str, LabelValues], LatencyHistogram] = {}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def observe(self, name: str, labels: LabelValues, duration_ns: int) -> None:
+        """
+        レイテンシを記録
+
+        Args:
+            name: メトリクス名（METRIC_LABELS のキー）
+            labels: ラベル値（METRIC_LABELS[name] の順）
+            duration_ns: レイテンシ（ナノ秒）
+        """
+        key = (name, labels)
+        histogram = self._series.get(key)
+        if histogram is None:
+            if len(self._series) >= self.max_series:
+                self.dropped += 1
+                return
+            histogram = self._series[key] = LatencyHistogram()
+        histogram.record(duration_ns // 1000)
+
+    def observe_request(
+        self, method: str, route: str, status: int, source: str, duration_ns: int
+    ) -> None:
+        """
+        HTTPリクエストのレイテンシを記録
+
+        Args:
+            method: HTTPメソッド
+            route: ルートのパステンプレート
+            status: ステータスコード
+            source: 呼び出し元（"rest" または "mcp"）
+            duration_ns: レイテンシ（ナノ秒）
+        """
+        self.observe(HTTP_REQUEST_DURATION, (method, route, str(status), source), duration_ns)
+
+    def observe_tool(self, tool: str, status: str, duration_ns: int) -> None:
+        """
+        MCPツール呼び出しのレイテンシを記録
+
+        Args:
+            tool: ツール名
+            status: 結果（"ok", "error", またはキャッシュから返した場合は "cached"）
+            duration_ns: レイテンシ（ナノ秒）
+        """
+        self.observe(MCP_TOOL_DURATION, (tool, status), duration_ns)
+
+    def get(self, name: str, labels: LabelValues) -> Optional[LatencyHistogram]:
+        """
+        系列のヒストグラムを取得
+
+        Args:
+            name: メトリクス名
+            labels: ラベル値
+
+        Returns:
+            ヒストグラム。記録がない場合はNone
+        """
+        return self._series.get((name, labels))
+
+    def clear(self) -> None:
+        """
+        全ての系列を削除
+        """
+        self._series.clear()
+        self.dropped = 0
+
+    def snapshot(self) -> Dict[str, List[Dict[str, object]]]:
+        """
+        集計結果をJSONに変換できる形式で取得
+
+        Returns:
+            メトリクス名ごとの系列一覧（件数・合計・パーセンタイル・最大値。時間はミリ秒）
+        """
+        result: Dict[str, List[Dict[str, object]]] = {name: [] for name in METRIC_LABELS}
+        for name, labels, histogram in self._sorted_series():
+            entry: Dict[str, object] = {
+                "labels": dict(zip(METRIC_LABELS[name], labels)),
+                "count": histogram.count,
+                "sum_ms": histogram.total_us / 1000,
+            }
+            for quantile in QUANTILES:
+                entry[f"p{int(quantile * 100)}_ms"] = histogram.percentile(quantile) / 1000
+            entry["max_ms"] = histogram.max_us / 1000
+            result[name].append(entry)
+        return result
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus のテキスト形式（0.0.4）で出力
+
+        各メトリクスは summary 型として、パーセンタイル・合計・件数を出力します。
+
+        Returns:
+            Prometheus のテキスト形式のメトリクス
+        """
+        lines: List[str] = []
+        series = self._sorted_series()
+        for name in METRIC_LABELS:
+            lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {name} summary")
+            for series_name, labels, histogram in series:
+                if series_name != name:
+                    continue
+                label_text = _format_labels(METRIC_LABELS[name], labels)
+                for quantile in QUANTILES:
+                    quantile_labels = _format_labels(
+                        METRIC_LABELS[name] + ("quantile",), labels + (str(quantile),)
+                    )
+                    value = histogram.percentile(quantile) / 1_000_000
+                    lines.append(f"{name}{quantile_labels} {value}")
+                lines.append(f"{name}_sum{label_text} {histogram.total_us / 1_000_000}")
+                lines.append(f"{name}_count{label_text} {histogram.count}")
+        lines.append("# HELP metrics_dropped_observations_total Observations dropped by the series limit.")
+        lines.append("# TYPE metrics_dropped_observations_total counter")
+        lines.append(f"metrics_dropped_observations_total {self.dropped}")
+        return "\n".join(lines) + "\n"
+
+    def _sorted_series(self) -> List[Tuple[str, LabelValues, LatencyHistogram]]:
+        return sorted(
+            ((name, labels, histogram) for (name, labels), histogram in self._series.items()),
+            key=lambda item: (item[0], item[1]),
+        )
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+# アプリケーション全体で共有するレジストリ
+metrics_registry = MetricsRegistry(settings.METRICS_MAX_SERIES)
@@ -0,0 +1,54 @@
+"""
+起動時間の計測
+
+app.main のインポート時間をフェーズ（dotenv, fastapi, fastapi_mcp, mangum など）ごとに記録します。
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StartupTimer:
+    """
+    フェーズごとの経過時間を記録するタイマー
+    """
+
+    def __init__(self) -> None:
+        """
+        初期化
+        """
+        self._started = time.perf_counter()
+        self._phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        フェーズの経過時間を計測するコンテキストマネージャー
+
+        同じ名前のフェーズを複数回計測した場合は合算します。
+
+        Args:
+            name: フェーズ名
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._phases[name] = self._phases.get(name, 0.0) + elapsed
+
+    def report(self) -> Dict[str, float]:
+        """
+        フェーズごとの経過時間を取得
+
+        Returns:
+            フェーズ名をキーとした経過時間（ミリ秒）。"total" は計測開始からの経過時間
+        """
+        report = {name: round(elapsed * 1000, 3) for name, elapsed in self._phases.items()}
+        report["total"] = round((time.perf_counter() - self._started) * 1000, 3)
+        return report
+
+
+# app.main の起動時間を記録するタイマー
+startup_timer = StartupTimer()
@@ -0,0 +1,28 @@
+"""
+gunicorn 用の uvicorn ワーカー
+
+Settings の SERVER_LOOP / SERVER_HTTP で選択したイベントループとHTTPパーサーを使い、
+グレースフルシャットダウンの待ち時間を gunicorn の graceful_timeout より短くします
+（gunicorn が強制終了する前に、処理中のリクエストを完了させて終了するため）。
+"""
+
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+from app.core.gunicorn_conf import resolve_http, resolve_loop
+
+
+class TunedUvicornWorker(UvicornWorker):
+    """
+    設定に合わせて uvicorn を構成するワーカー
+    """
+
+    CONFIG_KWARGS = {
+        "loop": resolve_loop(settings.SERVER_LOOP),
+        "http": resolve_http(settings.SERVER_HTTP),
+        "timeout_graceful_shutdown": max(
+            1, settings.SERVER_GRACEFUL_TIMEOUT_SECONDS - 5
+        ),
+        # Server ヘッダーを付与しない（実装の詳細を公開しない）
+        "server_header": False,
+    }
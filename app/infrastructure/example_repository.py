@@ -0,0 +1,277 @@
+"""
+サンプルデータのインメモリリポジトリ
+
+主キー（id）のハッシュインデックスと name の二次インデックスを保持し、
+レコード数に依存しない O(1) の参照を提供します。
+name と description の全文検索用に転置インデックス（search_index.py）も保持します。
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.infrastructure.search_index import InvertedIndex
+
+Example = Dict[str, Any]
+
+# サンプルが持つフィールド（フィールド射影で指定可能な名前）
+EXAMPLE_FIELDS: Tuple[str, ...] = ("id", "name", "description")
+
+# サンプルデータ（初期データ）
+EXAMPLES: List[Example] = [
+    {"id": 1, "name": "Example 1", "description": "This is example 1"},
+    {"id": 2, "name": "Example 2", "description": "This is example 2"},
+    {"id": 3, "name": "Example 3", "description": "This is example 3"},
+]
+
+
+class ExampleRepository:
+    """
+    インデックス付きのサンプルデータリポジトリ
+
+    - 主キーインデックス: id -> レコード
+    - 二次インデックス: name -> id の昇順リスト（名前で絞り込んだページネーション用）
+    - 順序インデックス: id の昇順リスト（キーセットページネーション用）
+    - 転置インデックス: name と description のトークン -> id（全文検索用）
+
+    返却するレコードは内部で保持している辞書そのものです。
+    呼び出し側で直接変更するとインデックスと不整合になるため、
+    更新は必ず update() を経由してください。
+    version はデータを変更するたびに増加し、キャッシュの無効化に使用します。
+    """
+
+    def __init__(self, examples: Optional[Iterable[Example]] = None) -> None:
+        """
+        初期化
+
+        Args:
+            examples: 初期データ
+        """
+        self._by_id: Dict[int, Example] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._ordered_ids: List[int] = []
+        self._search_index = InvertedIndex()
+        self.version = 0
+        if examples is not None:
+            self.bulk_load(examples)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, example_id: object) -> bool:
+        return example_id in self._by_id
+
+    def get(self, example_id: int) -> Optional[Example]:
+        """
+        主キーでサンプルを取得
+
+        Args:
+            example_id: サンプルID
+
+        Returns:
+            サンプル情報。存在しない場合はNone
+        """
+        return self._by_id.get(example_id)
+
+    def get_many(self, example_ids: Iterable[int]) -> Tuple[List[Example], List[int]]:
+        """
+        複数の主キーでサンプルを一括取得
+
+        Args:
+            example_ids: サンプルIDのイテラブル（重複は1件として扱う）
+
+        Returns:
+            (見つかったサンプル一覧, 見つからなかったID一覧)。いずれも指定順
+        """
+        found: List[Example] = []
+        missing: List[int] = []
+        for example_id in dict.fromkeys(example_ids):
+            example = self._by_id.get(example_id)
+            if example is None:
+                missing.append(example_id)
+            else:
+                found.append(example)
+        return found, missing
+
+    def list_all(self) -> List[Example]:
+        """
+        サンプル一覧を取得
+
+        Returns:
+            サンプル一覧（登録順）
+        """
+        return list(self._by_id.values())
+
+    def find_by_name(self, name: str) -> List[Example]:
+        """
+        name の二次インデックスでサンプルを検索
+
+        Args:
+            name: サンプル名（完全一致）
+
+        Returns:
+            一致したサンプル一覧（id の昇順）
+        """
+        ids = self._by_name.get(name)
+        if not ids:
+            return []
+        return [self._by_id[example_id] for example_id in ids]
+
+    def page(
+        self, limit: int, after_id: Optional[int] = None, name: Optional[str] = None
+    ) -> Tuple[List[Example], Optional[int]]:
+        """
+        id の昇順でサンプルをキーセットページネーションで取得
+
+        Args:
+            limit: 取得件数の上限
+            after_id: このIDより大きいサンプルから取得（Noneの場合は先頭から）
+            name: サンプル名で絞り込む場合に指定（完全一致）
+
+        Returns:
+            (サンプル一覧, 次ページが存在する場合はページ末尾のID、存在しない場合はNone)
+        """
+        ids = self._ordered_ids if name is None else self._by_name.get(name, [])
+        start = 0 if after_id is None else bisect_right(ids, after_id)
+        page_ids = ids[start : start + limit]
+        examples = [self._by_id[example_id] for example_id in page_ids]
+        has_more = start + limit < len(ids)
+        return examples, (page_ids[-1] if has_more and page_ids else None)
+
+    def search(self, query: str, limit: int) -> List[Tuple[Example, float]]:
+        """
+        name と description を全文検索（BM25 で順位付け、各検索語は前方一致）
+
+        Args:
+            query: 検索文字列
+            limit: 取得件数の上限
+
+        Returns:
+            (サンプル, スコア) の一覧（スコアの降順）
+        """
+        return [
+            (self._by_id[example_id], score)
+            for example_id, score in self._search_index.search(query, limit)
+        ]
+
+    def add(self, example: Example) -> Example:
+        """
+        サンプルを追加
+
+        Args:
+            example: サンプル情報（id を含むこと）
+
+        Returns:
+            追加したサンプル情報
+
+        Raises:
+            ValueError: 同じIDのサンプルが既に存在する場合
+        """
+        example_id = example["id"]
+        if example_id in self._by_id:
+            raise ValueError(f"Example with ID {example_id} already exists")
+        self._by_id[example_id] = example
+        self._index_name(example_id, example.get("name"))
+        self._search_index.add(
+            example_id, example.get("name"), example.get("description")
+        )
+        if not self._ordered_ids or example_id > self._ordered_ids[-1]:
+            self._ordered_ids.append(example_id)
+        else:
+            insort(self._ordered_ids, example_id)
+        self.version += 1
+        return example
+
+    def update(self, example_id: int, **fields: Any) -> Optional[Example]:
+        """
+        サンプルを更新
+
+        Args:
+            example_id: サンプルID
+            **fields: 更新するフィールド（id は変更できません）
+
+        Returns:
+            更新後のサンプル情報。存在しない場合はNone
+        """
+        example = self._by_id.get(example_id)
+        if example is None:
+            return None
+        fields.pop("id", None)
+        if "name" in fields and fields["name"] != example.get("name"):
+            self._unindex_name(example_id, example.get("name"))
+            self._index_name(example_id, fields["name"])
+        example.update(fields)
+        if "name" in fields or "description" in fields:
+            self._search_index.add(
+                example_id, example.get("name"), example.get("description")
+            )
+        self.version += 1
+        return example
+
+    def delete(self, example_id: int) -> Optional[Example]:
+        """
+        サンプルを削除
+
+        Args:
+            example_id: サンプルID
+
+        Returns:
+            削除したサンプル情報。存在しない場合はNone
+        """
+        example = self._by_id.pop(example_id, None)
+        if example is not None:
+            self._unindex_name(example_id, example.get("name"))
+            self._search_index.remove(example_id)
+            del self._ordered_ids[bisect_left(self._ordered_ids, example_id)]
+            self.version += 1
+        return example
+
+    def bulk_load(self, examples: Iterable[Example]) -> int:
+        """
+        サンプルを一括登録
+
+        Args:
+            examples: サンプル情報のイテラブル
+
+        Returns:
+            登録件数
+        """
+        count = 0
+        for example in examples:
+            self.add(dict(example))
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        """
+        全てのサンプルとインデックスを削除
+        """
+        self._by_id.clear()
+        self._by_name.clear()
+        self._ordered_ids.clear()
+        self._search_index.clear()
+        self.version += 1
+
+    def _index_name(self, example_id: int, name: Optional[str]) -> None:
+        if name is None:
+            return
+        ids = self._by_name.setdefault(name, [])
+        if not ids or example_id > ids[-1]:
+            ids.append(example_id)
+        else:
+            insort(ids, example_id)
+
+    def _unindex_name(self, example_id: int, name: Optional[str]) -> None:
+        if name is None:
+            return
+        ids = self._by_name.get(name)
+        if ids is None:
+            return
+        index = bisect_left(ids, example_id)
+        if index < len(ids) and ids[index] == example_id:
+            del ids[index]
+        if not ids:
+            del self._by_name[name]
+
+
+# アプリケーション全体で共有するリポジトリ
+example_repository = ExampleRepository(EXAMPLES)
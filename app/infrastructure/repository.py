@@ -0,0 +1,248 @@
+"""
+サンプルデータのリポジトリインターフェース
+
+ストレージの実装（インメモリ / SQLite）を差し替えられるよう、非同期のインターフェースを定義します。
+使用する実装は settings.EXAMPLES_STORAGE で選択します。
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.infrastructure.example_repository import Example, ExampleRepository, example_repository
+
+
+class AsyncExampleRepository(ABC):
+    """
+    サンプルデータの非同期リポジトリのインターフェース
+
+    version はデータを変更するたびに増加する値で、キャッシュの無効化に使用します。
+    """
+
+    version: int = 0
+
+    @abstractmethod
+    async def get(self, example_id: int) -> Optional[Example]:
+        """
+        主キーでサンプルを取得
+
+        Args:
+            example_id: サンプルID
+
+        Returns:
+            サンプル情報。存在しない場合はNone
+        """
+
+    @abstractmethod
+    async def get_many(self, example_ids: Sequence[int]) -> Tuple[List[Example], List[int]]:
+        """
+        複数の主キーでサンプルを一括取得
+
+        Args:
+            example_ids: サンプルIDの一覧（重複は1件として扱う）
+
+        Returns:
+            (見つかったサンプル一覧, 見つからなかったID一覧)。いずれも指定順
+        """
+
+    @abstractmethod
+    async def page(
+        self, limit: int, after_id: Optional[int] = None, name: Optional[str] = None
+    ) -> Tuple[List[Example], Optional[int]]:
+        """
+        id の昇順でサンプルをキーセットページネーションで取得
+
+        Args:
+            limit: 取得件数の上限
+            after_id: このIDより大きいサンプルから取得（Noneの場合は先頭から）
+            name: サンプル名で絞り込む場合に指定（完全一致）
+
+        Returns:
+            (サンプル一覧, 次ページが存在する場合はページ末尾のID、存在しない場合はNone)
+        """
+
+    @abstractmethod
+    async def search(self, query: str, limit: int) -> List[Tuple[Example, float]]:
+        """
+        name と description を全文検索
+
+        検索語ごとに前方一致で照合し、BM25 のスコアが高い順に返します。
+
+        Args:
+            query: 検索文字列
+            limit: 取得件数の上限
+
+        Returns:
+            (サンプル, スコア) の一覧（スコアの降順）
+        """
+
+    @abstractmethod
+    async def add(self, example: Example) -> Example:
+        """
+        サンプルを追加
+
+        Args:
+            example: サンプル情報（id を含むこと）
+
+        Returns:
+            追加したサンプル情報
+
+        Raises:
+            ValueError: 同じIDのサンプルが既に存在する場合
+        """
+
+    @abstractmethod
+    async def update(self, example_id: int, **fields: Any) -> Optional[Example]:
+        """
+        サンプルを更新
+
+        Args:
+            example_id: サンプルID
+            **fields: 更新するフィールド（id は変更できません）
+
+        Returns:
+            更新後のサンプル情報。存在しない場合はNone
+        """
+
+    @abstractmethod
+    async def delete(self, example_id: int) -> Optional[Example]:
+        """
+        サンプルを削除
+
+        Args:
+            example_id: サンプルID
+
+        Returns:
+            削除したサンプル情報。存在しない場合はNone
+        """
+
+    @abstractmethod
+    async def bulk_load(self, examples: Iterable[Example]) -> int:
+        """
+        サンプルを一括登録
+
+        Args:
+            examples: サンプル情報のイテラブル
+
+        Returns:
+            登録件数
+
+        Raises:
+            ValueError: 同じIDのサンプルが既に存在する場合
+        """
+
+    @abstractmethod
+    async def count(self) -> int:
+        """
+        サンプルの件数を取得
+
+        Returns:
+            件数
+        """
+
+    async def iter_chunks(
+        self, chunk_size: int, after_id: Optional[int] = None, name: Optional[str] = None
+    ) -> AsyncIterator[List[Example]]:
+        """
+        id の昇順で全てのサンプルを chunk_size 件ずつ取得
+
+        キーセットページネーションで1チャンクずつ読み出すため、保持するデータ量は
+        コレクションの大きさによらず chunk_size 件分です。
+
+        Args:
+            chunk_size: 1回に取得する件数
+            after_id: このIDより大きいサンプルから取得（Noneの場合は先頭から）
+            name: サンプル名で絞り込む場合に指定（完全一致）
+
+        Yields:
+            サンプル一覧（最大 chunk_size 件）
+        """
+        while True:
+            examples, after_id = await self.page(chunk_size, after_id=after_id, name=name)
+            if examples:
+                yield examples
+            if after_id is None:
+                return
+
+    async def close(self) -> None:
+        """
+        リポジトリが保持するリソースを解放
+        """
+
+
+class InMemoryAsyncExampleRepository(AsyncExampleRepository):
+    """
+    インメモリの ExampleRepository を非同期インターフェースで公開するアダプター
+
+    処理は全てメモリ上で完結するため、イベントループ上でそのまま実行します。
+    """
+
+    def __init__(self, repository: ExampleRepository) -> None:
+        """
+        初期化
+
+        Args:
+            repository: インメモリリポジトリ
+        """
+        self.repository = repository
+
+    @property  # type: ignore[override]
+    def version(self) -> int:
+        return self.repository.version
+
+    async def get(self, example_id: int) -> Optional[Example]:
+        return self.repository.get(example_id)
+
+    async def get_many(self, example_ids: Sequence[int]) -> Tuple[List[Example], List[int]]:
+        return self.repository.get_many(example_ids)
+
+    async def page(
+        self, limit: int, after_id: Optional[int] = None, name: Optional[str] = None
+    ) -> Tuple[List[Example], Optional[int]]:
+        return self.repository.page(limit, after_id=after_id, name=name)
+
+    async def search(self, query: str, limit: int) -> List[Tuple[Example, float]]:
+        return self.repository.search(query, limit)
+
+    async def add(self, example: Example) -> Example:
+        return self.repository.add(example)
+
+    async def update(self, example_id: int, **fields: Any) -> Optional[Example]:
+        return self.repository.update(example_id, **fields)
+
+    async def delete(self, example_id: int) -> Optional[Example]:
+        return self.repository.delete(example_id)
+
+    async def bulk_load(self, examples: Iterable[Example]) -> int:
+        return self.repository.bulk_load(examples)
+
+    async def count(self) -> int:
+        return len(self.repository)
+
+
+def create_example_repository(storage: str) -> AsyncExampleRepository:
+    """
+    設定に応じたリポジトリを作成
+
+    Args:
+        storage: ストレージの種類（"memory" または "sqlite"）
+
+    Returns:
+        AsyncExampleRepository: リポジトリ
+
+    Raises:
+        ValueError: 未知のストレージが指定された場合
+    """
+    if storage == "memory":
+        return InMemoryAsyncExampleRepository(example_repository)
+    if storage == "sqlite":
+        from app.infrastructure.sqlite_repository import SQLiteExampleRepository
+
+        return SQLiteExampleRepository(
+            settings.SQLITE_PATH, pool_size=settings.SQLITE_POOL_SIZE
+        )
+    raise ValueError(f"Unknown EXAMPLES_STORAGE: {storage!r} (expected 'memory' or 'sqlite')")
+
+
+# アプリケーション全体で共有するリポジトリ
+async_example_repository = create_example_repository(settings.EXAMPLES_STORAGE)
@@ -0,0 +1,164 @@
+"""
+サンプルの全文検索用の転置インデックス
+
+name と description をトークンに分割し、トークンごとに出現するサンプルと出現回数を保持します。
+サンプルの追加・更新・削除のたびに差分だけを反映するため、再構築は不要です。
+
+- ランキング: BM25（name の出現回数は NAME_WEIGHT 倍して数える）
+- 前方一致: 検索語を前方一致するトークン全てに展開する（ソート済みの語彙を二分探索）
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# トークンの区切り（英数字・かな漢字の連続を1トークンとし、小文字に正規化する）
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# BM25 のパラメーター
+BM25_K1 = 1.2
+BM25_B = 0.75
+# name の出現回数の重み（description より name での一致を上位にする）
+NAME_WEIGHT = 2
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    テキストを検索用のトークンに分割
+
+    Args:
+        text: テキスト
+
+    Returns:
+        小文字に正規化したトークンの一覧（出現順）
+    """
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    BM25 で順位付けする転置インデックス
+
+    - ポスティング: トークン -> {ドキュメントID: 重み付きの出現回数}
+    - 語彙: ソート済みのトークン一覧（前方一致の展開用）
+    - ドキュメントの長さ: ドキュメントID -> 重み付きのトークン数
+    """
+
+    def __init__(self) -> None:
+        """
+        初期化
+        """
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_terms: Dict[int, Dict[str, int]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: int, name: Optional[str], description: Optional[str]) -> None:
+        """
+        ドキュメントを追加（既に存在する場合は置き換え）
+
+        Args:
+            doc_id: ドキュメントID
+            name: サンプル名
+            description: サンプルの説明
+        """
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        terms: Dict[str, int] = {}
+        for token in tokenize(name):
+            terms[token] = terms.get(token, 0) + NAME_WEIGHT
+        for token in tokenize(description):
+            terms[token] = terms.get(token, 0) + 1
+        for token, frequency in terms.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[doc_id] = frequency
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int) -> None:
+        """
+        ドキュメントを削除（存在しない場合は何もしない）
+
+        Args:
+            doc_id: ドキュメントID
+        """
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for token in terms:
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def clear(self) -> None:
+        """
+        全てのドキュメントを削除
+        """
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """
+        BM25 のスコアが高い順にドキュメントを検索
+
+        検索語はそれぞれ前方一致するトークンに展開し、いずれかの検索語に一致した
+        ドキュメントを返します。検索語ごとのスコアは、展開したトークンのうち最も高いものです。
+
+        Args:
+            query: 検索文字列
+            limit: 取得件数の上限
+
+        Returns:
+            (ドキュメントID, スコア) の一覧（スコアの降順、同点の場合はIDの昇順）
+        """
+        doc_count = len(self._doc_terms)
+        # 全てのドキュメントのトークンが0件の場合は一致する語がなく、平均文書長も0になる
+        if doc_count == 0 or self._total_length == 0:
+            return []
+        doc_lengths = self._doc_lengths
+        # norm = k1 * (1 - b + b * 文書長 / 平均文書長) = base + scale * 文書長
+        base = BM25_K1 * (1 - BM25_B)
+        scale = BM25_K1 * BM25_B * doc_count / self._total_length
+        scores: Dict[int, float] = {}
+        for query_token in dict.fromkeys(tokenize(query)):
+            best: Dict[int, float] = {}
+            for token in self._expand(query_token):
+                postings = self._postings[token]
+                df = len(postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                for doc_id, frequency in postings.items():
+                    length = doc_lengths[doc_id]
+                    score = weight * frequency / (frequency + base + scale * length)
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def _expand(self, prefix: str) -> Iterator[str]:
+        vocabulary = self._vocabulary
+        for index in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[index]
+            if not token.startswith(prefix):
+                break
+            yield token
@@ -0,0 +1,385 @@
+"""
+SQLiteによるサンプルデータのリポジトリ
+
+データをファイルに永続化し、再起動後や gunicorn の複数ワーカー間でも同じデータを参照できます。
+
+- WALモード: 読み取りと書き込みが互いをブロックしないため、複数プロセスからの同時参照に強い
+- コネクションプール: 接続ごとに sqlite3 のプリペアドステートメントキャッシュが効くよう、
+  接続を使い回す
+- スレッドプール: クエリは専用のスレッドプールで実行し、イベントループをブロックしない
+- 全文検索: FTS5 の外部コンテンツテーブルをトリガーで差分更新し、bm25() で順位付けする
+"""
+
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from app.infrastructure.example_repository import EXAMPLE_FIELDS, EXAMPLES, Example
+from app.infrastructure.repository import AsyncExampleRepository
+from app.infrastructure.search_index import NAME_WEIGHT, tokenize
+
+T = TypeVar("T")
+
+# 接続ごとにキャッシュするプリペアドステートメントの数
+STATEMENT_CACHE_SIZE = 256
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS examples ("
+    " id INTEGER PRIMARY KEY,"
+    " name TEXT,"
+    " description TEXT"
+    ")",
+    "CREATE INDEX IF NOT EXISTS examples_name ON examples (name, id)",
+    # 全文検索用の FTS5 テーブル（examples を外部コンテンツとし、トリガーで差分を反映する）
+    "CREATE VIRTUAL TABLE IF NOT EXISTS examples_fts USING fts5("
+    " name, description, content='examples', content_rowid='id', prefix='2 3'"
+    ")",
+    "CREATE TRIGGER IF NOT EXISTS examples_fts_insert AFTER INSERT ON examples BEGIN"
+    " INSERT INTO examples_fts (rowid, name, description)"
+    " VALUES (new.id, new.name, new.description);"
+    " END",
+    "CREATE TRIGGER IF NOT EXISTS examples_fts_delete AFTER DELETE ON examples BEGIN"
+    " INSERT INTO examples_fts (examples_fts, rowid, name, description)"
+    " VALUES ('delete', old.id, old.name, old.description);"
+    " END",
+    "CREATE TRIGGER IF NOT EXISTS examples_fts_update AFTER UPDATE ON examples BEGIN"
+    " INSERT INTO examples_fts (examples_fts, rowid, name, description)"
+    " VALUES ('delete', old.id, old.name, old.description);"
+    " INSERT INTO examples_fts (rowid, name, description)"
+    " VALUES (new.id, new.name, new.description);"
+    " END",
+)
+_HAS_FTS = "SELECT 1 FROM sqlite_master WHERE name = 'examples_fts'"
+# FTS5 の導入前に作成されたデータベースでは、既存の行からインデックスを構築する
+_REBUILD_FTS = "INSERT INTO examples_fts (examples_fts) VALUES ('rebuild')"
+_COLUMNS = "id, name, description"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM examples WHERE id = ?"
+# ID一覧をJSON配列として1つのパラメーターで渡し、件数によらず同じステートメントを使う
+_SELECT_MANY = (
+    f"SELECT {_COLUMNS} FROM examples WHERE id IN (SELECT value FROM json_each(?))"
+)
+_SELECT_PAGE = f"SELECT {_COLUMNS} FROM examples WHERE id > ? ORDER BY id LIMIT ?"
+_SELECT_PAGE_BY_NAME = (
+    f"SELECT {_COLUMNS} FROM examples WHERE name = ? AND id > ? ORDER BY id LIMIT ?"
+)
+_INSERT = "INSERT INTO examples (id, name, description) VALUES (?, ?, ?)"
+_DELETE = "DELETE FROM examples WHERE id = ?"
+_COUNT = "SELECT COUNT(*) FROM examples"
+# bm25() は値が小さいほど適合度が高い。列の重みはインメモリの転置インデックスに合わせる
+_BM25 = f"bm25(examples_fts, {float(NAME_WEIGHT)}, 1.0)"
+_SEARCH = (
+    f"SELECT e.id, e.name, e.description, -{_BM25} FROM examples_fts"
+    " JOIN examples AS e ON e.id = examples_fts.rowid"
+    f" WHERE examples_fts MATCH ? ORDER BY {_BM25}, e.id LIMIT ?"
+)
+
+# キーセットページネーションで after_id が未指定の場合の下限（SQLiteの INTEGER の最小値）
+_MIN_ID = -(2**63)
+
+
+def _row_to_example(row: Sequence[Any]) -> Example:
+    return {"id": row[0], "name": row[1], "description": row[2]}
+
+
+def _example_to_row(example: Example) -> Tuple[Any, Any, Any]:
+    return example["id"], example.get("name"), example.get("description")
+
+
+class SQLiteConnectionPool:
+    """
+    SQLiteのコネクションプール
+
+    接続は必要になった時点で最大 size 個まで作成し、以降は使い回します。
+    スレッドプールのワーカー数と同じ大きさにすることで、接続の取得で待つことはありません。
+    """
+
+    def __init__(self, path: str, size: int) -> None:
+        """
+        初期化
+
+        Args:
+            path: データベースファイルのパス
+            size: 最大接続数
+        """
+        self.path = path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        プールから接続を取得し、終了時に返却するコンテキストマネージャー
+
+        Yields:
+            sqlite3.Connection: 接続
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """
+        プール内の全ての接続を閉じる
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+        with self._lock:
+            self._created = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        # 自動コミットモードで接続し、書き込みは明示的なトランザクションで行う
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+
+class SQLiteExampleRepository(AsyncExampleRepository):
+    """
+    SQLiteによるサンプルデータのリポジトリ
+
+    データベースファイルとテーブルは最初のクエリで作成し、テーブルが空の場合は
+    初期データ（seed）を登録します。
+
+    close() の後もリポジトリは使用できます（スレッドプールと接続は次のクエリで作り直す）。
+    Lambda（Mangum）は呼び出しごとにライフスパンを実行し、shutdown で close() が呼ばれるため、
+    同じ実行環境での次の呼び出しでも同じインスタンスを使い続けられるようにしています。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        seed: Optional[Iterable[Example]] = EXAMPLES,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            path: データベースファイルのパス
+            pool_size: コネクションプールとスレッドプールの大きさ
+            seed: テーブルが空の場合に登録する初期データ
+        """
+        self.path = path
+        self._pool = SQLiteConnectionPool(path, pool_size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._seed = [dict(example) for example in seed] if seed is not None else []
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    async def get(self, example_id: int) -> Optional[Example]:
+        return await self._run(self._get, example_id)
+
+    async def get_many(self, example_ids: Sequence[int]) -> Tuple[List[Example], List[int]]:
+        return await self._run(self._get_many, list(dict.fromkeys(example_ids)))
+
+    async def page(
+        self, limit: int, after_id: Optional[int] = None, name: Optional[str] = None
+    ) -> Tuple[List[Example], Optional[int]]:
+        return await self._run(self._page, limit, after_id, name)
+
+    async def search(self, query: str, limit: int) -> List[Tuple[Example, float]]:
+        return await self._run(self._search, query, limit)
+
+    async def add(self, example: Example) -> Example:
+        await self._run(self._insert_many, [example])
+        self.version += 1
+        return example
+
+    async def update(self, example_id: int, **fields: Any) -> Optional[Example]:
+        fields.pop("id", None)
+        unknown = set(fields) - set(EXAMPLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        example = await self._run(self._update, example_id, fields)
+        if example is not None:
+            self.version += 1
+        return example
+
+    async def delete(self, example_id: int) -> Optional[Example]:
+        example = await self._run(self._delete, example_id)
+        if example is not None:
+            self.version += 1
+        return example
+
+    async def bulk_load(self, examples: Iterable[Example]) -> int:
+        count = await self._run(self._insert_many, list(examples))
+        self.version += 1
+        return count
+
+    async def count(self) -> int:
+        return await self._run(self._count)
+
+    async def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._pool.close()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._pool.size, thread_name_prefix="sqlite"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, args)
+
+    def _call(self, func: Callable[..., T], args: Tuple[Any, ...]) -> T:
+        with self._pool.connection() as conn:
+            if not self._initialized:
+                self._initialize(conn)
+            return func(conn, *args)
+
+    def _initialize(self, conn: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                has_fts = conn.execute(_HAS_FTS).fetchone() is not None
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                if not has_fts:
+                    conn.execute(_REBUILD_FTS)
+                if self._seed and conn.execute(_COUNT).fetchone()[0] == 0:
+                    conn.executemany(_INSERT, map(_example_to_row, self._seed))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._initialized = True
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, example_id: int) -> Optional[Example]:
+        row = conn.execute(_SELECT_BY_ID, (example_id,)).fetchone()
+        return _row_to_example(row) if row is not None else None
+
+    @staticmethod
+    def _get_many(
+        conn: sqlite3.Connection, example_ids: List[int]
+    ) -> Tuple[List[Example], List[int]]:
+        if not example_ids:
+            return [], []
+        rows = conn.execute(_SELECT_MANY, (json.dumps(example_ids),)).fetchall()
+        by_id = {row[0]: _row_to_example(row) for row in rows}
+        found = [by_id[example_id] for example_id in example_ids if example_id in by_id]
+        missing = [example_id for example_id in example_ids if example_id not in by_id]
+        return found, missing
+
+    @staticmethod
+    def _page(
+        conn: sqlite3.Connection, limit: int, after_id: Optional[int], name: Optional[str]
+    ) -> Tuple[List[Example], Optional[int]]:
+        start = _MIN_ID if after_id is None else after_id
+        # 次ページの有無を判定するため、1件多く取得する
+        if name is None:
+            rows = conn.execute(_SELECT_PAGE, (start, limit + 1)).fetchall()
+        else:
+            rows = conn.execute(_SELECT_PAGE_BY_NAME, (name, start, limit + 1)).fetchall()
+        examples = [_row_to_example(row) for row in rows[:limit]]
+        has_more = len(rows) > limit
+        return examples, (examples[-1]["id"] if has_more and examples else None)
+
+    @staticmethod
+    def _search(
+        conn: sqlite3.Connection, query: str, limit: int
+    ) -> List[Tuple[Example, float]]:
+        # 検索語ごとの前方一致（"token"*）の OR。トークンは英数字などのみのため引用符を含まない
+        match = " OR ".join(f'"{token}"*' for token in dict.fromkeys(tokenize(query)))
+        if not match:
+            return []
+        rows = conn.execute(_SEARCH, (match, limit)).fetchall()
+        return [(_row_to_example(row), row[3]) for row in rows]
+
+    @staticmethod
+    def _insert_many(conn: sqlite3.Connection, examples: List[Example]) -> int:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT, map(_example_to_row, examples))
+            conn.execute("COMMIT")
+        except sqlite3.IntegrityError as e:
+            conn.execute("ROLLBACK")
+            raise ValueError(f"Example with the same ID already exists: {e}") from e
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(examples)
+
+    @staticmethod
+    def _update(
+        conn: sqlite3.Connection, example_id: int, fields: Dict[str, Any]
+    ) -> Optional[Example]:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if fields:
+                # カラム名は EXAMPLE_FIELDS で検証済み。組み合わせごとにステートメントがキャッシュされる
+                assignments = ", ".join(f"{column} = ?" for column in sorted(fields))
+                conn.execute(
+                    f"UPDATE examples SET {assignments} WHERE id = ?",
+                    [fields[column] for column in sorted(fields)] + [example_id],
+                )
+            row = conn.execute(_SELECT_BY_ID, (example_id,)).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return _row_to_example(row) if row is not None else None
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, example_id: int) -> Optional[Example]:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(_SELECT_BY_ID, (example_id,)).fetchone()
+            if row is not None:
+                conn.execute(_DELETE, (example_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return _row_to_example(row) if row is not None else None
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection) -> int:
+        return conn.execute(_COUNT).fetchone()[0]
+
@@ -2,30 +2,58 @@
 FastAPI MCP Template - メインアプリケーション
 """
 
+import logging
 import os
+import sys
 
-try:
-    from dotenv import load_dotenv
-    # 環境変数の読み込み
-    load_dotenv()
-    print("[DEBUG] .env ファイルを読み込みました")
-except ImportError:
-    print("[DEBUG] python-dotenv がインストールされていないため、.env ファイルを読み込めません")
-    # Lambda環境では.envファイルは使用しないので、エラーを無視する
-
-from fastapi import FastAPI, Request, HTTPException, Response
-from typing import Callable
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.status import HTTP_403_FORBIDDEN
-from fastapi_mcp import FastApiMCP  # type: ignore
+from app.core.startup import startup_timer
 
-from app.core.config import settings
-from mangum import Mangum
+with startup_timer.phase("dotenv"):
+    try:
+        from dotenv import load_dotenv
+        # 環境変数の読み込み
+        load_dotenv()
+        dotenv_loaded = True
+    except ImportError:
+        # Lambda環境では.envファイルは使用しないので、エラーを無視する
+        dotenv_loaded = False
+
+with startup_timer.phase("fastapi"):
+    from fastapi import FastAPI, Request, Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+from typing import TYPE_CHECKING, Union
 
-# ルーターとMCPツールのインポート
+from app.core.config import settings
+from app.core.json_response import get_json_response_class, json_response
+from app.core.logging_config import capture_request_body, redact_headers, setup_logging
+from app.core.metrics import metrics_registry
+
+# ロギングの設定
+setup_logging(settings)
+logger = logging.getLogger(__name__)
+if dotenv_loaded:
+    logger.debug(".env ファイルを読み込みました")
+else:
+    logger.debug("python-dotenv がインストールされていないため、.env ファイルを読み込めません")
+
+with startup_timer.phase("mangum"):
+    from mangum import Mangum
+    from mangum.adapter import DEFAULT_TEXT_MIME_TYPES
+
+# ルーターのインポート
+from app.infrastructure.repository import async_example_repository
 from app.presentation.api.example_router import router as example_router
-from app.presentation.mcp.example_tools import get_examples_tool, get_example_tool
+from app.presentation.api.openapi import install_openapi
+from app.presentation.api.streaming import NDJSON_MEDIA_TYPE
+from app.presentation.mcp.lazy import LazyFastApiMCP, registered_operation_ids
+from app.presentation.middleware.compression import CompressionMiddleware
+from app.presentation.middleware.metrics import MetricsMiddleware
+from app.presentation.middleware.read_only import ReadOnlyMiddleware
+from app.presentation.middleware.response_cache import ResponseCacheMiddleware
+
+if TYPE_CHECKING:
+    from app.presentation.mcp.server import ExtendedFastApiMCP
 
 # FastAPIアプリケーションの作成
 app = FastAPI(
@@ -33,23 +61,40 @@ app = FastAPI(
     description="FastAPIとModel Context Protocol (MCP)を使用したAPIテンプレート",
     version="0.1.0",
     openapi_version="3.0.3",
+    default_response_class=get_json_response_class(settings.JSON_RESPONSE_CLASS),
 )
-from fastapi.openapi.utils import get_openapi
-
-def custom_openapi_schema():
-    if app.openapi_schema:
-        return app.openapi_schema
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
+
+# レスポンスキャッシュミドルウェアの設定
+# CORSヘッダーはリクエストごとに付与されるよう、CORSミドルウェアより内側に配置する
+app.add_middleware(
+    ResponseCacheMiddleware,
+    route_paths=[
+        "/",
+        "/hello",
+        "/api/examples/",
+        "/api/examples/batch",
+        "/api/examples/search",
+        "/api/examples/{example_id}",
+    ],
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
+
+# レスポンス圧縮ミドルウェアの設定
+# レスポンスキャッシュより外側に配置し、304 の判定は圧縮前の ETag で行う
+# /mcp はSSEの長時間接続のため圧縮しない
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        exclude_paths=["/mcp"],
+        cache_max_entries=settings.COMPRESSION_CACHE_MAX_ENTRIES,
     )
-    openapi_schema["openapi"] = "3.0.3"  # OpenAPIのバージョンを3.0.3に設定
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
 
-app.openapi = custom_openapi_schema
+# 読み取り専用モードミドルウェアの設定
+# 403 レスポンスにもCORSヘッダーが付与されるよう、CORSミドルウェアより内側に配置する
+app.add_middleware(ReadOnlyMiddleware, exempt_paths=["/api/examples:batchGet"])
 
 # CORSミドルウェアの設定
 app.add_middleware(
@@ -60,62 +105,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Read-only mode middleware
-@app.middleware("http")
-async def read_only_middleware(request: Request, call_next: Callable) -> Response:
-    if settings.READ_ONLY_MODE and request.method in ("POST", "PUT", "DELETE", "PATCH"):
-        raise HTTPException(
-            status_code=HTTP_403_FORBIDDEN,
-            detail="Application is in read-only mode. Write operations are disabled.",
-        )
-    response: Response = await call_next(request)
-    return response
+# レイテンシメトリクスミドルウェアの設定（全てのミドルウェアを含めて計測するため最も外側に配置する）
+# /mcp はSSEの長時間接続のため計測しない（MCPツールの呼び出しはツール単位で記録される）
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics_registry, exclude_paths=["/mcp"])
 
 # APIルーターの登録
 app.include_router(example_router)
 
-# MCPサーバーの作成
-print("[DEBUG] MCPサーバー作成開始")
-mcp_server = FastApiMCP(
-    fastapi=app,
-    name="FastAPI-MCP-Template",
-    description="FastAPIとModel Context Protocol (MCP)を使用したAPIテンプレート",
-)
-print("[DEBUG] MCPサーバー作成完了")
-
-# MCPサーバーの設定
-# FastApiMCP 0.3.3では、FastAPIのエンドポイントを自動的にMCPツールとして登録するため、
-# カスタムツールのインポートは不要ですが、明示的に登録することもできます。
-print("[DEBUG] MCPサーバー設定開始")
-
-# MCPサーバーの設定を更新
-mcp_server.setup_server()
-
-# カスタムMCPツールを明示的に登録
-if hasattr(mcp_server, "add_tool") and callable(mcp_server.add_tool):
-    mcp_server.add_tool(get_examples_tool)
-    mcp_server.add_tool(get_example_tool)
-    print(f"[DEBUG] 明示的にツールを登録: get_examples_tool, get_example_tool")
-
-
-print("[DEBUG] MCPサーバー設定完了")
-
-# 登録されたツールの一覧を表示
-print("[DEBUG] 登録されたMCPツール一覧:")
-try:
-    # FastApiMCP 0.3.3では、toolsプロパティを使用してツール一覧を取得
-    if hasattr(mcp_server, "tools"):
-        for tool in mcp_server.tools:
-            print(f"[DEBUG] - ツール名: {tool.name}")
-    else:
-        print("[DEBUG] - ツール一覧を取得できません")
-except Exception as e:
-    print(f"[DEBUG] - ツール一覧取得エラー: {str(e)}")
-
-# MCPサーバーをマウント
-print("[DEBUG] MCPサーバーマウント開始")
-mcp_server.mount(mount_path="/mcp")
-print("[DEBUG] MCPサーバーマウント完了")
+# MCPツールとして公開するのはここまでに登録したルート（/hello と / は公開しない）
+mcp_operations = registered_operation_ids(app)
+
+# 終了時にリポジトリの接続とスレッドプールを解放する
+app.add_event_handler("shutdown", async_example_repository.close)
 
 
 # グローバル例外ハンドラー
@@ -131,23 +133,30 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     Returns:
         JSONResponse: エラーレスポンス
     """
-    import traceback
-    error_traceback = traceback.format_exc()
-    print(f"[ERROR] 例外が発生しました: {str(exc)}")
-    print(f"[ERROR] トレースバック: {error_traceback}")
-    print(f"[ERROR] リクエストパス: {request.url.path}")
-    print(f"[ERROR] リクエストメソッド: {request.method}")
-    print(f"[ERROR] リクエストヘッダー: {request.headers}")
-    
-    try:
-        body = await request.body()
-        print(f"[ERROR] リクエストボディ: {body.decode('utf-8')}")
-    except Exception as e:
-        print(f"[ERROR] リクエストボディの取得に失敗しました: {str(e)}")
-    
+    # トレースバックのフォーマットと出力はロギングのリスナースレッドで行われる
+    logger.error(
+        "例外が発生しました: %s",
+        exc,
+        exc_info=exc,
+        extra={"path": request.url.path, "method": request.method},
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("リクエストヘッダー: %s", redact_headers(request.headers))
+        try:
+            body, truncated = await capture_request_body(
+                request, settings.LOG_REQUEST_BODY_MAX_BYTES
+            )
+            logger.debug(
+                "リクエストボディ: %s",
+                body.decode("utf-8", errors="replace"),
+                extra={"body_truncated": truncated},
+            )
+        except Exception as e:
+            logger.debug("リクエストボディの取得に失敗しました: %s", e)
+
     import datetime
-    return JSONResponse(
-        status_code=500, 
+    return json_response(
+        status_code=500,
         content={
             "error": "Internal Server Error", 
             "message": str(exc),
@@ -159,30 +168,67 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
 
 
 # Hello Worldエンドポイント
-@app.get("/hello")
-async def hello_world() -> dict:
+@app.get("/hello", response_model=dict)
+async def hello_world() -> Response:
     """
     Hello Worldエンドポイント
 
     Returns:
         dict: Hello Worldメッセージ
     """
-    return {"message": "Hello World from FastAPI MCP Template!"}
+    return json_response({"message": "Hello World from FastAPI MCP Template!"})
 
 # ルートエンドポイント
-@app.get("/")
-async def root() -> dict:
+@app.get("/", response_model=dict)
+async def root() -> Response:
     """
     ルートエンドポイント
 
     Returns:
         dict: ウェルカムメッセージ
     """
-    return {"message": "Welcome to FastAPI MCP Template", "docs": "/docs", "mcp": "/mcp", "hello": "/hello"}
+    return json_response({"message": "Welcome to FastAPI MCP Template", "docs": "/docs", "mcp": "/mcp", "hello": "/hello"})
+
+
+# メトリクスエンドポイント（Prometheus のテキスト形式）
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """
+        ルート・MCPツール・ステータスコードごとのレイテンシを Prometheus のテキスト形式で返す
+        """
+        return Response(
+            metrics_registry.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+# OpenAPIドキュメントの設定（全てのルートを登録した後に行う）
+# OPENAPI_SNAPSHOT_PATH が指定され、ルート定義と一致する場合はスナップショットを使用する
+install_openapi(app, settings.OPENAPI_SNAPSHOT_PATH)
+
+
+# MCPサーバーの作成とマウント（ツールの生成にスナップショットを使えるよう、OpenAPIの設定後に行う）
+# MCP_LAZY_INIT が有効な場合は、/mcp への最初のリクエストまでMCPサーバーの構築を遅延させる
+mcp_server: Union[LazyFastApiMCP, "ExtendedFastApiMCP"]
+if settings.MCP_LAZY_INIT:
+    mcp_server = LazyFastApiMCP(app, include_operations=mcp_operations)
+else:
+    with startup_timer.phase("fastapi_mcp"):
+        from app.presentation.mcp.server import create_mcp_server
+
+        mcp_server = create_mcp_server(app, mcp_operations)
+
+logger.debug("MCPサーバーマウント開始")
+mcp_server.mount(mount_path="/mcp")
+logger.debug("MCPサーバーマウント完了")
 
 
 # AWS Lambda用ハンドラー
-handler = Mangum(app)
+# NDJSON のエクスポートがテキストのまま返るよう、テキストとして扱うメディアタイプに追加する
+with startup_timer.phase("mangum"):
+    handler = Mangum(app, text_mime_types=[*DEFAULT_TEXT_MIME_TYPES, NDJSON_MEDIA_TYPE])
 
 
 # 開発サーバー起動用関数
@@ -200,6 +246,18 @@ def start() -> None:
     )
 
 
+def serve() -> None:
+    """
+    本番サーバー（gunicorn + uvicorn ワーカー）を起動
+
+    設定は app.core.gunicorn_conf（Settings の SERVER_*）から読み込みます。
+    """
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = ["gunicorn", "-c", "python:app.core.gunicorn_conf", "app.main:app"]
+    run()
+
+
 # スクリプトとして実行された場合
 if __name__ == "__main__":
     start()
@@ -2,9 +2,29 @@
 サンプルAPIエンドポイント
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.core.json_response import get_json_encoder, json_response
+from app.infrastructure.example_repository import EXAMPLE_FIELDS
+from app.infrastructure.repository import async_example_repository
+from app.presentation.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    project,
+)
+from app.presentation.api.streaming import (
+    NDJSON_MEDIA_TYPE,
+    accepts_gzip,
+    gzip_stream,
+    ndjson_stream,
+)
 
 # ルーターの作成
 router = APIRouter(
@@ -13,27 +33,234 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# サンプルデータ
-EXAMPLES = [
-    {"id": 1, "name": "Example 1", "description": "This is example 1"},
-    {"id": 2, "name": "Example 2", "description": "This is example 2"},
-    {"id": 3, "name": "Example 3", "description": "This is example 3"},
-]
-
 
 @router.get("/", response_model=List[Dict], operation_id="get_examples")
-async def get_examples() -> List[Dict]:
+async def get_examples(
+    request: Request,
+    name: Optional[str] = None,
+    limit: int = Query(
+        settings.EXAMPLES_DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.EXAMPLES_MAX_PAGE_SIZE,
+        description="1ページあたりの最大件数",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="前のページで返された次ページのカーソル"
+    ),
+    fields: Optional[str] = Query(
+        None, description="返却するフィールドのカンマ区切り（例: id,name）"
+    ),
+) -> Response:
     """
     サンプル一覧を取得するエンドポイント
 
+    id の昇順で最大 limit 件を返します。続きがある場合は、次ページのカーソルを
+    X-Next-Cursor ヘッダー（MCPツールの場合は結果の next_cursor）で返します。
+
+    Args:
+        name: サンプル名で絞り込む場合に指定（完全一致）
+        limit: 1ページあたりの最大件数
+        cursor: 次ページのカーソル
+        fields: 返却するフィールドのカンマ区切り
+
     Returns:
         サンプル一覧
     """
-    return EXAMPLES
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    projection = parse_fields(fields, EXAMPLE_FIELDS)
+    examples, next_after_id = await async_example_repository.page(
+        limit, after_id=after_id, name=name
+    )
+    headers = {}
+    if next_after_id is not None:
+        next_cursor = encode_cursor(next_after_id)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return json_response(project(examples, projection), headers=headers)
+
+
+class BatchGetRequest(BaseModel):
+    """
+    サンプルの一括取得リクエスト
+    """
+
+    ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.EXAMPLES_MAX_BATCH_SIZE,
+        description="取得するサンプルIDの一覧",
+    )
+    fields: Optional[str] = Field(
+        None, description="返却するフィールドのカンマ区切り（例: id,name）"
+    )
+
+
+def parse_ids(ids: str) -> List[int]:
+    """
+    カンマ区切りのID指定を解析
+
+    Args:
+        ids: カンマ区切りのサンプルID（例: "1,2,3"）
+
+    Returns:
+        サンプルIDの一覧
+
+    Raises:
+        HTTPException: 整数でない値が含まれる場合、または件数が範囲外の場合（400）
+    """
+    try:
+        example_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not example_ids or len(example_ids) > settings.EXAMPLES_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ids must contain 1 to {settings.EXAMPLES_MAX_BATCH_SIZE} IDs",
+        )
+    return example_ids
+
+
+async def batch_get(example_ids: List[int], fields: Optional[str]) -> Response:
+    """
+    サンプルを一括取得してレスポンスを作成
+
+    Args:
+        example_ids: サンプルIDの一覧
+        fields: 返却するフィールドのカンマ区切り
+
+    Returns:
+        見つかったサンプル一覧（items）と見つからなかったID一覧（missing）
+    """
+    projection = parse_fields(fields, EXAMPLE_FIELDS)
+    examples, missing = await async_example_repository.get_many(example_ids)
+    return json_response({"items": project(examples, projection), "missing": missing})
+
+
+@router.get("/batch", response_model=Dict, operation_id="get_examples_batch")
+async def get_examples_batch(
+    ids: str = Query(..., description="取得するサンプルIDのカンマ区切り（例: 1,2,3）"),
+    fields: Optional[str] = Query(
+        None, description="返却するフィールドのカンマ区切り（例: id,name）"
+    ),
+) -> Response:
+    """
+    複数のサンプル情報を一括取得するエンドポイント
+
+    指定した順にサンプルを返します。存在しないIDは missing に含まれます。
+
+    Args:
+        ids: サンプルIDのカンマ区切り
+        fields: 返却するフィールドのカンマ区切り
+
+    Returns:
+        見つかったサンプル一覧と見つからなかったID一覧
+    """
+    return await batch_get(parse_ids(ids), fields)
+
+
+@router.post(":batchGet", response_model=Dict, operation_id="batch_get_examples")
+async def batch_get_examples(body: BatchGetRequest) -> Response:
+    """
+    複数のサンプル情報を一括取得するエンドポイント（リクエストボディでIDを指定）
+
+    URLの長さを気にせずIDを指定できます。読み取り専用モードでも利用できます。
+
+    Args:
+        body: 取得するサンプルIDの一覧
+
+    Returns:
+        見つかったサンプル一覧と見つからなかったID一覧
+    """
+    return await batch_get(body.ids, body.fields)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    operation_id="export_examples",
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_examples(
+    request: Request,
+    name: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None, description="返却するフィールドのカンマ区切り（例: id,name）"
+    ),
+) -> StreamingResponse:
+    """
+    全てのサンプルを NDJSON（1行に1件のJSON）でストリーミング出力するエンドポイント
+
+    id の昇順で EXAMPLES_EXPORT_CHUNK_SIZE 件ずつ読み出して送信するため、
+    サーバーのメモリ使用量はデータ件数によらず一定です。
+    Accept-Encoding に gzip を含む場合は gzip で逐次圧縮して送信します（Lambda では圧縮しません）。
+
+    Args:
+        name: サンプル名で絞り込む場合に指定（完全一致）
+        fields: 返却するフィールドのカンマ区切り
+
+    Returns:
+        NDJSON のストリーミングレスポンス
+    """
+    projection = parse_fields(fields, EXAMPLE_FIELDS)
+    chunks = async_example_repository.iter_chunks(
+        settings.EXAMPLES_EXPORT_CHUNK_SIZE, name=name
+    )
+    if projection is not None:
+        chunks = (project(chunk, projection) async for chunk in chunks)
+    body = ndjson_stream(chunks, get_json_encoder(settings.JSON_RESPONSE_CLASS))
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_gzip(request):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/search", response_model=List[Dict], operation_id="search_examples")
+async def search_examples(
+    q: str = Query(
+        ...,
+        min_length=1,
+        description="検索文字列。name と description を対象に、各語を前方一致で検索します",
+    ),
+    limit: int = Query(
+        settings.EXAMPLES_SEARCH_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.EXAMPLES_SEARCH_MAX_LIMIT,
+        description="取得件数の上限",
+    ),
+    fields: Optional[str] = Query(
+        None, description="返却するフィールドのカンマ区切り（例: id,name）"
+    ),
+) -> Response:
+    """
+    サンプルを全文検索するエンドポイント
+
+    転置インデックスで検索し、BM25 のスコア（score）が高い順に最大 limit 件を返します。
+    いずれかの検索語に前方一致するサンプルが対象です。
+
+    Args:
+        q: 検索文字列
+        limit: 取得件数の上限
+        fields: 返却するフィールドのカンマ区切り
+
+    Returns:
+        スコア付きのサンプル一覧
+    """
+    projection = parse_fields(fields, EXAMPLE_FIELDS)
+    results = await async_example_repository.search(q, limit)
+    items = project((example for example, _ in results), projection)
+    # リポジトリが保持する辞書を変更しないよう、スコアはコピーに追加する
+    return json_response(
+        [
+            {**item, "score": float(f"{score:.6g}")}
+            for item, (_, score) in zip(items, results)
+        ]
+    )
 
 
 @router.get("/{example_id}", response_model=Dict, operation_id="get_example")
-async def get_example(example_id: int) -> Dict:
+async def get_example(example_id: int) -> Response:
     """
     サンプル情報を取得するエンドポイント
 
@@ -43,7 +270,7 @@ async def get_example(example_id: int) -> Dict:
     Returns:
         サンプル情報
     """
-    for example in EXAMPLES:
-        if example["id"] == example_id:
-            return example
-    raise HTTPException(status_code=404, detail=f"Example with ID {example_id} not found")
+    example = await async_example_repository.get(example_id)
+    if example is None:
+        raise HTTPException(status_code=404, detail=f"Example with ID {example_id} not found")
+    return json_response(example)
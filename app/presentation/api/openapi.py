@@ -0,0 +1,295 @@
+"""
+OpenAPIドキュメントの提供
+
+- ビルド時に生成したOpenAPIスナップショット（JSON/YAML）を起動時に読み込み、
+  ルート定義から計算したフィンガープリントと一致する場合はスキーマ生成を省略します。
+- /openapi.json はエンコード済み・gzip圧縮済みのバイト列を返します。
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.openapi.utils import get_openapi
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.json_response import get_json_response_class
+from app.presentation.api.streaming import accepts_gzip
+from app.presentation.middleware.response_cache import compute_etag, etag_matches
+
+logger = logging.getLogger(__name__)
+
+# 公開するOpenAPIのバージョン
+OPENAPI_VERSION = "3.0.3"
+
+# スナップショットに埋め込むルート定義のフィンガープリントのキー（info 配下）
+FINGERPRINT_KEY = "x-route-fingerprint"
+
+
+def route_fingerprint(app: FastAPI) -> str:
+    """
+    OpenAPIスキーマに影響するルート定義のフィンガープリントを計算
+
+    パス・メソッド・オペレーションID・説明・パラメーター・レスポンス定義から計算します。
+    スキーマ生成よりも十分に軽量で、起動時にスナップショットの鮮度を確認するために使用します。
+    なお、レスポンスモデルのクラス内部のフィールド変更は検出できません。
+
+    Args:
+        app: FastAPIアプリケーション
+
+    Returns:
+        16進数のフィンガープリント
+    """
+    entries: List[Any] = [app.title, app.version, app.description, OPENAPI_VERSION]
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not route.include_in_schema:
+            continue
+        flat = get_flat_dependant(route.dependant, skip_repeats=True)
+        params = [
+            (field.name, field.alias, repr(field.field_info))
+            for field in (
+                flat.path_params
+                + flat.query_params
+                + flat.header_params
+                + flat.cookie_params
+                + flat.body_params
+            )
+        ]
+        entries.append(
+            [
+                route.path,
+                sorted(route.methods),
+                route.operation_id or route.unique_id,
+                route.summary,
+                route.description,
+                [str(tag) for tag in route.tags],
+                route.status_code,
+                repr(route.responses),
+                repr(route.response_model),
+                route.deprecated,
+                params,
+            ]
+        )
+    payload = json.dumps(entries, sort_keys=True, default=repr, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generate_openapi_schema(app: FastAPI) -> Dict[str, Any]:
+    """
+    ルート定義からOpenAPIスキーマを生成
+
+    Args:
+        app: FastAPIアプリケーション
+
+    Returns:
+        OpenAPIスキーマ（info にルート定義のフィンガープリントを含む）
+    """
+    openapi_schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+    )
+    openapi_schema["openapi"] = OPENAPI_VERSION  # OpenAPIのバージョンを3.0.3に設定
+    openapi_schema["info"][FINGERPRINT_KEY] = route_fingerprint(app)
+    return openapi_schema
+
+
+def load_openapi_snapshot(path: str) -> Dict[str, Any]:
+    """
+    OpenAPIスナップショットを読み込む
+
+    Args:
+        path: スナップショットのパス（.json, .yaml, .yml）
+
+    Returns:
+        OpenAPIスキーマ
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+        ValueError: 形式が不正な場合
+        ImportError: YAMLの読み込みに必要な PyYAML がインストールされていない場合
+    """
+    snapshot_path = Path(path)
+    text = snapshot_path.read_text(encoding="utf-8")
+    if snapshot_path.suffix in (".yaml", ".yml"):
+        import yaml
+
+        schema = yaml.safe_load(text)
+    else:
+        schema = json.loads(text)
+    if not isinstance(schema, dict) or "paths" not in schema:
+        raise ValueError(f"{path} is not an OpenAPI document")
+    return schema
+
+
+class OpenAPIDocument:
+    """
+    エンコード済みのOpenAPIドキュメント
+    """
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        """
+        初期化
+
+        Args:
+            schema: OpenAPIスキーマ
+        """
+        self.schema = schema
+        response_class = get_json_response_class(settings.JSON_RESPONSE_CLASS)
+        self.body: bytes = response_class(schema).body
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.etag = compute_etag(self.body)
+        # 圧縮したバイト列は別の表現のため、同じ強いETagを使わず弱いETagにする
+        self.gzip_etag = b"W/" + self.etag
+
+    def to_response(self, request: Request) -> Response:
+        """
+        リクエストに応じたレスポンスを生成
+
+        Accept-Encoding で gzip を受け付ける場合（Lambda を除く）は圧縮済みのバイト列（弱いETag）を返し、
+        If-None-Match が一致する場合は 304 を返します。
+
+        Args:
+            request: リクエスト
+
+        Returns:
+            Response: レスポンス
+        """
+        use_gzip = accepts_gzip(request)
+        etag = self.gzip_etag if use_gzip else self.etag
+        headers = {"ETag": etag.decode("ascii"), "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzip_body, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class OpenAPIProvider:
+    """
+    アプリケーションのOpenAPIスキーマを提供するクラス
+
+    スナップショットが読み込まれていない場合は、最初の要求時にルート定義から生成します。
+    """
+
+    def __init__(self, app: FastAPI) -> None:
+        """
+        初期化
+
+        Args:
+            app: FastAPIアプリケーション
+        """
+        self.app = app
+        self.from_snapshot = False
+        self._document: Optional[OpenAPIDocument] = None
+        self._server_urls = {server.get("url") for server in app.servers if server.get("url")}
+
+    def load_snapshot(self, path: str) -> bool:
+        """
+        スナップショットを読み込み、ルート定義と一致する場合に採用
+
+        Args:
+            path: スナップショットのパス
+
+        Returns:
+            スナップショットを採用した場合はTrue
+        """
+        try:
+            snapshot = load_openapi_snapshot(path)
+        except (OSError, ValueError, ImportError) as e:
+            logger.warning("OpenAPIスナップショットを読み込めませんでした (%s): %s", path, e)
+            return False
+
+        expected = route_fingerprint(self.app)
+        actual = snapshot.get("info", {}).get(FINGERPRINT_KEY)
+        if actual != expected:
+            logger.warning(
+                "OpenAPIスナップショットがルート定義と一致しないため、スキーマを生成します (%s)", path
+            )
+            return False
+
+        self._document = OpenAPIDocument(snapshot)
+        self.app.openapi_schema = snapshot
+        self.from_snapshot = True
+        return True
+
+    def document(self) -> OpenAPIDocument:
+        """
+        エンコード済みのOpenAPIドキュメントを取得
+
+        Returns:
+            OpenAPIDocument: OpenAPIドキュメント
+        """
+        if self._document is None:
+            self._document = OpenAPIDocument(self.schema())
+        return self._document
+
+    def schema(self) -> Dict[str, Any]:
+        """
+        OpenAPIスキーマを取得（FastAPI.openapi の置き換え）
+
+        Returns:
+            OpenAPIスキーマ
+        """
+        if self.app.openapi_schema is None:
+            self.app.openapi_schema = generate_openapi_schema(self.app)
+        return self.app.openapi_schema
+
+    async def openapi_endpoint(self, request: Request) -> Response:
+        """
+        /openapi.json のエンドポイント
+
+        Args:
+            request: リクエスト
+
+        Returns:
+            Response: OpenAPIドキュメント
+        """
+        # FastAPI標準の /openapi.json と同様に、root_path を servers に追加する
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        if root_path and self.app.root_path_in_servers and root_path not in self._server_urls:
+            self._server_urls.add(root_path)
+            self.schema().setdefault("servers", []).insert(0, {"url": root_path})
+            self._document = None
+        return self.document().to_response(request)
+
+
+def install_openapi(app: FastAPI, snapshot_path: Optional[str] = None) -> OpenAPIProvider:
+    """
+    OpenAPIドキュメントの提供方法をアプリケーションに設定
+
+    全てのルートを登録した後に呼び出してください。
+
+    Args:
+        app: FastAPIアプリケーション
+        snapshot_path: 読み込むOpenAPIスナップショットのパス（Noneの場合は読み込まない）
+
+    Returns:
+        OpenAPIProvider: 設定したプロバイダー
+    """
+    provider = OpenAPIProvider(app)
+    if snapshot_path:
+        provider.load_snapshot(snapshot_path)
+    app.openapi = provider.schema  # type: ignore[method-assign]
+    app.state.openapi_provider = provider
+
+    # FastAPIが登録した /openapi.json をエンコード済みのバイト列を返すエンドポイントに置き換える
+    if app.openapi_url:
+        for index, route in enumerate(app.router.routes):
+            if isinstance(route, Route) and route.path == app.openapi_url:
+                app.router.routes[index] = Route(
+                    app.openapi_url, provider.openapi_endpoint, include_in_schema=False
+                )
+                break
+    return provider
@@ -0,0 +1,93 @@
+"""
+ページネーションとフィールド射影のユーティリティ
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+# 次ページのカーソルを返すレスポンスヘッダー
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(after_id: int) -> str:
+    """
+    キーセットカーソルをエンコード
+
+    Args:
+        after_id: ページ末尾のID
+
+    Returns:
+        不透明なカーソル文字列
+    """
+    payload = json.dumps({"after": after_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    キーセットカーソルをデコード
+
+    Args:
+        cursor: encode_cursor() で生成したカーソル文字列
+
+    Returns:
+        ページ末尾のID
+
+    Raises:
+        HTTPException: カーソルが不正な場合（400）
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        after_id = payload["after"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(after_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """
+    カンマ区切りのフィールド指定を解析
+
+    Args:
+        fields: カンマ区切りのフィールド名（例: "id,name"）
+        allowed: 指定可能なフィールド名
+
+    Returns:
+        フィールド名の一覧。指定がない場合はNone
+
+    Raises:
+        HTTPException: 指定可能でないフィールドが含まれる場合（400）
+    """
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}",
+        )
+    return names or None
+
+
+def project(items: Iterable[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """
+    指定したフィールドのみを含む辞書に射影
+
+    Args:
+        items: 射影対象の辞書
+        fields: 残すフィールド名。Noneの場合は射影しない
+
+    Returns:
+        射影後の辞書一覧
+    """
+    if fields is None:
+        return list(items)
+    return [{name: item[name] for name in fields if name in item} for item in items]
@@ -0,0 +1,109 @@
+"""
+ストリーミングレスポンスのユーティリティ
+
+コレクション全体をメモリに載せずに、チャンク単位で NDJSON（改行区切りのJSON）に変換して送信します。
+ジェネレーターは送信側が次のチャンクを要求した時点で次のチャンクを読み出すため、
+クライアントの受信が遅い場合はサーバー（uvicorn のフロー制御）で send() が待機し、
+読み出しも止まります（バックプレッシャー）。
+"""
+
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List
+
+from fastapi import Request
+from starlette.types import Scope
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# gzip形式（ヘッダー・トレーラー付き）で圧縮する場合の zlib の wbits
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def is_lambda_request(scope: Scope) -> bool:
+    """
+    Lambda（Mangum）経由のリクエストか判定
+
+    API Gateway（REST API）は binaryMediaTypes を設定しない限り、Mangum が base64 にした
+    バイナリのボディをそのままテキストとしてクライアントに返すため、圧縮したボディは返せません。
+
+    Args:
+        scope: ASGIのスコープ
+
+    Returns:
+        Mangum から呼び出された場合はTrue
+    """
+    return "aws.event" in scope
+
+
+def accepts_gzip(request: Request) -> bool:
+    """
+    クライアントが gzip エンコーディングを受け付けるか判定
+
+    Args:
+        request: リクエスト
+
+    Returns:
+        Accept-Encoding に gzip が含まれ、q=0 で拒否されていない場合はTrue
+        （Lambda（Mangum）経由の場合は常にFalse）
+    """
+    if is_lambda_request(request.scope):
+        return False
+    for value in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = value.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def encode_ndjson(items: Iterable[Any], encode: Callable[[Any], bytes]) -> bytes:
+    """
+    要素ごとに1行のJSONに変換
+
+    Args:
+        items: JSONに変換する要素
+        encode: JSONのバイト列に変換する関数
+
+    Returns:
+        改行区切りのJSON（末尾に改行を含む）
+    """
+    return b"".join(encode(item) + b"\n" for item in items)
+
+
+async def ndjson_stream(
+    chunks: AsyncIterable[List[Dict[str, Any]]], encode: Callable[[Any], bytes]
+) -> AsyncIterator[bytes]:
+    """
+    チャンクごとに NDJSON のバイト列を生成
+
+    Args:
+        chunks: 要素のチャンクを返す非同期イテラブル
+        encode: JSONのバイト列に変換する関数
+
+    Yields:
+        チャンクごとの NDJSON
+    """
+    async for chunk in chunks:
+        yield encode_ndjson(chunk, encode)
+
+
+async def gzip_stream(
+    data: AsyncIterable[bytes], compresslevel: int = 6
+) -> AsyncIterator[bytes]:
+    """
+    バイト列のストリームを gzip で逐次圧縮
+
+    チャンクごとに Z_SYNC_FLUSH するため、クライアントは受信したチャンクを順に展開できます。
+
+    Args:
+        data: 圧縮するバイト列のストリーム
+        compresslevel: 圧縮レベル
+
+    Yields:
+        gzip形式の圧縮データ
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, _GZIP_WBITS)
+    async for block in data:
+        compressed = compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush(zlib.Z_FINISH)
@@ -9,12 +9,10 @@ FastAPI MCP 0.3.3では、FastAPIのエンドポイントを自動的にMCPツ
 自動的に生成されます。
 """
 
-# サンプルデータ (app/presentation/api/example_router.pyと同じデータ)
-EXAMPLES = [
-    {"id": 1, "name": "Example 1", "description": "This is example 1"},
-    {"id": 2, "name": "Example 2", "description": "This is example 2"},
-    {"id": 3, "name": "Example 3", "description": "This is example 3"},
-]
+from app.infrastructure.example_repository import EXAMPLES, example_repository
+
+# サンプルデータは app/infrastructure/example_repository.py のリポジトリで管理されています。
+# APIエンドポイントと同じリポジトリを参照することで、データの重複を避けています。
 
 # 以下のコードは参照用です。実際には使用されません。
 # FastAPI MCP 0.3.3では、MCPTool、MCPToolInput、MCPToolOutputクラスは提供されていません。
@@ -46,12 +44,12 @@ class GetExampleOutput(BaseModel):
     error: Optional[str] = None
 
 async def get_examples_tool(input: GetExamplesInput) -> GetExamplesOutput:
-    return GetExamplesOutput(examples=EXAMPLES)
+    return GetExamplesOutput(examples=example_repository.list_all())
 
 async def get_example_tool(input: GetExampleInput) -> GetExampleOutput:
-    for example in EXAMPLES:
-        if example["id"] == input.example_id:
-            return GetExampleOutput(example=example)
+    example = example_repository.get(input.example_id)
+    if example is not None:
+        return GetExampleOutput(example=example)
     return GetExampleOutput(error=f"Example with ID {input.example_id} not found")
 """
 
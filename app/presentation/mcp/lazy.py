@@ -0,0 +1,133 @@
+"""
+MCPサーバーの遅延初期化
+
+FastApiMCP の作成（fastapi_mcp のインポート、OpenAPIスキーマの生成、ツールスキーマの変換）を
+/mcp への最初のリクエストまで遅延させます。Lambdaのコールドスタートで REST のみを呼び出す場合に
+MCPサーバーの構築コストを払わずに済みます。
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.routing import APIRoute
+
+if TYPE_CHECKING:
+    from app.presentation.mcp.server import ExtendedFastApiMCP
+
+McpServerFactory = Callable[[FastAPI, Optional[List[str]]], "ExtendedFastApiMCP"]
+
+
+def registered_operation_ids(app: FastAPI) -> List[str]:
+    """
+    登録済みでOpenAPIスキーマに含まれるルートのオペレーションIDを取得
+
+    Args:
+        app: FastAPIアプリケーション
+
+    Returns:
+        オペレーションIDの一覧（未指定のルートは unique_id）
+    """
+    return [
+        route.operation_id or route.unique_id
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.include_in_schema
+    ]
+
+
+class LazyFastApiMCP:
+    """
+    最初のリクエストでMCPサーバーを構築するラッパー
+
+    include_operations を省略した場合はマウント時点で登録済みのルートのみをMCPツールとして公開するため、
+    即時初期化した場合と同じツール一覧になります。
+    """
+
+    def __init__(
+        self,
+        fastapi: FastAPI,
+        factory: Optional[McpServerFactory] = None,
+        include_operations: Optional[List[str]] = None,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            fastapi: FastAPIアプリケーション
+            factory: MCPサーバーを作成する関数
+                （省略時は app.presentation.mcp.server.create_mcp_server）
+            include_operations: MCPツールとして公開するオペレーションID
+                （Noneの場合はマウント時点で登録済みのルート）
+        """
+        self.fastapi = fastapi
+        self._factory = factory
+        self._include_operations = include_operations
+        self._messages_path = ""
+        self._server: Optional["ExtendedFastApiMCP"] = None
+        self._transport: Any = None
+
+    @property
+    def is_initialized(self) -> bool:
+        """
+        MCPサーバーが構築済みかどうか
+        """
+        return self._server is not None
+
+    def get_server(self) -> "ExtendedFastApiMCP":
+        """
+        MCPサーバーを取得（未構築の場合は構築）
+
+        構築処理は await を含まないため、イベントループ上で並行して呼び出されても
+        二重に構築されることはありません。
+
+        Returns:
+            ExtendedFastApiMCP: MCPサーバー
+        """
+        if self._server is None:
+            from fastapi_mcp.transport.sse import FastApiSseTransport  # type: ignore
+
+            factory = self._factory
+            if factory is None:
+                from app.presentation.mcp.server import create_mcp_server
+
+                factory = create_mcp_server
+            self._transport = FastApiSseTransport(self._messages_path)
+            self._server = factory(self.fastapi, self._include_operations)
+        return self._server
+
+    def mount(self, mount_path: str = "/mcp") -> None:
+        """
+        MCPのSSEエンドポイントをFastAPIアプリケーションに登録
+
+        エンドポイントは FastApiMCP.mount() と同じパス・オペレーションIDで登録されます。
+
+        Args:
+            mount_path: マウントするパス
+        """
+        if not mount_path.startswith("/"):
+            mount_path = f"/{mount_path}"
+        mount_path = mount_path.rstrip("/")
+        self._messages_path = f"{self.fastapi.root_path}{mount_path}/messages/"
+        if self._include_operations is None:
+            self._include_operations = registered_operation_ids(self.fastapi)
+
+        @self.fastapi.get(mount_path, include_in_schema=False, operation_id="mcp_connection")
+        async def handle_mcp_connection(request: Request) -> None:
+            mcp_server = self.get_server()
+            async with self._transport.connect_sse(
+                request.scope, request.receive, request._send
+            ) as (reader, writer):
+                await mcp_server.server.run(
+                    reader,
+                    writer,
+                    mcp_server.server.create_initialization_options(
+                        notification_options=None, experimental_capabilities={}
+                    ),
+                    raise_exceptions=False,
+                )
+
+        @self.fastapi.post(
+            f"{mount_path}/messages/", include_in_schema=False, operation_id="mcp_messages"
+        )
+        async def handle_post_message(request: Request) -> Any:
+            self.get_server()
+            return await self._transport.handle_fastapi_post_message(request)
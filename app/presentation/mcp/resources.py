@@ -0,0 +1,114 @@
+"""
+MCPリソース
+
+- metrics://latency: ルート・MCPツール・ステータスコードごとのレイテンシ（JSON）
+- metrics://tool-cache: MCPツールの結果キャッシュのツールごとのヒット数・ミス数（JSON）
+- examples://export{?cursor}: 全てのサンプルの NDJSON エクスポート（チャンク単位）
+
+MCPのリソース読み出しは1回の応答で内容を返すため、エクスポートは
+EXAMPLES_EXPORT_CHUNK_SIZE 件ずつのチャンクに分け、続きのチャンクを cursor 付きのURIで
+読み出します。各応答には NDJSON のチャンクと、次のチャンクのURI（JSON）が含まれます。
+"""
+
+import json
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import mcp.types as types
+from fastapi import HTTPException
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+
+from app.core.config import settings
+from app.core.json_response import get_json_encoder
+from app.core.metrics import metrics_registry
+from app.infrastructure.repository import async_example_repository
+from app.presentation.api.pagination import decode_cursor, encode_cursor
+from app.presentation.api.streaming import NDJSON_MEDIA_TYPE, encode_ndjson
+from app.presentation.mcp.tool_cache import tool_result_cache
+
+METRICS_RESOURCE_URI = "metrics://latency"
+TOOL_CACHE_RESOURCE_URI = "metrics://tool-cache"
+EXPORT_RESOURCE_URI = "examples://export"
+
+MCP_RESOURCES = (
+    types.Resource(
+        uri=AnyUrl(METRICS_RESOURCE_URI),
+        name="latency-metrics",
+        description="ルート・MCPツール・ステータスコードごとのレイテンシ（p50/p90/p99、ミリ秒）",
+        mimeType="application/json",
+    ),
+    types.Resource(
+        uri=AnyUrl(TOOL_CACHE_RESOURCE_URI),
+        name="tool-cache-stats",
+        description="MCPツールの結果キャッシュのエントリ数と、ツールごとのTTL・ヒット数・ミス数",
+        mimeType="application/json",
+    ),
+    types.Resource(
+        uri=AnyUrl(EXPORT_RESOURCE_URI),
+        name="examples-export",
+        description=(
+            "全てのサンプルのNDJSONエクスポートの最初のチャンク。"
+            "続きは応答に含まれる next_uri を読み出してください"
+        ),
+        mimeType=NDJSON_MEDIA_TYPE,
+    ),
+)
+
+MCP_RESOURCE_TEMPLATES = (
+    types.ResourceTemplate(
+        uriTemplate=f"{EXPORT_RESOURCE_URI}{{?cursor}}",
+        name="examples-export-chunk",
+        description="cursor 以降のサンプルのNDJSONエクスポート（1チャンク分）",
+        mimeType=NDJSON_MEDIA_TYPE,
+    ),
+)
+
+
+async def read_resource(uri: AnyUrl) -> List[ReadResourceContents]:
+    """
+    MCPリソースを読み出す
+
+    Args:
+        uri: リソースのURI
+
+    Returns:
+        リソースの内容
+
+    Raises:
+        ValueError: 未知のリソース、または不正なカーソルが指定された場合
+    """
+    uri_text = str(uri)
+    if uri_text == METRICS_RESOURCE_URI:
+        snapshot = json.dumps(metrics_registry.snapshot(), ensure_ascii=False)
+        return [ReadResourceContents(snapshot, "application/json")]
+    if uri_text == TOOL_CACHE_RESOURCE_URI:
+        stats = json.dumps(tool_result_cache.stats(), ensure_ascii=False)
+        return [ReadResourceContents(stats, "application/json")]
+    parts = urlsplit(uri_text)
+    if f"{parts.scheme}://{parts.netloc}{parts.path}" == EXPORT_RESOURCE_URI:
+        cursor = parse_qs(parts.query).get("cursor", [None])[0]
+        return await _read_export_chunk(cursor)
+    raise ValueError(f"Unknown resource: {uri}")
+
+
+async def _read_export_chunk(cursor: Optional[str]) -> List[ReadResourceContents]:
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except HTTPException:
+            raise ValueError(f"Invalid cursor: {cursor}")
+    examples, next_after_id = await async_example_repository.page(
+        settings.EXAMPLES_EXPORT_CHUNK_SIZE, after_id=after_id
+    )
+    body = encode_ndjson(examples, get_json_encoder(settings.JSON_RESPONSE_CLASS))
+    next_cursor = encode_cursor(next_after_id) if next_after_id is not None else None
+    continuation = {
+        "next_cursor": next_cursor,
+        "next_uri": f"{EXPORT_RESOURCE_URI}?cursor={next_cursor}" if next_cursor else None,
+    }
+    return [
+        ReadResourceContents(body.decode("utf-8"), NDJSON_MEDIA_TYPE),
+        ReadResourceContents(json.dumps(continuation), "application/json"),
+    ]
@@ -0,0 +1,263 @@
+"""
+MCPサーバー
+
+fastapi_mcp の FastApiMCP を拡張し、このテンプレート固有の振る舞いを追加します。
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import httpx
+import mcp.types as types
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from fastapi_mcp import FastApiMCP  # type: ignore
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools  # type: ignore
+from fastapi_mcp.server import LowlevelMCPServer  # type: ignore
+from fastapi_mcp.types import HTTPRequestInfo  # type: ignore
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.presentation.api.pagination import NEXT_CURSOR_HEADER
+from app.presentation.mcp.example_tools import get_example_tool, get_examples_tool
+from app.presentation.mcp.resources import (
+    MCP_RESOURCE_TEMPLATES,
+    MCP_RESOURCES,
+    read_resource,
+)
+from app.presentation.mcp.tool_cache import ToolResultCache, tool_result_cache
+
+logger = logging.getLogger(__name__)
+
+MCP_SERVER_NAME = "FastAPI-MCP-Template"
+MCP_SERVER_DESCRIPTION = "FastAPIとModel Context Protocol (MCP)を使用したAPIテンプレート"
+
+# MCPツールとして公開しないオペレーションID
+# - batch_get_examples: 同じ機能のGETエンドポイント（get_examples_batch）がツールとして公開されている
+# - export_examples: ストリーミングレスポンスのため、MCPリソース（examples://export）として公開する
+MCP_EXCLUDED_OPERATIONS = frozenset({"batch_get_examples", "export_examples"})
+
+
+class ExtendedFastApiMCP(FastApiMCP):
+    """
+    FastApiMCP の拡張クラス
+
+    - OpenAPIスナップショットが採用されている場合は、スキーマを再生成せずにツールを生成します。
+    - MCPツールの呼び出し結果にはレスポンスボディしか含まれないため、
+      ページネーションのカーソル（X-Next-Cursor ヘッダー）をボディに含めて返します。
+    - MCPツールの呼び出しごとのレイテンシを記録します。
+    - tool_cache が設定されている場合は、対象のツールの結果をキャッシュします（tool_cache.py）。
+    - メトリクスとサンプルのエクスポートをMCPリソースとして公開します（resources.py）。
+    """
+
+    tool_cache: Optional[ToolResultCache] = None
+
+    def setup_server(self) -> None:
+        """
+        OpenAPIスキーマからMCPツールを生成し、低レベルのMCPサーバーを構築
+
+        fastapi_mcp 0.3.3 の FastApiMCP.setup_server() と同じ処理ですが、
+        スキーマの取得元として OpenAPIProvider のスナップショットを優先し、
+        MCPリソース（resources.py）のハンドラーを追加します。
+        """
+        openapi_schema = self._load_openapi_schema()
+
+        all_tools, self.operation_map = convert_openapi_to_mcp_tools(
+            openapi_schema,
+            describe_all_responses=self._describe_all_responses,
+            describe_full_response_schema=self._describe_full_response_schema,
+        )
+
+        # Filter tools based on operation IDs and tags
+        self.tools = self._filter_tools(all_tools, openapi_schema)
+
+        mcp_server: LowlevelMCPServer = LowlevelMCPServer(self.name, self.description)
+
+        @mcp_server.list_tools()
+        async def handle_list_tools() -> List[types.Tool]:
+            return self.tools
+
+        @mcp_server.call_tool()
+        async def handle_call_tool(
+            name: str,
+            arguments: Dict[str, Any],
+            http_request_info: Optional[HTTPRequestInfo] = None,
+        ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+            return await self._execute_api_tool(
+                client=self._http_client,
+                tool_name=name,
+                arguments=arguments,
+                operation_map=self.operation_map,
+                http_request_info=http_request_info,
+            )
+
+        @mcp_server.list_resources()
+        async def handle_list_resources() -> List[types.Resource]:
+            return list(MCP_RESOURCES)
+
+        @mcp_server.list_resource_templates()
+        async def handle_list_resource_templates() -> List[types.ResourceTemplate]:
+            return list(MCP_RESOURCE_TEMPLATES)
+
+        @mcp_server.read_resource()
+        async def handle_read_resource(uri: AnyUrl) -> Iterable[ReadResourceContents]:
+            return await read_resource(uri)
+
+        self.server = mcp_server
+
+    def _load_openapi_schema(self) -> Dict[str, Any]:
+        provider = getattr(self.fastapi.state, "openapi_provider", None)
+        if provider is not None and provider.from_snapshot:
+            return provider.schema()
+        return get_openapi(
+            title=self.fastapi.title,
+            version=self.fastapi.version,
+            openapi_version=self.fastapi.openapi_version,
+            description=self.fastapi.description,
+            routes=self.fastapi.routes,
+        )
+
+    async def _execute_api_tool(
+        self,
+        client: httpx.AsyncClient,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        operation_map: Dict[str, Dict[str, Any]],
+        http_request_info: Optional[HTTPRequestInfo] = None,
+    ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+        cache = self.tool_cache
+        if cache is None or not cache.enabled_for(tool_name):
+            return await self._execute_api_tool_uncached(
+                client, tool_name, arguments, operation_map, http_request_info
+            )
+        started = time.perf_counter_ns()
+        headers = http_request_info.headers if http_request_info is not None else {}
+        key = cache.make_key(
+            tool_name, arguments, headers.get("Authorization") or headers.get("authorization")
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            if settings.METRICS_ENABLED:
+                metrics_registry.observe_tool(
+                    tool_name, "cached", time.perf_counter_ns() - started
+                )
+            return cached
+        # 実行中に書き込みがあった場合に結果を使わないよう、実行前のバージョンを記録する
+        version = cache.version()
+        result = await self._execute_api_tool_uncached(
+            client, tool_name, arguments, operation_map, http_request_info
+        )
+        cache.set(key, result, version)
+        return result
+
+    async def _execute_api_tool_uncached(
+        self,
+        client: httpx.AsyncClient,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        operation_map: Dict[str, Dict[str, Any]],
+        http_request_info: Optional[HTTPRequestInfo] = None,
+    ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+        if not settings.METRICS_ENABLED:
+            return await super()._execute_api_tool(
+                client, tool_name, arguments, operation_map, http_request_info
+            )
+        started = time.perf_counter_ns()
+        status = "error"
+        try:
+            result = await super()._execute_api_tool(
+                client, tool_name, arguments, operation_map, http_request_info
+            )
+            status = "ok"
+            return result
+        finally:
+            metrics_registry.observe_tool(tool_name, status, time.perf_counter_ns() - started)
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        path: str,
+        query: Dict[str, Any],
+        headers: Dict[str, str],
+        body: Optional[Any],
+    ) -> Any:
+        # 同じプロセス内の呼び出しのため、レスポンスを圧縮・展開しない（httpx の既定は gzip, deflate）
+        headers = {**headers, "Accept-Encoding": "identity"}
+        response = await super()._request(client, method, path, query, headers, body)
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor is None:
+            return response
+        # ページ本体と次ページのカーソルをまとめたレスポンスに差し替える
+        return httpx.Response(
+            status_code=response.status_code,
+            json={"items": response.json(), "next_cursor": next_cursor},
+            request=response.request,
+        )
+
+
+def create_mcp_server(
+    app: FastAPI, include_operations: Optional[List[str]] = None
+) -> ExtendedFastApiMCP:
+    """
+    MCPサーバーを作成
+
+    FastAPIアプリケーションのルートからMCPツールを生成します（マウントは行いません）。
+
+    Args:
+        app: FastAPIアプリケーション
+        include_operations: MCPツールとして公開するオペレーションID
+            （Noneの場合は MCP_EXCLUDED_OPERATIONS 以外の全て）
+
+    Returns:
+        ExtendedFastApiMCP: MCPサーバー
+    """
+    # fastapi_mcp は include_operations と exclude_operations の同時指定を許可しないため、
+    # include_operations が指定された場合は除外対象をそこから取り除く
+    exclude_operations: Optional[List[str]] = None
+    if include_operations is None:
+        exclude_operations = sorted(MCP_EXCLUDED_OPERATIONS)
+    else:
+        include_operations = [
+            operation_id
+            for operation_id in include_operations
+            if operation_id not in MCP_EXCLUDED_OPERATIONS
+        ]
+
+    # MCPサーバーの作成
+    logger.debug("MCPサーバー作成開始")
+    mcp_server = ExtendedFastApiMCP(
+        fastapi=app,
+        name=MCP_SERVER_NAME,
+        description=MCP_SERVER_DESCRIPTION,
+        include_operations=include_operations,
+        exclude_operations=exclude_operations,
+    )
+    if settings.MCP_TOOL_CACHE_ENABLED:
+        mcp_server.tool_cache = tool_result_cache
+    logger.debug("MCPサーバー作成完了")
+
+    # MCPサーバーの設定
+    # FastApiMCP 0.3.3では、FastAPIのエンドポイントを自動的にMCPツールとして登録するため、
+    # カスタムツールのインポートは不要ですが、明示的に登録することもできます。
+    # なお、ツールの生成（setup_server）はコンストラクタ内で実行済みです。
+    logger.debug("MCPサーバー設定開始")
+
+    # カスタムMCPツールを明示的に登録
+    if hasattr(mcp_server, "add_tool") and callable(mcp_server.add_tool):
+        mcp_server.add_tool(get_examples_tool)
+        mcp_server.add_tool(get_example_tool)
+        logger.debug("明示的にツールを登録: get_examples_tool, get_example_tool")
+
+    logger.debug("MCPサーバー設定完了")
+
+    # 登録されたツールの一覧を表示（DEBUGレベルが有効な場合のみ一覧を組み立てる）
+    if logger.isEnabledFor(logging.DEBUG):
+        # FastApiMCP 0.3.3では、toolsプロパティを使用してツール一覧を取得
+        tool_names = [tool.name for tool in getattr(mcp_server, "tools", [])]
+        logger.debug("登録されたMCPツール一覧: %s", ", ".join(tool_names))
+
+    return mcp_server
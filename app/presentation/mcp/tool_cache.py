@@ -0,0 +1,233 @@
+"""
+MCPツールの結果キャッシュ
+
+FastApiMCP はツールの呼び出しごとに内部のHTTPリクエストで FastAPI のルートを実行します。
+エージェントは同じセッション内で同じ引数の参照を繰り返すことが多いため、
+キャッシュを有効にしたツール（MCP_TOOL_CACHE_TTLS）の結果をツール名と正規化した引数ごとに保持します。
+
+- TTL を過ぎたエントリと、最大件数を超えた最も古いエントリは破棄する
+- エントリにはリポジトリのバージョン（データを変更するたびに増加）を記録し、
+  書き込みでバージョンが変わった後のエントリは使用しない
+- invalidate() で明示的に破棄できる
+- ツールごとのヒット数・ミス数は stats() と MCPリソース（metrics://tool-cache）で公開する
+
+バージョンはプロセスごとの値のため、無効化されるのは同じプロセスでの書き込みだけです。
+インメモリのリポジトリ（EXAMPLES_STORAGE=memory）はプロセスごとにデータを持つため常に正しく
+無効化されますが、SQLite は gunicorn の他のワーカーや外部のプロセスからも書き込まれ、
+その変更は TTL が過ぎるまで反映されません。そのため MCP_TOOL_CACHE_TTLS が未指定の場合、
+SQLite ではキャッシュを無効にします（明示的に指定した場合は TTL までの遅延を許容するものとします）。
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.infrastructure.repository import async_example_repository
+
+CacheKey = Tuple[str, str, str]
+
+# インメモリのリポジトリで既定でキャッシュするツールと TTL（秒）
+DEFAULT_TOOL_CACHE_TTLS: Dict[str, float] = {
+    "get_example": 60.0,
+    "get_examples": 30.0,
+    "get_examples_batch": 60.0,
+    "search_examples": 30.0,
+}
+
+
+class CachedToolResult(NamedTuple):
+    """
+    キャッシュしたツールの結果
+    """
+
+    content: List[Any]
+    expires_at: float
+    version: int
+
+
+def canonicalize_arguments(arguments: Optional[Mapping[str, Any]]) -> str:
+    """
+    ツールの引数をキーの順序や空白に依存しない文字列に変換
+
+    Args:
+        arguments: ツールの引数
+
+    Returns:
+        キーをソートしたJSON文字列
+    """
+    return json.dumps(
+        arguments or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+
+
+def resolve_tool_cache_ttls(
+    configured: Optional[Mapping[str, float]], storage: str
+) -> Mapping[str, float]:
+    """
+    キャッシュするツールと TTL を決定
+
+    Args:
+        configured: MCP_TOOL_CACHE_TTLS の値（Noneの場合は既定値）
+        storage: EXAMPLES_STORAGE の値
+
+    Returns:
+        ツール名と TTL（秒）。指定がなく、複数のプロセスから書き込まれるストレージの場合は空
+    """
+    if configured is not None:
+        return configured
+    return DEFAULT_TOOL_CACHE_TTLS if storage == "memory" else {}
+
+
+class ToolResultCache:
+    """
+    ツール名と引数をキーとする TTL / LRU キャッシュ
+
+    イベントループのスレッドからのみ操作されることを前提としており、ロックは使用しません。
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float],
+        max_entries: int = 1024,
+        version: Callable[[], int] = lambda: 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            ttls: キャッシュするツール名と TTL（秒）。含まれないツールはキャッシュしない
+            max_entries: 保持する最大エントリ数
+            version: データのバージョンを返す関数（値が変わるとそれまでのエントリは無効）
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.ttls = {name: float(ttl) for name, ttl in ttls.items() if ttl > 0}
+        self.version = version
+        self.clock = clock
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._entries: LRUCache[CachedToolResult] = LRUCache(max_entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def enabled_for(self, tool_name: str) -> bool:
+        """
+        ツールの結果をキャッシュするかどうか
+
+        Args:
+            tool_name: ツール名
+
+        Returns:
+            キャッシュする場合はTrue
+        """
+        return tool_name in self.ttls
+
+    @staticmethod
+    def make_key(
+        tool_name: str,
+        arguments: Optional[Mapping[str, Any]],
+        authorization: Optional[str] = None,
+    ) -> CacheKey:
+        """
+        キャッシュのキーを作成
+
+        ツールの呼び出しには Authorization ヘッダーが転送されるため、
+        異なる認証情報の結果を共有しないようヘッダーのハッシュもキーに含めます。
+
+        Args:
+            tool_name: ツール名
+            arguments: ツールの引数
+            authorization: 転送される Authorization ヘッダーの値
+
+        Returns:
+            キー
+        """
+        credential = (
+            hashlib.blake2b(authorization.encode("utf-8"), digest_size=16).hexdigest()
+            if authorization
+            else ""
+        )
+        return (tool_name, canonicalize_arguments(arguments), credential)
+
+    def get(self, key: CacheKey) -> Optional[List[Any]]:
+        """
+        キャッシュした結果を取得
+
+        Args:
+            key: make_key() で作成したキー
+
+        Returns:
+            結果。存在しない、期限切れ、またはデータが変更された後の場合はNone
+        """
+        tool_name = key[0]
+        entry = self._entries.get(key)
+        if entry is not None and (
+            entry.expires_at <= self.clock() or entry.version != self.version()
+        ):
+            self._entries.pop(key)
+            entry = None
+        if entry is None:
+            self.misses[tool_name] = self.misses.get(tool_name, 0) + 1
+            return None
+        self.hits[tool_name] = self.hits.get(tool_name, 0) + 1
+        return list(entry.content)
+
+    def set(self, key: CacheKey, content: List[Any], version: int) -> None:
+        """
+        結果を登録
+
+        Args:
+            key: make_key() で作成したキー
+            content: ツールの結果
+            version: ツールを実行する前に取得したデータのバージョン
+                （実行中に書き込みがあった場合、このエントリは次の取得時に破棄される）
+        """
+        ttl = self.ttls.get(key[0])
+        if ttl is None:
+            return
+        self._entries.set(key, CachedToolResult(list(content), self.clock() + ttl, version))
+
+    def invalidate(self, tool_name: Optional[str] = None) -> None:
+        """
+        キャッシュを破棄
+
+        Args:
+            tool_name: 破棄するツール名（Noneの場合は全て）
+        """
+        if tool_name is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries.keys() if key[0] == tool_name]:
+            self._entries.pop(key)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        ツールごとのヒット数・ミス数をJSONに変換できる形式で取得
+
+        Returns:
+            エントリ数・最大エントリ数・ツールごとの TTL / ヒット数 / ミス数
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._entries.max_entries,
+            "tools": {
+                name: {
+                    "ttl_seconds": ttl,
+                    "hits": self.hits.get(name, 0),
+                    "misses": self.misses.get(name, 0),
+                }
+                for name, ttl in sorted(self.ttls.items())
+            },
+        }
+
+
+# アプリケーション全体で共有するキャッシュ（このプロセスでのリポジトリへの書き込みで無効になる）
+tool_result_cache = ToolResultCache(
+    resolve_tool_cache_ttls(settings.MCP_TOOL_CACHE_TTLS, settings.EXAMPLES_STORAGE),
+    max_entries=settings.MCP_TOOL_CACHE_MAX_ENTRIES,
+    version=lambda: async_example_repository.version,
+)
@@ -0,0 +1,248 @@
+"""
+レスポンス圧縮ミドルウェア
+
+Accept-Encoding に応じてレスポンスを brotli（brotli がインストールされている場合）または
+gzip で圧縮します。
+
+- minimum_size 未満のレスポンスは圧縮しない（圧縮のコストとヘッダーの分だけ損になるため）
+- 既に Content-Encoding が付いたレスポンス（/openapi.json や /api/examples/export の gzip）、
+  SSE（text/event-stream）、exclude_paths（/mcp）は圧縮しない
+- ボディが1回で送られるレスポンスは、ETag（ない場合はボディのハッシュ）ごとに圧縮済みの
+  バイト列を LRU キャッシュに保持し、同じレスポンスを何度も圧縮しない
+- ストリーミングのレスポンスは、チャンクごとに圧縮してフラッシュしながら送信する
+- Lambda（Mangum）で実行している場合は圧縮しない（is_lambda_request を参照）
+"""
+
+import gzip
+import importlib.util
+import zlib
+from typing import Any, Callable, Collection, Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import LRUCache
+from app.presentation.api.streaming import is_lambda_request
+from app.presentation.middleware.response_cache import RawHeaders, compute_etag
+
+# サーバー側の優先順（同じ q 値の場合は brotli を優先する）
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+SUPPORTED_ENCODINGS: Tuple[str, ...] = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+# 圧縮しても小さくならないメディアタイプと、ストリーミングの SSE
+_SKIPPED_CONTENT_TYPES = (b"text/event-stream", b"image/", b"video/", b"audio/")
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], available: Sequence[str] = SUPPORTED_ENCODINGS
+) -> Optional[str]:
+    """
+    Accept-Encoding から使用するエンコーディングを選択
+
+    Args:
+        accept_encoding: Accept-Encoding ヘッダーの値
+        available: 使用できるエンコーディング（優先順）
+
+    Returns:
+        q 値が最も高いエンコーディング（同じ場合は available の順）。使用できるものがなければNone
+    """
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for value in accept_encoding.split(","):
+        coding, _, params = value.strip().partition(";")
+        quality = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in available:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _StreamCompressor:
+    """
+    ストリーミング用の圧縮器（チャンクごとにフラッシュし、受信側がすぐに展開できるようにする）
+    """
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self._brotli: Any = None
+        if encoding == "br":
+            import brotli
+
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            output = self._brotli.process(data) if data else b""
+            return output + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class CompressionMiddleware:
+    """
+    gzip / brotli でレスポンスを圧縮する純粋なASGIミドルウェア
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        exclude_paths: Collection[str] = (),
+        cache_max_entries: int = 256,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            minimum_size: 圧縮する最小のボディサイズ（バイト）
+            gzip_level: gzip の圧縮レベル（1〜9）
+            brotli_quality: brotli の品質（0〜11）
+            exclude_paths: 圧縮しないパスのプレフィックス（例: "/mcp"）
+            cache_max_entries: 圧縮済みのボディをキャッシュする最大件数
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_paths = tuple(exclude_paths)
+        self.cache: LRUCache[bytes] = LRUCache(cache_max_entries)
+        self._compressors: Dict[str, Callable[[bytes], bytes]] = {
+            "gzip": lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        }
+        if BROTLI_AVAILABLE:
+            import brotli
+
+            self._compressors["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or scope["path"].startswith(self.exclude_paths)
+            or is_lambda_request(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), tuple(self._compressors)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, stream, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if self._compressible(message):
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            more_body: bool = message.get("more_body", False)
+            if stream is None and not more_body:
+                # ボディ全体が1回で送られるレスポンス
+                passthrough = True
+                if len(body) < self.minimum_size:
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressed = self._compress(scope, start_message, body, encoding)
+                await send(self._encoded_start(start_message, encoding, len(compressed)))
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if stream is None:
+                # 全体のサイズが分からないため、最小サイズに関係なく逐次圧縮する
+                stream = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                await send(self._encoded_start(start_message, encoding, None))
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": stream.compress(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressible(message: Message) -> bool:
+        status = message["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        for name, value in message.get("headers", []):
+            name = name.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type" and value.lower().startswith(_SKIPPED_CONTENT_TYPES):
+                return False
+        return True
+
+    def _compress(self, scope: Scope, start_message: Message, body: bytes, encoding: str) -> bytes:
+        etag = Headers(raw=start_message.get("headers", [])).get("etag")
+        if etag is None or etag.startswith("W/"):
+            etag = compute_etag(body).decode("ascii")
+        # ETag はURLごとの値のため、パスとクエリ文字列もキーに含める
+        key = (scope["path"], scope.get("query_string", b""), etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self._compressors[encoding](body)
+            self.cache.set(key, compressed)
+        return compressed
+
+    @staticmethod
+    def _encoded_start(
+        start_message: Message, encoding: str, content_length: Optional[int]
+    ) -> Message:
+        headers: RawHeaders = []
+        vary: Optional[bytes] = None
+        for name, value in start_message.get("headers", []):
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"vary":
+                vary = value
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                # 圧縮後の表現はバイト列が異なるため、強いETagを弱いETagにする
+                value = b"W/" + value
+            headers.append((name, value))
+        if vary is None:
+            vary = b"Accept-Encoding"
+        elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+            vary += b", Accept-Encoding"
+        headers.append((b"vary", vary))
+        headers.append((b"content-encoding", encoding.encode("ascii")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("ascii")))
+        return {**start_message, "headers": headers}
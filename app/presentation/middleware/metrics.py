@@ -0,0 +1,77 @@
+"""
+レイテンシメトリクスミドルウェア
+
+リクエストごとのレイテンシを、ルートのパステンプレート・ステータスコード・呼び出し元ごとに
+MetricsRegistry へ記録します。MCPツールの呼び出しは fastapi_mcp が内部のHTTPリクエストとして
+アプリケーションを呼び出すため、Host ヘッダーで REST の呼び出しと区別します。
+"""
+
+import time
+from typing import Collection
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import MetricsRegistry
+
+# fastapi_mcp がツール呼び出しに使用する内部クライアントのホスト名
+MCP_INTERNAL_HOST = b"apiserver"
+
+# ルートに一致しなかったリクエストのラベル（パスをそのままラベルにすると系列数が増え続けるため）
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    リクエストのレイテンシを記録する純粋なASGIミドルウェア
+
+    レイテンシはレスポンスボディの送信完了までの時間です。
+    SSE のような長時間の接続は exclude_paths で計測対象から除外します。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        registry: MetricsRegistry,
+        exclude_paths: Collection[str] = (),
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            registry: 記録先のレジストリ
+            exclude_paths: 計測しないパス（完全一致）
+        """
+        self.app = app
+        self.registry = registry
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter_ns()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ns = time.perf_counter_ns() - started
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.registry.observe_request(
+                scope["method"], route, status, self._source(scope), duration_ns
+            )
+
+    @staticmethod
+    def _source(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"host":
+                return "mcp" if value == MCP_INTERNAL_HOST else "rest"
+        return "rest"
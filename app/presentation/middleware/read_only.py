@@ -0,0 +1,65 @@
+"""
+読み取り専用モードミドルウェア
+
+settings.READ_ONLY_MODE が有効な場合、書き込み系メソッドのリクエストをアプリケーションに
+渡さずに 403 で応答します。純粋なASGIミドルウェアとして実装しているため、
+BaseHTTPMiddleware のようなリクエストごとのタスク生成やストリームの中継を行わず、
+SSE などのストリーミングレスポンスもそのまま下流に流れます。
+"""
+
+import json
+from typing import Collection, List, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+# 読み取り専用モードで拒否するHTTPメソッド
+WRITE_METHODS: Tuple[str, ...] = ("POST", "PUT", "DELETE", "PATCH")
+
+READ_ONLY_DETAIL = "Application is in read-only mode. Write operations are disabled."
+
+
+class ReadOnlyMiddleware:
+    """
+    書き込み系メソッドを事前エンコード済みの 403 レスポンスで拒否する純粋なASGIミドルウェア
+
+    レスポンスボディは HTTPException と同じ {"detail": ...} 形式です。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        methods: Collection[str] = WRITE_METHODS,
+        detail: str = READ_ONLY_DETAIL,
+        exempt_paths: Collection[str] = (),
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            methods: 読み取り専用モードで拒否するHTTPメソッド
+            detail: 403 レスポンスのエラーメッセージ
+            exempt_paths: 書き込み系メソッドでもデータを変更しないため拒否しないパス（完全一致）
+        """
+        self.app = app
+        self.methods = frozenset(method.upper() for method in methods)
+        self.exempt_paths = frozenset(exempt_paths)
+        self.body = json.dumps({"detail": detail}, separators=(",", ":")).encode("utf-8")
+        self.headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self.body)).encode("ascii")),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and settings.READ_ONLY_MODE
+            and scope["method"] in self.methods
+            and scope["path"] not in self.exempt_paths
+        ):
+            await send({"type": "http.response.start", "status": 403, "headers": self.headers})
+            await send({"type": "http.response.body", "body": self.body})
+            return
+        await self.app(scope, receive, send)
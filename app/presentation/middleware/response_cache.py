@@ -0,0 +1,195 @@
+"""
+レスポンスキャッシュミドルウェア
+
+読み取り専用エンドポイントのレスポンスに ETag を付与し、If-None-Match が一致する場合は
+304 を返します。読み取り専用モード（settings.READ_ONLY_MODE）ではレスポンスが変化しないため、
+エンコード済みのレスポンスバイト列をメモリに保持し、アプリケーションを経由せずに返します。
+"""
+
+import hashlib
+from typing import Any, Collection, List, NamedTuple, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+# 304 レスポンスに引き継ぐヘッダー（RFC 9110 15.4.5）
+_NOT_MODIFIED_HEADERS = frozenset(
+    (b"cache-control", b"content-location", b"date", b"etag", b"expires", b"vary")
+)
+
+
+class CachedResponse(NamedTuple):
+    """
+    キャッシュされたレスポンス
+    """
+
+    status: int
+    headers: RawHeaders
+    body: bytes
+    etag: bytes
+    # レスポンスを返したルート（キャッシュから返す場合も scope["route"] に設定する）
+    route: Any = None
+
+
+def compute_etag(body: bytes) -> bytes:
+    """
+    レスポンスボディから強いETagを計算
+
+    Args:
+        body: レスポンスボディ
+
+    Returns:
+        引用符付きのETag
+    """
+    return b'"' + hashlib.blake2b(body, digest_size=16).hexdigest().encode("ascii") + b'"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: bytes) -> bool:
+    """
+    If-None-Match ヘッダーがETagに一致するか判定（弱い比較）
+
+    Args:
+        if_none_match: If-None-Match ヘッダーの値
+        etag: 引用符付きのETag
+
+    Returns:
+        一致する場合はTrue
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    expected = etag.decode("ascii")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == expected:
+            return True
+    return False
+
+
+class ResponseCacheMiddleware:
+    """
+    読み取り専用エンドポイント向けのレスポンスキャッシュ（純粋なASGIミドルウェア）
+
+    キャッシュ対象はルートのパステンプレート（例: "/api/examples/{example_id}"）で指定し、
+    キーはホスト・パス・正規化したクエリ文字列です。読み取り専用モードを抜けた時点で
+    キャッシュは自動的に破棄されます。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        route_paths: Collection[str],
+        max_entries: int = 1024,
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            route_paths: キャッシュ対象のルートのパステンプレート
+            max_entries: キャッシュする最大レスポンス数
+        """
+        self.app = app
+        self.route_paths = frozenset(route_paths)
+        self.cache: LRUCache[CachedResponse] = LRUCache(max_entries)
+
+    def invalidate(self) -> None:
+        """
+        キャッシュを破棄
+        """
+        self.cache.clear()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        read_only = settings.READ_ONLY_MODE
+        if not read_only and len(self.cache):
+            # 読み取り専用モードを抜けたため、保持しているレスポンスは古くなり得る
+            self.invalidate()
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        key = self._cache_key(scope, request_headers)
+
+        if read_only:
+            cached = self.cache.get(key)
+            if cached is not None:
+                scope["route"] = cached.route
+                await self._send_cached(cached, if_none_match, send)
+                return
+
+        start_message: Optional[Message] = None
+        body_parts: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                if (
+                    message["status"] != 200
+                    or getattr(route, "path", None) not in self.route_paths
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if message["type"] == "http.response.body" and start_message is not None:
+                body_parts.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = b"".join(body_parts)
+                headers: RawHeaders = [
+                    (name, value)
+                    for name, value in start_message.get("headers", [])
+                    if name.lower() != b"etag"
+                ]
+                etag = compute_etag(body)
+                headers.append((b"etag", etag))
+                cached = CachedResponse(200, headers, body, etag, scope.get("route"))
+                if read_only:
+                    self.cache.set(key, cached)
+                await self._send_cached(cached, if_none_match, send)
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _cache_key(scope: Scope, headers: Headers) -> Tuple[str, str, bytes]:
+        query_string: bytes = scope.get("query_string", b"")
+        if b"&" in query_string:
+            query_string = b"&".join(sorted(query_string.split(b"&")))
+        return headers.get("host", ""), scope["path"], query_string
+
+    @staticmethod
+    async def _send_cached(
+        cached: CachedResponse, if_none_match: Optional[str], send: Send
+    ) -> None:
+        if etag_matches(if_none_match, cached.etag):
+            headers = [
+                (name, value)
+                for name, value in cached.headers
+                if name.lower() in _NOT_MODIFIED_HEADERS
+            ]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {"type": "http.response.start", "status": cached.status, "headers": cached.headers}
+        )
+        await send({"type": "http.response.body", "body": cached.body})
@@ -0,0 +1,142 @@
+"""
+サンプルアプリケーション（example/main.py）へのデータ投入時間の計測
+
+次の方式で N 件のサンプルを登録し、所要時間と records/sec を比較します。
+
+- single: POST /api/examples を1件ずつ呼び出す
+- bulk-json: POST /api/examples/bulk にJSON配列で一括登録する
+- bulk-ndjson: POST /api/examples/bulk に NDJSON で一括登録する
+
+single は1リクエストごとのオーバーヘッドが大きいため、--single-records 件のみ計測します。
+
+使い方:
+    python -m benchmarks.bench_example_bulk --records 50000 --single-records 2000
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List
+
+from fastapi.testclient import TestClient
+
+EXAMPLE_APP_PATH = Path(__file__).resolve().parents[1] / "example" / "main.py"
+
+
+def load_example_app() -> ModuleType:
+    """
+    データを初期化したサンプルアプリケーションのモジュールを読み込む
+
+    Returns:
+        サンプルアプリケーションのモジュール
+    """
+    spec = importlib.util.spec_from_file_location("example_main", EXAMPLE_APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_payload(count: int) -> List[Dict[str, str]]:
+    """
+    登録するサンプルデータを作成
+
+    Args:
+        count: 件数
+
+    Returns:
+        サンプルデータ
+    """
+    return [{"name": f"Seed {i}", "description": f"Seeded example {i}"} for i in range(count)]
+
+
+def measure_single(count: int) -> float:
+    """
+    1件ずつ登録したときの所要時間を計測
+
+    Args:
+        count: 件数
+
+    Returns:
+        所要時間（秒）
+    """
+    client = TestClient(load_example_app().app)
+    payload = build_payload(count)
+    started = time.perf_counter()
+    for item in payload:
+        assert client.post("/api/examples", json=item).status_code == 201
+    return time.perf_counter() - started
+
+
+def measure_bulk(count: int, ndjson: bool) -> float:
+    """
+    一括登録したときの所要時間を計測（リクエストボディのエンコードを含む）
+
+    Args:
+        count: 件数
+        ndjson: NDJSON で送信する場合はTrue
+
+    Returns:
+        所要時間（秒）
+    """
+    client = TestClient(load_example_app().app)
+    payload = build_payload(count)
+    started = time.perf_counter()
+    if ndjson:
+        content = "".join(json.dumps(item) + "\n" for item in payload)
+        headers = {"Content-Type": "application/x-ndjson"}
+    else:
+        content = json.dumps(payload)
+        headers = {"Content-Type": "application/json"}
+    response = client.post("/api/examples/bulk", content=content, headers=headers)
+    assert response.status_code == 201 and len(response.json()) == count
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="サンプルアプリケーションへのデータ投入時間の計測")
+    parser.add_argument("--records", type=int, default=50000, help="一括登録の件数")
+    parser.add_argument("--single-records", type=int, default=2000, help="1件ずつ登録する件数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    results = {
+        "single": (args.single_records, measure_single(args.single_records)),
+        "bulk-json": (args.records, measure_bulk(args.records, ndjson=False)),
+        "bulk-ndjson": (args.records, measure_bulk(args.records, ndjson=True)),
+    }
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    name: {
+                        "records": count,
+                        "seconds": seconds,
+                        "records_per_sec": count / seconds,
+                    }
+                    for name, (count, seconds) in results.items()
+                },
+                indent=2,
+            )
+        )
+    else:
+        for name, (count, seconds) in results.items():
+            print(
+                f"  {name:<12} {count:>8} records "
+                f"{seconds:10.3f} s {count / seconds:12.1f} records/s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+サンプルアプリケーション（example/main.py）の同時更新のストレステスト
+
+多数のクライアントから同時に次の処理を行い、更新の消失（lost update）とIDの重複が
+発生しないことを確認します。同期エンドポイントはスレッドプールで並行に実行されます。
+
+- create: POST /api/examples を同時に呼び出し、払い出されたIDの重複を数える
+- naive: GET で取得したカウンター（description）を +1 して PUT する（If-Match なし）
+- if-match: 同じ処理を If-Match 付きで行い、412 の場合は取得からやり直す
+
+naive では他のクライアントの更新を上書きするため、最終値が期待値より小さくなります。
+
+使い方:
+    python -m benchmarks.bench_example_concurrency --clients 64 --increments 10
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict
+
+import httpx
+
+EXAMPLE_APP_PATH = Path(__file__).resolve().parents[1] / "example" / "main.py"
+
+
+def load_example_app() -> ModuleType:
+    """
+    データを初期化したサンプルアプリケーションのモジュールを読み込む
+
+    Returns:
+        サンプルアプリケーションのモジュール
+    """
+    spec = importlib.util.spec_from_file_location("example_main", EXAMPLE_APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def measure_create(
+    client: httpx.AsyncClient, clients: int, per_client: int
+) -> Dict[str, Any]:
+    """
+    同時にサンプルを作成し、IDの重複を数える
+
+    Args:
+        client: HTTPクライアント
+        clients: 同時実行数
+        per_client: クライアントあたりの作成件数
+
+    Returns:
+        計測結果
+    """
+
+    async def worker() -> list:
+        ids = []
+        for _ in range(per_client):
+            response = await client.post("/api/examples", json={"name": "stress"})
+            assert response.status_code == 201
+            ids.append(response.json()["id"])
+        return ids
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    ids = [id_ for ids in results for id_ in ids]
+    return {
+        "created": len(ids),
+        "duplicate_ids": len(ids) - len(set(ids)),
+        "requests_per_sec": len(ids) / elapsed,
+    }
+
+
+async def measure_increments(
+    client: httpx.AsyncClient, clients: int, increments: int, if_match: bool
+) -> Dict[str, Any]:
+    """
+    同時にカウンターを増やし、更新の消失を数える
+
+    Args:
+        client: HTTPクライアント
+        clients: 同時実行数
+        increments: クライアントあたりの加算回数
+        if_match: If-Match で楽観的排他制御を行う場合はTrue
+
+    Returns:
+        計測結果
+    """
+    response = await client.post(
+        "/api/examples", json={"name": "counter", "description": "0"}
+    )
+    url = f"/api/examples/{response.json()['id']}"
+    conflicts = 0
+
+    async def worker() -> None:
+        nonlocal conflicts
+        for _ in range(increments):
+            while True:
+                current = await client.get(url)
+                value = int(current.json()["description"])
+                headers = {"If-Match": current.headers["ETag"]} if if_match else {}
+                response = await client.put(
+                    url, json={"description": str(value + 1)}, headers=headers
+                )
+                if response.status_code == 412:
+                    conflicts += 1
+                    continue
+                assert response.status_code == 200
+                break
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    expected = clients * increments
+    final = int((await client.get(url)).json()["description"])
+    return {
+        "expected": expected,
+        "final": final,
+        "lost_updates": expected - final,
+        "conflicts_retried": conflicts,
+        "seconds": elapsed,
+    }
+
+
+async def run_benchmarks(clients: int, increments: int, creates: int) -> Dict[str, Any]:
+    """
+    全てのストレステストを実行
+
+    Args:
+        clients: 同時実行数
+        increments: クライアントあたりの加算回数
+        creates: クライアントあたりの作成件数
+
+    Returns:
+        計測結果
+    """
+    app = load_example_app().app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://example") as client:
+        return {
+            "create": await measure_create(client, clients, creates),
+            "naive": await measure_increments(client, clients, increments, if_match=False),
+            "if-match": await measure_increments(client, clients, increments, if_match=True),
+        }
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード（更新の消失またはIDの重複があった場合は1）
+    """
+    parser = argparse.ArgumentParser(description="サンプルアプリケーションの同時更新のストレステスト")
+    parser.add_argument("--clients", type=int, default=64, help="同時実行数")
+    parser.add_argument("--increments", type=int, default=10, help="クライアントあたりの加算回数")
+    parser.add_argument("--creates", type=int, default=50, help="クライアントあたりの作成件数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args.clients, args.increments, args.creates))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        create = results["create"]
+        print(f"{args.clients} clients")
+        print(
+            f"  create    {create['created']:>8} ids, {create['duplicate_ids']} duplicates, "
+            f"{create['requests_per_sec']:.1f} req/s"
+        )
+        for name in ("naive", "if-match"):
+            result = results[name]
+            print(
+                f"  {name:<9} final {result['final']:>6} / {result['expected']:<6} "
+                f"lost {result['lost_updates']:>6}  retried {result['conflicts_retried']:>6}  "
+                f"{result['seconds']:.2f} s"
+            )
+    failed = results["create"]["duplicate_ids"] or results["if-match"]["lost_updates"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+NDJSONエクスポートのリクエストあたりのピークメモリ計測
+
+データ件数を変えながら GET /api/examples/export を1回処理し、処理中に確保されたメモリの
+ピーク（tracemalloc）を計測します。比較用に、全件を1つのJSON配列にエンコードした場合の
+ピークも計測します。
+
+レスポンスはASGIアプリケーションを直接呼び出して受け取り、受信したチャンクは破棄します
+（httpx の ASGITransport はレスポンス全体をバッファリングするため使用しません）。
+
+使い方:
+    python -m benchmarks.bench_export_memory --records 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tracemalloc
+from typing import Any, Dict, List
+
+from starlette.types import Message
+
+from app.core.config import settings
+from app.core.json_response import get_json_encoder
+from app.infrastructure.example_repository import example_repository
+from app.main import app
+
+
+def seed_examples(count: int) -> None:
+    """
+    計測用のサンプルデータを登録
+
+    Args:
+        count: 登録件数
+    """
+    example_repository.clear()
+    example_repository.bulk_load(
+        {"id": i, "name": f"Example {i}", "description": f"This is example {i}"}
+        for i in range(1, count + 1)
+    )
+
+
+async def export_once(gzip: bool) -> int:
+    """
+    エクスポートを1回処理し、送信されたバイト数を返す
+
+    Args:
+        gzip: gzip で受け取る場合はTrue
+
+    Returns:
+        送信されたボディのバイト数
+    """
+    headers = [(b"host", b"bench"), (b"accept-encoding", b"gzip" if gzip else b"identity")]
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/examples/export",
+        "raw_path": b"/api/examples/export",
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = 0
+    request_sent = False
+    completed = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # レスポンスの送信が終わるまで切断を通知しない
+        await completed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                completed.set()
+
+    await app(scope, receive, send)
+    return sent
+
+
+def measure_peak(func: Any) -> int:
+    """
+    関数の実行中に確保されたメモリのピークを計測
+
+    Args:
+        func: 計測する関数
+
+    Returns:
+        ピークのバイト数
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="NDJSONエクスポートのピークメモリ計測")
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[1000, 10000, 100000], help="データ件数"
+    )
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    encode = get_json_encoder(settings.JSON_RESPONSE_CLASS)
+    results: List[Dict[str, int]] = []
+    for count in args.records:
+        seed_examples(count)
+        asyncio.run(export_once(gzip=False))  # ウォームアップ
+        results.append(
+            {
+                "records": count,
+                "json_array_peak_bytes": measure_peak(
+                    lambda: encode(example_repository.list_all())
+                ),
+                "export_peak_bytes": measure_peak(lambda: asyncio.run(export_once(gzip=False))),
+                "export_gzip_peak_bytes": measure_peak(
+                    lambda: asyncio.run(export_once(gzip=True))
+                ),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"chunk size {settings.EXAMPLES_EXPORT_CHUNK_SIZE}")
+        print(f"  {'records':>8} {'json array':>12} {'export':>12} {'export gzip':>12}  (KiB)")
+        for result in results:
+            print(
+                f"  {result['records']:>8} "
+                f"{result['json_array_peak_bytes'] / 1024:>12.1f} "
+                f"{result['export_peak_bytes'] / 1024:>12.1f} "
+                f"{result['export_gzip_peak_bytes'] / 1024:>12.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+JSONエンコーダーごとの GET /api/examples のスループット計測
+
+アプリケーションをインプロセスのASGIトランスポート経由で呼び出し、
+settings.JSON_RESPONSE_CLASS で選択できる各エンコーダーの requests/sec を比較します。
+比較用に、FastAPI標準の response_model 検証と jsonable_encoder を経由する実装も計測します。
+
+使い方:
+    python -m benchmarks.bench_json_encoders --records 1000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.json_response import JSON_RESPONSE_CLASSES, is_encoder_available
+from app.infrastructure.example_repository import example_repository
+from app.main import app
+
+
+def seed_examples(count: int) -> None:
+    """
+    計測用のサンプルデータを登録
+
+    Args:
+        count: 登録件数
+    """
+    example_repository.clear()
+    example_repository.bulk_load(
+        {"id": i, "name": f"Example {i}", "description": f"This is example {i}"}
+        for i in range(1, count + 1)
+    )
+
+
+def build_baseline_app(limit: int) -> FastAPI:
+    """
+    FastAPI標準のシリアライズ経路（response_model検証 + jsonable_encoder）を使う比較用アプリ
+
+    Args:
+        limit: 1リクエストで返す件数
+
+    Returns:
+        FastAPI: 比較用アプリケーション
+    """
+    baseline = FastAPI()
+
+    @baseline.get("/api/examples/", response_model=List[Dict])
+    async def get_examples() -> List[Dict]:
+        examples, _ = example_repository.page(limit)
+        return examples
+
+    return baseline
+
+
+async def measure(asgi_app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """
+    指定したパスへのリクエストのスループットを計測
+
+    Args:
+        asgi_app: 計測対象のASGIアプリケーション
+        path: リクエストパス
+        requests: リクエスト数
+        concurrency: 同時実行数
+
+    Returns:
+        requests/sec
+    """
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # ウォームアップ
+        for _ in range(min(50, requests)):
+            (await client.get(path)).raise_for_status()
+
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                (await client.get(path)).raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return requests / elapsed
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="JSONエンコーダーのスループット計測")
+    parser.add_argument("--records", type=int, default=1000, help="1レスポンスに含める件数")
+    parser.add_argument("--requests", type=int, default=2000, help="エンコーダーごとのリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=10, help="同時実行数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    if args.records > settings.EXAMPLES_MAX_PAGE_SIZE:
+        parser.error(f"--records must be <= {settings.EXAMPLES_MAX_PAGE_SIZE}")
+
+    seed_examples(args.records)
+    path = f"/api/examples/?limit={args.records}"
+    original = settings.JSON_RESPONSE_CLASS
+    results: Dict[str, float] = {}
+    try:
+        results["fastapi-default"] = asyncio.run(
+            measure(build_baseline_app(args.records), path, args.requests, args.concurrency)
+        )
+        for name in JSON_RESPONSE_CLASSES:
+            if not is_encoder_available(name):
+                continue
+            settings.JSON_RESPONSE_CLASS = name
+            results[name] = asyncio.run(measure(app, path, args.requests, args.concurrency))
+    finally:
+        settings.JSON_RESPONSE_CLASS = original
+
+    if args.json:
+        print(json.dumps({"records": args.records, "requests_per_sec": results}, indent=2))
+    else:
+        print(f"GET {path} ({args.requests} requests, concurrency {args.concurrency})")
+        for name, rps in results.items():
+            print(f"  {name:<16} {rps:10.1f} req/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+CDKのLambda関数（cdk/src/lambda）の呼び出しあたりのオーバーヘッド計測
+
+API Gateway への HTTP リクエストは botocore の before-send イベントでスタブの応答に
+差し替えるため、AWSの認証情報やネットワークは不要です。次の2通りで lambda_handler を
+繰り返し呼び出し、1回あたりの時間を比較します。
+
+- per-invocation: 呼び出しごとに boto3 クライアントを作成する（クライアントのキャッシュを毎回破棄）
+- cached: ウォームスタートと同様に、作成済みのクライアントを再利用する
+- value-cached: APIキーの値のキャッシュも有効にする（get_api_key_value のみ。
+  cached までは値のキャッシュを毎回破棄して API Gateway を呼び出す）
+
+使い方:
+    python -m benchmarks.bench_lambda_clients --invocations 200
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List
+
+LAMBDA_DIR = Path(__file__).resolve().parents[1] / "cdk" / "src" / "lambda"
+
+# スタブの応答（get_api_key / create_api_key / create_usage_plan / create_usage_plan_key 共通）
+STUB_BODY = json.dumps({"id": "stub-id", "value": "stub-value"}).encode("utf-8")
+
+
+class StubRaw:
+    """
+    botocore の AWSResponse が読み出す生レスポンスのスタブ
+    """
+
+    def stream(self) -> Iterator[bytes]:
+        yield STUB_BODY
+
+
+def install_stub() -> None:
+    """
+    boto3 の既定セッションに、HTTPリクエストをスタブの応答に差し替えるハンドラーを登録
+    """
+    import boto3
+    from botocore.awsrequest import AWSResponse
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ["AWS_REGION"] = "ap-northeast-1"
+    os.environ["API_KEY_ID"] = "stub-id"
+    os.environ["API_GATEWAY_STAGE_ARN"] = (
+        "arn:aws:apigateway:ap-northeast-1::/restapis/abc123/stages/dev"
+    )
+
+    def respond(request: Any, **kwargs: Any) -> AWSResponse:
+        return AWSResponse(
+            request.url, 200, {"Content-Type": "application/json"}, StubRaw()
+        )
+
+    boto3.setup_default_session()
+    boto3.DEFAULT_SESSION.events.register("before-send", respond)
+
+
+def load_lambda(name: str) -> ModuleType:
+    """
+    Lambda関数のモジュールを読み込む
+
+    Args:
+        name: モジュール名（ファイル名から .py を除いたもの）
+
+    Returns:
+        Lambda関数のモジュール
+    """
+    spec = importlib.util.spec_from_file_location(name, LAMBDA_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(
+    module: ModuleType, event: Dict[str, Any], invocations: int, mode: str
+) -> Dict[str, float]:
+    """
+    lambda_handler の1回あたりの時間を計測
+
+    Args:
+        module: Lambda関数のモジュール
+        event: Lambdaのイベント
+        invocations: 呼び出し回数
+        mode: "per-invocation", "cached" または "value-cached"
+
+    Returns:
+        1回あたりの時間のパーセンタイル（ミリ秒）
+    """
+    handler: Callable[[Dict[str, Any], Any], Dict[str, Any]] = module.lambda_handler
+    values = getattr(module, "_api_key_values", {})
+    module._clients.clear()
+    values.clear()
+    assert handler(event, None)["statusCode"] < 300
+    timings: List[float] = []
+    for _ in range(invocations):
+        if mode == "per-invocation":
+            module._clients.clear()
+        if mode != "value-cached":
+            values.clear()
+        started = time.perf_counter_ns()
+        response = handler(event, None)
+        timings.append((time.perf_counter_ns() - started) / 1_000_000)
+        assert response["statusCode"] < 300, response
+    quantiles = statistics.quantiles(timings, n=100)
+    return {
+        "p50_ms": quantiles[49],
+        "p99_ms": quantiles[98],
+        "mean_ms": statistics.fmean(timings),
+    }
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="Lambda関数の呼び出しあたりのオーバーヘッド計測")
+    parser.add_argument("--invocations", type=int, default=200, help="呼び出し回数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    install_stub()
+    functions = {
+        "get_api_key_value": (load_lambda("get_api_key_value_function"), {}),
+        "manage_api_keys": (
+            load_lambda("manage_api_keys_function"),
+            {"action": "create", "keyName": "bench"},
+        ),
+    }
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, (module, event) in functions.items():
+        modes = ["per-invocation", "cached"]
+        if hasattr(module, "_api_key_values"):
+            modes.append("value-cached")
+        results[name] = {
+            mode: measure(module, event, args.invocations, mode) for mode in modes
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.invocations} invocations (stubbed API Gateway)")
+        for name, modes in results.items():
+            for mode, result in modes.items():
+                print(
+                    f"  {name:<18} {mode:<15} p50 {result['p50_ms']:8.3f} ms  "
+                    f"p99 {result['p99_ms']:8.3f} ms  mean {result['mean_ms']:8.3f} ms"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
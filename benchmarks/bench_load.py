@@ -0,0 +1,631 @@
+"""
+REST と MCP（SSE）の負荷試験
+
+非同期の負荷生成器で、次のシナリオを同時実行数 --concurrency のクローズドループで
+実行し、requests/sec とレイテンシのパーセンタイルを出力します。
+
+- hello: GET /hello
+- list: GET /api/examples/
+- get: GET /api/examples/{id}
+- mcp_tool_call: MCPクライアントのセッション（GET /mcp の SSE + POST /mcp/messages/）から
+  get_example ツールを呼び出す
+
+計測対象（--target）:
+- asgi: プロセス内のASGIアプリケーション（ネットワークを経由しない）
+- uvicorn: ローカルに起動した uvicorn（サブプロセス）
+- all: 両方
+
+--baseline を指定すると、保存済みのベースラインと比較し、requests/sec の低下または
+p95 の増加が --tolerance（割合）を超えたシナリオがある場合は終了コード 1 を返します。
+ベースラインはマシンに依存するため、計測するマシンで --update-baseline により更新します。
+
+使い方:
+    python -m benchmarks.bench_load --target all --repeat 3 --baseline benchmarks/baseline.json
+    python -m benchmarks.bench_load --target all --repeat 3 --baseline benchmarks/baseline.json \
+        --update-baseline
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from starlette.types import ASGIApp, Message
+
+from app.main import app
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+REST_SCENARIOS = {
+    "hello": "/hello",
+    "list": "/api/examples/",
+    "get": "/api/examples/1",
+}
+MCP_PATH = "/mcp"
+MCP_TOOL = ("get_example", {"example_id": 1})
+# ベースラインとの比較に使う指標（True: 大きいほど良い）
+CHECKED_METRICS = {"requests_per_sec": True, "p95_ms": False}
+
+
+class StreamingASGITransport(httpx.AsyncBaseTransport):
+    """
+    レスポンスをストリーミングで返す httpx の ASGI トランスポート
+
+    httpx.ASGITransport はレスポンス全体をバッファリングするため、終わらない SSE の
+    レスポンスを受信できません。このトランスポートはボディをチャンクごとに返し、
+    ストリームを閉じた時点でアプリケーションに http.disconnect を送ります。
+    """
+
+    def __init__(self, asgi_app: ASGIApp) -> None:
+        self.app = asgi_app
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = b"".join([chunk async for chunk in request.stream])  # type: ignore[union-attr]
+        scope: Dict[str, Any] = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": request.url.scheme,
+            "path": request.url.path,
+            "raw_path": request.url.raw_path.split(b"?")[0],
+            "root_path": "",
+            "query_string": request.url.query,
+            "headers": [(k.lower(), v) for k, v in request.headers.raw],
+            "client": ("127.0.0.1", 50000),
+            "server": (request.url.host, request.url.port or 80),
+        }
+        chunks: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        started = asyncio.Event()
+        disconnected = asyncio.Event()
+        response: Dict[str, Any] = {}
+        request_sent = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+                started.set()
+            elif message["type"] == "http.response.body":
+                if message.get("body"):
+                    chunks.put_nowait(message["body"])
+                if not message.get("more_body", False):
+                    chunks.put_nowait(None)
+
+        async def run() -> None:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                chunks.put_nowait(None)
+                started.set()
+
+        task = asyncio.create_task(run())
+        await started.wait()
+        if "status" not in response:
+            await task
+            raise RuntimeError("The application did not send a response")
+
+        class Stream(httpx.AsyncByteStream):
+            async def __aiter__(self) -> AsyncIterator[bytes]:
+                while (chunk := await chunks.get()) is not None:
+                    yield chunk
+
+            async def aclose(self) -> None:
+                disconnected.set()
+                try:
+                    await asyncio.wait_for(task, timeout=1)
+                except Exception:
+                    task.cancel()
+
+        return httpx.Response(
+            response["status"], headers=response["headers"], stream=Stream()
+        )
+
+
+def summarize(
+    samples: List[float], errors: int, elapsed: float
+) -> Dict[str, float]:
+    """
+    計測結果を集計
+
+    Args:
+        samples: 成功したリクエストごとのレイテンシ（秒）
+        errors: 失敗したリクエスト数
+        elapsed: 計測全体の経過時間（秒）
+
+    Returns:
+        requests/sec とレイテンシのパーセンタイル（ミリ秒）
+    """
+    if len(samples) > 1:
+        quantiles = statistics.quantiles(samples, n=100)
+    else:
+        quantiles = (samples or [0.0]) * 99
+    return {
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "requests_per_sec": round(len(samples) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p90_ms": round(quantiles[89] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+async def generate_load(
+    request: Callable[[], Awaitable[bool]], requests: int, concurrency: int
+) -> Dict[str, float]:
+    """
+    クローズドループで負荷をかける（各ワーカーは応答を受け取ってから次のリクエストを送る）
+
+    Args:
+        request: 1リクエストを送り、成功した場合は True を返す関数
+        requests: リクエスト数
+        concurrency: 同時実行数
+
+    Returns:
+        集計結果
+    """
+    for _ in range(min(20, requests)):
+        await request()  # ウォームアップ
+    remaining = requests
+    samples: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                ok = await request()
+            except Exception:
+                ok = False
+            if ok:
+                samples.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, errors, time.perf_counter() - started)
+
+
+async def measure_rest(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int
+) -> Dict[str, float]:
+    """
+    GETリクエストの負荷試験
+
+    Args:
+        client: HTTPクライアント
+        path: リクエストパス
+        requests: リクエスト数
+        concurrency: 同時実行数
+
+    Returns:
+        集計結果
+    """
+
+    async def request() -> bool:
+        return (await client.get(path)).is_success
+
+    return await generate_load(request, requests, concurrency)
+
+
+class McpSseSession:
+    """
+    MCP の SSE トランスポートの最小限のクライアント
+
+    GET /mcp の SSE ストリームで通知された送信先（/mcp/messages/?session_id=...）に
+    JSON-RPC のリクエストを POST し、応答を SSE ストリームから受け取ります。
+    MCP SDK のクライアントはバージョンによって httpx クライアントを差し替えられないため、
+    プロセス内のアプリケーションにも接続できるよう httpx だけで実装しています。
+    """
+
+    def __init__(self, client: httpx.AsyncClient, path: str) -> None:
+        self._client = client
+        self._path = path
+        self._endpoint = ""
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._stack = AsyncExitStack()
+        self._reader: Optional["asyncio.Task[None]"] = None
+
+    async def __aenter__(self) -> "McpSseSession":
+        response = await self._stack.enter_async_context(
+            self._client.stream(
+                "GET", self._path, headers={"Accept": "text/event-stream"}
+            )
+        )
+        response.raise_for_status()
+        events = self._events(response.aiter_lines())
+        async for event, data in events:
+            if event == "endpoint":
+                self._endpoint = data
+                break
+        self._reader = asyncio.create_task(self._dispatch(events))
+        await self.request(
+            "initialize",
+            {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_load", "version": "0"},
+            },
+        )
+        await self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._reader:
+            self._reader.cancel()
+        await self._stack.aclose()
+
+    async def request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        JSON-RPC のリクエストを送信し、結果を返す
+
+        Args:
+            method: メソッド名
+            params: パラメーター
+
+        Returns:
+            応答の result（エラーの場合は RuntimeError を送出）
+        """
+        request_id = next(self._ids)
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._post(
+                {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            )
+            message = await asyncio.wait_for(future, timeout=30)
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in message:
+            raise RuntimeError(message["error"])
+        result: Dict[str, Any] = message["result"]
+        return result
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> bool:
+        """
+        ツールを呼び出す
+
+        Args:
+            name: ツール名
+            arguments: 引数
+
+        Returns:
+            ツールが成功した場合は True
+        """
+        result = await self.request("tools/call", {"name": name, "arguments": arguments})
+        return not result.get("isError", False)
+
+    async def _post(self, message: Dict[str, Any]) -> None:
+        (await self._client.post(self._endpoint, json=message)).raise_for_status()
+
+    async def _dispatch(self, events: AsyncIterator[Tuple[str, str]]) -> None:
+        async for event, data in events:
+            if event != "message":
+                continue
+            message = json.loads(data)
+            future = self._pending.get(message.get("id"))
+            if future and not future.done():
+                future.set_result(message)
+
+    @staticmethod
+    async def _events(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[str, str]]:
+        event, data = "message", []
+        async for line in lines:
+            if not line:
+                if data:
+                    yield event, "\n".join(data)
+                event, data = "message", []
+            elif line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                data.append(line[5:].lstrip())
+
+
+async def measure_mcp(
+    client: httpx.AsyncClient, path: str, requests: int, sessions: int
+) -> Dict[str, float]:
+    """
+    MCPのツール呼び出しの負荷試験
+
+    セッション（SSE接続）ごとにワーカーを1つ割り当て、全てのセッションの初期化が
+    終わってから計測を始めます。
+
+    Args:
+        client: HTTPクライアント（SSE のストリーミングに対応したもの）
+        path: SSEエンドポイントのパス
+        requests: ツール呼び出しの回数
+        sessions: セッション数（同時実行数）
+
+    Returns:
+        集計結果
+    """
+    tool_name, arguments = MCP_TOOL
+    async with McpSseSession(client, path) as session:
+        for _ in range(min(20, requests)):
+            await session.call_tool(tool_name, arguments)  # ウォームアップ
+
+    remaining = requests
+    samples: List[float] = []
+    errors = 0
+    ready = 0
+    all_ready = asyncio.Event()
+    finished = asyncio.Event()
+    started = 0.0
+    elapsed = 0.0
+
+    async def worker() -> None:
+        nonlocal remaining, errors, ready, started, elapsed
+        async with McpSseSession(client, path) as session:
+            ready += 1
+            if ready == sessions:
+                started = time.perf_counter()
+                all_ready.set()
+            await all_ready.wait()
+            while remaining > 0:
+                remaining -= 1
+                sent = time.perf_counter()
+                try:
+                    ok = await session.call_tool(tool_name, arguments)
+                except Exception:
+                    ok = False
+                if ok:
+                    samples.append(time.perf_counter() - sent)
+                else:
+                    errors += 1
+            ready -= 1
+            if ready == 0:
+                elapsed = time.perf_counter() - started
+                finished.set()
+            # 全てのワーカーが終わるまでセッションを閉じない（切断処理を計測に含めない）
+            await finished.wait()
+
+    await asyncio.gather(*(worker() for _ in range(sessions)))
+    return summarize(samples, errors, elapsed)
+
+
+async def run_scenarios(
+    client: httpx.AsyncClient, mcp_client: httpx.AsyncClient, args: argparse.Namespace
+) -> Dict[str, Dict[str, float]]:
+    """
+    全てのシナリオを実行
+
+    Args:
+        client: RESTのシナリオに使うHTTPクライアント
+        mcp_client: MCPのシナリオに使うHTTPクライアント
+        args: コマンドライン引数
+
+    Returns:
+        シナリオごとの集計結果
+    """
+    results = {
+        name: await measure_rest(client, path, args.requests, args.concurrency)
+        for name, path in REST_SCENARIOS.items()
+    }
+    results["mcp_tool_call"] = await measure_mcp(
+        mcp_client, MCP_PATH, args.mcp_requests, args.mcp_sessions
+    )
+    return results
+
+
+async def run_asgi(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """
+    プロセス内のASGIアプリケーションに対して計測
+
+    Args:
+        args: コマンドライン引数
+
+    Returns:
+        シナリオごとの集計結果
+    """
+    base_url = "http://bench"
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url=base_url
+    ) as client, httpx.AsyncClient(
+        transport=StreamingASGITransport(app), base_url=base_url
+    ) as mcp_client:
+        return await run_scenarios(client, mcp_client, args)
+
+
+def free_port() -> int:
+    """
+    空いているTCPポートを取得
+
+    Returns:
+        ポート番号
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def run_uvicorn(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """
+    ローカルに起動した uvicorn に対して計測
+
+    Args:
+        args: コマンドライン引数
+
+    Returns:
+        シナリオごとの集計結果
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=ROOT_DIR,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    try:
+        # SSE のストリームは接続を占有するため、セッション数の分だけ上限を増やす
+        limits = httpx.Limits(max_connections=args.concurrency + args.mcp_sessions + 1)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                try:
+                    if (await client.get("/hello")).is_success:
+                        break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise
+                await asyncio.sleep(0.1)
+            return await run_scenarios(client, client, args)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    tolerance: float,
+) -> List[str]:
+    """
+    ベースラインと比較して、許容範囲を超えて悪化した指標を列挙
+
+    Args:
+        results: 計測結果（対象 -> シナリオ -> 指標）
+        baseline: ベースライン（同じ形式）
+        tolerance: 許容する悪化の割合
+
+    Returns:
+        悪化した指標の説明（エラーが発生したシナリオを含む）
+    """
+    regressions = []
+    for target, scenarios in results.items():
+        for scenario, result in scenarios.items():
+            name = f"{target}/{scenario}"
+            if result["errors"]:
+                regressions.append(f"{name}: {result['errors']:.0f} errors")
+            expected = baseline.get(target, {}).get(scenario)
+            if not expected:
+                continue
+            for metric, higher_is_better in CHECKED_METRICS.items():
+                current, reference = result[metric], expected[metric]
+                if higher_is_better:
+                    worse = current < reference * (1 - tolerance)
+                else:
+                    worse = current > reference * (1 + tolerance)
+                if worse:
+                    regressions.append(f"{name}: {metric} {current} (baseline {reference})")
+    return regressions
+
+
+async def run_targets(targets: List[str], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    指定された対象ごとに計測を実行
+
+    --repeat 回計測し、シナリオごとに requests/sec が最も高い回の結果を採用します
+    （共有環境のノイズで悪化と誤判定しないようにするため）。sse-starlette は
+    イベントループに紐づくグローバル状態を持つため、全ての計測を同一のイベントループで
+    実行します。
+
+    Args:
+        targets: 計測対象
+        args: コマンドライン引数
+
+    Returns:
+        対象ごとの計測結果
+    """
+    runners = {"asgi": run_asgi, "uvicorn": run_uvicorn}
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for target in targets:
+        best: Dict[str, Dict[str, float]] = {}
+        for _ in range(max(1, args.repeat)):
+            for scenario, result in (await runners[target](args)).items():
+                current = best.get(scenario)
+                if current is None or result["requests_per_sec"] > current["requests_per_sec"]:
+                    best[scenario] = result
+        results[target] = best
+    return results
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード（ベースラインから悪化した場合は1）
+    """
+    parser = argparse.ArgumentParser(description="REST と MCP（SSE）の負荷試験")
+    parser.add_argument(
+        "--target", choices=["asgi", "uvicorn", "all"], default="asgi", help="計測対象"
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="RESTのシナリオごとのリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=32, help="RESTの同時実行数")
+    parser.add_argument("--mcp-requests", type=int, default=500, help="MCPのツール呼び出しの回数")
+    parser.add_argument("--mcp-sessions", type=int, default=8, help="MCPのセッション数（同時実行数）")
+    parser.add_argument("--repeat", type=int, default=1, help="計測回数（最良の回を採用）")
+    parser.add_argument("--baseline", help="比較するベースラインのJSONファイル")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="許容する悪化の割合")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="計測結果で --baseline のファイルを更新"
+    )
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    targets = ["asgi", "uvicorn"] if args.target == "all" else [args.target]
+    # リクエストごとのログ出力が計測結果に影響しないようにする
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    logging.getLogger("app.main").setLevel(logging.CRITICAL)
+    results: Dict[str, Any] = asyncio.run(run_targets(targets, args))
+
+    regressions: List[str] = []
+    if args.baseline and args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    elif args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = find_regressions(results, baseline, args.tolerance)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=2))
+    else:
+        print(
+            f"REST {args.requests} requests x concurrency {args.concurrency}, "
+            f"MCP {args.mcp_requests} tool calls x {args.mcp_sessions} sessions"
+        )
+        for target, scenarios in results.items():
+            for scenario, result in scenarios.items():
+                print(
+                    f"  {target:<8} {scenario:<14} {result['requests_per_sec']:9.1f} req/s  "
+                    f"p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms  "
+                    f"p99 {result['p99_ms']:8.3f} ms  errors {result['errors']:.0f}"
+                )
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+メトリクス収集のオーバーヘッド計測
+
+- MetricsRegistry.observe_request() 1回あたりの処理時間
+- MetricsMiddleware の有無による GET /api/examples/{id} のスループットとレイテンシの差
+
+使い方:
+    python -m benchmarks.bench_metrics --observations 1000000 --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from app.core.metrics import MetricsRegistry
+from app.main import app
+from app.presentation.middleware.metrics import MetricsMiddleware
+
+
+def measure_observe(observations: int) -> float:
+    """
+    observe_request() 1回あたりの処理時間を計測
+
+    Args:
+        observations: 記録回数
+
+    Returns:
+        1回あたりのナノ秒
+    """
+    registry = MetricsRegistry()
+    routes = ["/api/examples/", "/api/examples/{example_id}", "/hello", "/"]
+    started = time.perf_counter_ns()
+    for i in range(observations):
+        registry.observe_request("GET", routes[i & 3], 200, "rest", 150_000 + i % 100_000)
+    return (time.perf_counter_ns() - started) / observations
+
+
+async def measure_get(path: str, requests: int) -> Tuple[List[float], float]:
+    """
+    GETリクエストのレイテンシを計測（逐次実行）
+
+    Args:
+        path: リクエストパス
+        requests: リクエスト数
+
+    Returns:
+        (1リクエストごとのレイテンシ（秒）, 経過時間（秒）)
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(100, requests)):
+            (await client.get(path)).raise_for_status()
+        samples: List[float] = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            (await client.get(path)).raise_for_status()
+            samples.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    計測結果を集計
+
+    Args:
+        samples: 1リクエストごとのレイテンシ（秒）
+        elapsed: 経過時間の合計（秒）
+
+    Returns:
+        requests/sec とレイテンシ（マイクロ秒）
+    """
+    samples = sorted(samples)
+    return {
+        "requests_per_sec": round(len(samples) / elapsed, 1),
+        "p50_us": round(statistics.median(samples) * 1_000_000, 1),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1_000_000, 1),
+    }
+
+
+def set_metrics_middleware(enabled: bool, original: list) -> None:
+    """
+    MetricsMiddleware の有無を切り替える
+
+    Args:
+        enabled: MetricsMiddleware を含める場合はTrue
+        original: app.main で構成されたミドルウェア一覧
+    """
+    app.user_middleware = [m for m in original if enabled or m.cls is not MetricsMiddleware]
+    app.middleware_stack = None
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="メトリクス収集のオーバーヘッド計測")
+    parser.add_argument("--observations", type=int, default=1_000_000, help="observe の記録回数")
+    parser.add_argument("--requests", type=int, default=5000, help="構成ごとのリクエスト数")
+    parser.add_argument("--rounds", type=int, default=5, help="構成を交互に計測する回数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    path = "/api/examples/1"
+    observe_ns = measure_observe(args.observations)
+    original = list(app.user_middleware)
+    configurations = (("without-metrics", False), ("with-metrics", True))
+    samples: Dict[str, List[float]] = {name: [] for name, _ in configurations}
+    elapsed: Dict[str, float] = {name: 0.0 for name, _ in configurations}
+    try:
+        # マシンの負荷変動の影響を抑えるため、構成を交互に計測して結果を合算する
+        for _ in range(args.rounds):
+            for name, enabled in configurations:
+                set_metrics_middleware(enabled, original)
+                round_samples, round_elapsed = asyncio.run(
+                    measure_get(path, args.requests // args.rounds)
+                )
+                samples[name].extend(round_samples)
+                elapsed[name] += round_elapsed
+    finally:
+        app.user_middleware = original
+        app.middleware_stack = None
+    results = {name: summarize(samples[name], elapsed[name]) for name, _ in configurations}
+
+    overhead_us = round(results["with-metrics"]["p50_us"] - results["without-metrics"]["p50_us"], 1)
+    if args.json:
+        print(
+            json.dumps(
+                {"observe_ns": round(observe_ns, 1), "get": results, "p50_overhead_us": overhead_us},
+                indent=2,
+            )
+        )
+    else:
+        print(f"observe_request: {observe_ns:.1f} ns/op ({args.observations} observations)")
+        print(f"GET {path} ({args.requests} requests, {args.rounds} rounds)")
+        for name, result in results.items():
+            print(
+                f"  {name:<16} {result['requests_per_sec']:9.1f} req/s "
+                f"p50 {result['p50_us']:8.1f} us p99 {result['p99_us']:8.1f} us"
+            )
+        print(f"  p50 overhead: {overhead_us:.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
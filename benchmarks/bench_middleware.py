@@ -0,0 +1,303 @@
+"""
+読み取り専用モードミドルウェアの実装方式ごとのスループット・レイテンシ計測
+
+アプリケーションのミドルウェア構成を次の2通りに差し替えて比較します。
+
+- base-http: 従来の @app.middleware("http")（BaseHTTPMiddleware）による実装
+- pure-asgi: ReadOnlyMiddleware（純粋なASGIミドルウェア）による実装
+
+計測項目:
+- GET /api/examples/{id} の requests/sec とレイテンシのパーセンタイル
+- GET /mcp（SSE）の接続から最初のイベント（endpoint）を受信するまでの時間
+
+使い方:
+    python -m benchmarks.bench_middleware --requests 2000 --sse-connections 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+from fastapi import HTTPException, Request, Response
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.status import HTTP_403_FORBIDDEN
+from starlette.types import Message
+
+from app.core.config import settings
+from app.main import app
+from app.presentation.middleware.read_only import (
+    READ_ONLY_DETAIL,
+    WRITE_METHODS,
+    ReadOnlyMiddleware,
+)
+
+
+async def legacy_read_only_dispatch(request: Request, call_next: Callable) -> Response:
+    """
+    従来の BaseHTTPMiddleware による読み取り専用モードの実装（比較用）
+    """
+    if settings.READ_ONLY_MODE and request.method in WRITE_METHODS:
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=READ_ONLY_DETAIL)
+    response: Response = await call_next(request)
+    return response
+
+
+def use_middleware(variant: str) -> None:
+    """
+    アプリケーションのミドルウェア構成を差し替える
+
+    Args:
+        variant: "base-http" または "pure-asgi"
+    """
+    stack = [m for m in app.user_middleware if m.cls is not ReadOnlyMiddleware]
+    stack = [m for m in stack if m.cls is not BaseHTTPMiddleware]
+    if variant == "base-http":
+        # @app.middleware("http") は最後に登録されるため最も外側に配置される
+        stack.insert(0, Middleware(BaseHTTPMiddleware, dispatch=legacy_read_only_dispatch))
+    else:
+        # CORSミドルウェアの内側に配置する（app.main と同じ構成）
+        stack.insert(1, Middleware(ReadOnlyMiddleware))
+    app.user_middleware = stack
+    app.middleware_stack = None
+
+
+def percentile(samples: List[float], ratio: float) -> float:
+    """
+    パーセンタイルを計算
+
+    Args:
+        samples: 計測値
+        ratio: 0〜1 の割合
+
+    Returns:
+        パーセンタイル値
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    計測結果を集計
+
+    Args:
+        samples: 1リクエストごとのレイテンシ（秒）
+        elapsed: 計測全体の経過時間（秒）
+
+    Returns:
+        requests/sec とレイテンシ（ミリ秒）
+    """
+    return {
+        "requests_per_sec": round(len(samples) / elapsed, 1),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+    }
+
+
+async def measure_get(path: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    GETリクエストのスループットとレイテンシを計測
+
+    Args:
+        path: リクエストパス
+        requests: リクエスト数
+        concurrency: 同時実行数
+
+    Returns:
+        集計結果
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # ウォームアップ
+        for _ in range(min(50, requests)):
+            (await client.get(path)).raise_for_status()
+
+        remaining = requests
+        samples: List[float] = []
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                (await client.get(path)).raise_for_status()
+                samples.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+async def first_sse_event(path: str) -> Tuple[float, bool]:
+    """
+    SSE接続から最初のイベントを受信するまでの時間を計測
+
+    httpx の ASGITransport はレスポンス全体をバッファリングするため、
+    ASGIアプリケーションを直接呼び出して最初のイベントを受信した時点で切断します。
+
+    Args:
+        path: SSEエンドポイントのパス
+
+    Returns:
+        (最初のイベントを受信するまでの時間（秒）, 切断時にアプリケーションが例外を送出した場合はTrue)
+    """
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept", b"text/event-stream")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    disconnected = asyncio.Event()
+    received = asyncio.Event()
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body" and b"event:" in message.get("body", b""):
+            received.set()
+
+    started = time.perf_counter()
+    task = asyncio.create_task(app(scope, receive, send))
+    failed = False
+    try:
+        await asyncio.wait_for(received.wait(), timeout=10)
+        elapsed = time.perf_counter() - started
+    finally:
+        disconnected.set()
+        try:
+            await asyncio.wait_for(task, timeout=1)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            task.cancel()
+        except Exception:
+            # BaseHTTPMiddleware はSSEの切断時にストリームの中継で例外を送出することがある
+            failed = True
+    return elapsed, failed
+
+
+async def measure_sse(path: str, connections: int) -> Dict[str, float]:
+    """
+    SSEの最初のイベントまでの時間を計測
+
+    Args:
+        path: SSEエンドポイントのパス
+        connections: 接続数（逐次実行）
+
+    Returns:
+        集計結果（切断時に例外が発生した接続数を含む）
+    """
+    await first_sse_event(path)  # ウォームアップ（遅延初期化を含む）
+    samples: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(connections):
+        sample, failed = await first_sse_event(path)
+        samples.append(sample)
+        errors += failed
+    elapsed = time.perf_counter() - started
+    result = summarize(samples, elapsed)
+    result["disconnect_errors"] = errors
+    return result
+
+
+async def run_benchmarks(
+    get_path: str, sse_path: str, requests: int, concurrency: int, sse_connections: int
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    各ミドルウェア構成で計測を実行
+
+    sse-starlette はイベントループに紐づくグローバル状態を持つため、
+    全ての計測を同一のイベントループで実行します。
+
+    Args:
+        get_path: GETのリクエストパス
+        sse_path: SSEエンドポイントのパス
+        requests: GETのリクエスト数
+        concurrency: GETの同時実行数
+        sse_connections: SSEの接続数
+
+    Returns:
+        構成ごとの集計結果
+    """
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for variant in ("base-http", "pure-asgi"):
+        use_middleware(variant)
+        results[variant] = {
+            "get": await measure_get(get_path, requests, concurrency),
+            "sse_first_event": await measure_sse(sse_path, sse_connections),
+        }
+    return results
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="読み取り専用モードミドルウェアの性能比較")
+    parser.add_argument("--requests", type=int, default=2000, help="GETのリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=10, help="GETの同時実行数")
+    parser.add_argument("--sse-connections", type=int, default=200, help="SSEの接続数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    get_path = "/api/examples/1"
+    sse_path = "/mcp"
+    original = list(app.user_middleware)
+    # リクエストごとのログ出力が計測結果に影響しないようにする
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app.main").setLevel(logging.CRITICAL)
+    try:
+        results = asyncio.run(
+            run_benchmarks(
+                get_path, sse_path, args.requests, args.concurrency, args.sse_connections
+            )
+        )
+    finally:
+        app.user_middleware = original
+        app.middleware_stack = None
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"GET {get_path} ({args.requests} requests, concurrency {args.concurrency}), "
+            f"SSE {sse_path} ({args.sse_connections} connections)"
+        )
+        for variant, result in results.items():
+            get, sse = result["get"], result["sse_first_event"]
+            print(
+                f"  {variant:<10} GET {get['requests_per_sec']:9.1f} req/s "
+                f"p50 {get['p50_ms']:7.3f} ms p99 {get['p99_ms']:7.3f} ms | "
+                f"SSE first event p50 {sse['p50_ms']:7.3f} ms p99 {sse['p99_ms']:7.3f} ms "
+                f"(disconnect errors {sse['disconnect_errors']:.0f})"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+gunicorn の preload（マスタープロセスで構築してから fork）によるメモリ共有と起動時間の計測
+
+SERVER_PRELOAD を無効・有効にして gunicorn を --workers 個のワーカーで起動し、
+次の項目を比較します。
+
+- ワーカーごとの RSS / PSS（各ワーカーにリクエストを送った後）と、マスターを含む PSS の合計
+  （PSS は共有ページをプロセス数で按分するため、合計が実際のメモリ使用量になります）
+- ワーカーの起動時間（fork からアプリケーションの読み込み完了まで。post_worker_init のログから取得）
+- ワーカーを強制終了してから、代わりのワーカーが起動するまでの時間
+
+使い方:
+    python -m benchmarks.bench_preload --workers 4
+"""
+
+import argparse
+import json
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from app.core.gunicorn_conf import process_memory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BOOT_PATTERN = re.compile(r"Worker (\d+) booted in ([\d.]+) ms")
+
+
+def free_port() -> int:
+    """
+    空いているTCPポートを取得
+
+    Returns:
+        ポート番号
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def child_pids(pid: int) -> List[int]:
+    """
+    プロセスの子プロセス（gunicorn のワーカー）のIDを取得
+
+    Args:
+        pid: 親プロセスのID
+
+    Returns:
+        子プロセスのID
+    """
+    with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as f:
+        return [int(child) for child in f.read().split()]
+
+
+class BootLog:
+    """
+    gunicorn のログからワーカーの起動時間を収集する
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self.boots: Dict[int, float] = {}
+        self._changed = threading.Condition()
+        self._thread = threading.Thread(target=self._read, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _read(self, stream: Any) -> None:
+        for line in stream:
+            match = BOOT_PATTERN.search(line)
+            if match:
+                with self._changed:
+                    self.boots[int(match.group(1))] = float(match.group(2))
+                    self._changed.notify_all()
+
+    def wait_for(self, count: int, timeout: float = 60) -> None:
+        """
+        count 個のワーカーが起動するまで待機
+
+        Args:
+            count: ワーカー数
+            timeout: タイムアウト（秒）
+        """
+        with self._changed:
+            if not self._changed.wait_for(lambda: len(self.boots) >= count, timeout):
+                raise TimeoutError(f"only {len(self.boots)} of {count} workers booted")
+
+
+def measure(preload: bool, workers: int, requests: int) -> Dict[str, Any]:
+    """
+    gunicorn を起動してメモリと起動時間を計測
+
+    Args:
+        preload: preload を有効にする場合はTrue
+        workers: ワーカー数
+        requests: 計測前に送るリクエスト数
+
+    Returns:
+        計測結果
+    """
+    port = free_port()
+    env = {
+        **os.environ,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": str(workers),
+        "SERVER_PRELOAD": str(preload).lower(),
+        "LOG_LEVEL": "INFO",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "python:app.core.gunicorn_conf", "app.main:app"],
+        cwd=ROOT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        log = BootLog(server.stderr)
+        log.wait_for(workers)
+        boot_ms = list(log.boots.values())
+
+        # 各ワーカーが少なくとも数回リクエストを処理した状態で計測する
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            for i in range(requests):
+                path = ("/hello", "/api/examples/", "/api/examples/1", "/openapi.json")[i % 4]
+                client.get(path, headers={"Connection": "close"}).raise_for_status()
+
+        pids = child_pids(server.pid)
+        memory = [process_memory(pid) for pid in pids]
+        master = process_memory(server.pid)
+
+        # ワーカーを強制終了し、代わりのワーカーの起動時間を取得
+        started = time.perf_counter()
+        os.kill(pids[0], signal.SIGKILL)
+        log.wait_for(workers + 1)
+        respawn_wall_ms = (time.perf_counter() - started) * 1000
+        respawn_boot_ms = [ms for pid, ms in log.boots.items() if pid not in pids][0]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    return {
+        "workers": [
+            {"pid": pid, "rss_kib": m["rss_kib"], "pss_kib": m["pss_kib"]}
+            for pid, m in zip(pids, memory)
+        ],
+        "master_pss_kib": master["pss_kib"],
+        "total_rss_kib": master["rss_kib"] + sum(m["rss_kib"] for m in memory),
+        "total_pss_kib": master["pss_kib"] + sum(m["pss_kib"] for m in memory),
+        "boot_ms_mean": statistics.fmean(boot_ms),
+        "respawn_boot_ms": respawn_boot_ms,
+        "respawn_wall_ms": respawn_wall_ms,
+    }
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="gunicorn の preload によるメモリ共有と起動時間の計測")
+    parser.add_argument("--workers", type=int, default=4, help="ワーカー数")
+    parser.add_argument("--requests", type=int, default=200, help="計測前に送るリクエスト数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    results = {
+        mode: measure(mode == "preload", args.workers, args.requests)
+        for mode in ("no-preload", "preload")
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.workers} workers, {args.requests} requests")
+        for mode, result in results.items():
+            print(f"  {mode}")
+            for worker in result["workers"]:
+                print(
+                    f"    worker {worker['pid']:>7}  rss {worker['rss_kib'] / 1024:7.1f} MiB  "
+                    f"pss {worker['pss_kib'] / 1024:7.1f} MiB"
+                )
+            print(
+                f"    total (incl. master)  rss {result['total_rss_kib'] / 1024:7.1f} MiB  "
+                f"pss {result['total_pss_kib'] / 1024:7.1f} MiB"
+            )
+            print(
+                f"    boot {result['boot_ms_mean']:8.1f} ms  "
+                f"respawn {result['respawn_boot_ms']:8.1f} ms "
+                f"(until booted after SIGKILL {result['respawn_wall_ms']:.1f} ms)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
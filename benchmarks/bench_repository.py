@@ -0,0 +1,180 @@
+"""
+リポジトリの実装ごとの主キー参照のスループット計測
+
+次の実装で、ランダムなIDの参照を繰り返したときの lookups/sec を比較します。
+
+- list-scan: 従来のモジュールレベルのリストを線形探索する実装
+- memory: インデックス付きのインメモリリポジトリ（非同期インターフェース経由）
+- sqlite: SQLiteのリポジトリ（コネクションプール + スレッドプール、同時実行あり）
+
+SQLiteには bulk_load で計測用のデータを一括登録します（登録時間も出力します）。
+
+使い方:
+    python -m benchmarks.bench_repository --records 10000 --lookups 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from app.infrastructure.example_repository import Example, ExampleRepository
+from app.infrastructure.repository import (
+    AsyncExampleRepository,
+    InMemoryAsyncExampleRepository,
+)
+from app.infrastructure.sqlite_repository import SQLiteExampleRepository
+
+
+def build_examples(count: int) -> List[Example]:
+    """
+    計測用のサンプルデータを作成
+
+    Args:
+        count: 件数
+
+    Returns:
+        サンプルデータ
+    """
+    return [
+        {"id": i, "name": f"Example {i}", "description": f"This is example {i}"}
+        for i in range(1, count + 1)
+    ]
+
+
+def measure_list_scan(examples: List[Example], ids: List[int]) -> float:
+    """
+    リストの線形探索による参照のスループットを計測
+
+    Args:
+        examples: サンプルデータ
+        ids: 参照するID
+
+    Returns:
+        lookups/sec
+    """
+    started = time.perf_counter()
+    for example_id in ids:
+        found: Optional[Example] = None
+        for example in examples:
+            if example["id"] == example_id:
+                found = example
+                break
+        assert found is not None
+    return len(ids) / (time.perf_counter() - started)
+
+
+async def measure_repository(
+    repository: AsyncExampleRepository, ids: List[int], concurrency: int
+) -> float:
+    """
+    リポジトリの get() による参照のスループットを計測
+
+    Args:
+        repository: リポジトリ
+        ids: 参照するID
+        concurrency: 同時実行数
+
+    Returns:
+        lookups/sec
+    """
+    for example_id in ids[:100]:
+        await repository.get(example_id)
+
+    position = 0
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(ids):
+            example_id = ids[position]
+            position += 1
+            assert await repository.get(example_id) is not None
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(ids) / (time.perf_counter() - started)
+
+
+async def run_benchmarks(
+    examples: List[Example], ids: List[int], concurrency: int, pool_size: int, path: str
+) -> Dict[str, float]:
+    """
+    インメモリとSQLiteのリポジトリで計測を実行
+
+    Args:
+        examples: サンプルデータ
+        ids: 参照するID
+        concurrency: 同時実行数
+        pool_size: SQLiteのコネクションプールの大きさ
+        path: SQLiteのデータベースファイルのパス
+
+    Returns:
+        計測結果
+    """
+    results: Dict[str, float] = {}
+    memory = InMemoryAsyncExampleRepository(ExampleRepository(examples))
+    results["memory"] = await measure_repository(memory, ids, concurrency)
+
+    sqlite = SQLiteExampleRepository(path, pool_size=pool_size, seed=None)
+    try:
+        started = time.perf_counter()
+        await sqlite.bulk_load(examples)
+        results["sqlite_bulk_load_sec"] = time.perf_counter() - started
+        results["sqlite"] = await measure_repository(sqlite, ids, concurrency)
+    finally:
+        await sqlite.close()
+    return results
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="リポジトリの主キー参照のスループット計測")
+    parser.add_argument("--records", type=int, default=10000, help="登録件数")
+    parser.add_argument("--lookups", type=int, default=20000, help="参照回数")
+    parser.add_argument("--concurrency", type=int, default=16, help="同時実行数")
+    parser.add_argument("--pool-size", type=int, default=4, help="SQLiteのコネクションプールの大きさ")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    examples = build_examples(args.records)
+    rng = random.Random(0)
+    ids = [rng.randint(1, args.records) for _ in range(args.lookups)]
+    # 線形探索は遅いため、参照回数を減らして計測する
+    scan_ids = ids[: max(1, min(len(ids), 2_000_000 // max(1, args.records)))]
+
+    results: Dict[str, float] = {"list-scan": measure_list_scan(examples, scan_ids)}
+    with tempfile.TemporaryDirectory() as directory:
+        results.update(
+            asyncio.run(
+                run_benchmarks(
+                    examples,
+                    ids,
+                    args.concurrency,
+                    args.pool_size,
+                    os.path.join(directory, "examples.db"),
+                )
+            )
+        )
+
+    if args.json:
+        print(json.dumps({"records": args.records, **results}, indent=2))
+    else:
+        print(f"{args.records} records, {args.lookups} lookups, concurrency {args.concurrency}")
+        for name in ("list-scan", "memory", "sqlite"):
+            print(f"  {name:<10} {results[name]:12.1f} lookups/s")
+        print(f"  sqlite bulk_load: {results['sqlite_bulk_load_sec'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+全文検索のレイテンシとレスポンスサイズの計測
+
+次の方式で、ランダムな語の前方一致でサンプルを探すときの1クエリあたりの時間を比較します。
+
+- scan: 全件を取得して name / description を部分一致で絞り込む（検索導入前のクライアント側の処理）
+- memory: インメモリの転置インデックス（BM25）
+- sqlite: SQLiteの FTS5（bm25()）
+
+あわせて、scan で取得する全件のJSONと、検索結果（上位 --limit 件）のJSONのサイズを出力します。
+
+使い方:
+    python -m benchmarks.bench_search --records 10000 --queries 2000 --vocabulary 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from app.infrastructure.example_repository import Example, ExampleRepository
+from app.infrastructure.repository import (
+    AsyncExampleRepository,
+    InMemoryAsyncExampleRepository,
+)
+from app.infrastructure.sqlite_repository import SQLiteExampleRepository
+
+
+def build_vocabulary(size: int, rng: random.Random) -> List[str]:
+    """
+    計測用の語彙を作成
+
+    Args:
+        size: 語数
+        rng: 乱数生成器
+
+    Returns:
+        ランダムな英小文字6文字の語の一覧
+    """
+    return [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(6)) for _ in range(size)
+    ]
+
+
+def choose_word(vocabulary: List[str], rng: random.Random) -> str:
+    """
+    語彙から語を選ぶ（自然言語のように、先頭の語ほど出現しやすい Zipf 風の分布）
+
+    Args:
+        vocabulary: 語彙
+        rng: 乱数生成器
+
+    Returns:
+        語
+    """
+    return vocabulary[min(int(rng.paretovariate(1.0)) - 1, len(vocabulary) - 1)]
+
+
+def build_examples(
+    count: int, vocabulary: List[str], rng: random.Random
+) -> List[Example]:
+    """
+    計測用のサンプルデータを作成
+
+    Args:
+        count: 件数
+        vocabulary: 語彙
+        rng: 乱数生成器
+
+    Returns:
+        サンプルデータ
+    """
+    return [
+        {
+            "id": i,
+            "name": f"{rng.choice(vocabulary)} {rng.choice(vocabulary)} {i}",
+            "description": " ".join(choose_word(vocabulary, rng) for _ in range(12)),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def measure_scan(examples: List[Example], queries: List[str]) -> float:
+    """
+    全件の部分一致による絞り込みの1クエリあたりの時間を計測
+
+    Args:
+        examples: サンプルデータ
+        queries: 検索語
+
+    Returns:
+        1クエリあたりの時間（ミリ秒）
+    """
+    started = time.perf_counter()
+    for query in queries:
+        [
+            example
+            for example in examples
+            if query in example["name"].lower() or query in example["description"].lower()
+        ]
+    return (time.perf_counter() - started) * 1000 / len(queries)
+
+
+async def measure_search(
+    repository: AsyncExampleRepository, queries: List[str], limit: int
+) -> Dict[str, float]:
+    """
+    リポジトリの search() の1クエリあたりの時間を計測
+
+    Args:
+        repository: リポジトリ
+        queries: 検索語
+        limit: 取得件数の上限
+
+    Returns:
+        1クエリあたりの時間のパーセンタイル（ミリ秒）
+    """
+    for query in queries[:20]:
+        await repository.search(query, limit)
+    timings = []
+    for query in queries:
+        started = time.perf_counter_ns()
+        await repository.search(query, limit)
+        timings.append((time.perf_counter_ns() - started) / 1_000_000)
+    quantiles = statistics.quantiles(timings, n=100)
+    return {"p50_ms": quantiles[49], "p99_ms": quantiles[98]}
+
+
+async def run_benchmarks(
+    examples: List[Example], queries: List[str], limit: int, path: str
+) -> Dict[str, Any]:
+    """
+    インメモリとSQLiteのリポジトリで計測を実行
+
+    Args:
+        examples: サンプルデータ
+        queries: 検索語
+        limit: 取得件数の上限
+        path: SQLiteのデータベースファイルのパス
+
+    Returns:
+        計測結果
+    """
+    results: Dict[str, Any] = {}
+    memory = InMemoryAsyncExampleRepository(ExampleRepository(examples))
+    results["memory"] = await measure_search(memory, queries, limit)
+    top = await memory.search(queries[0], limit)
+    results["search_payload_bytes"] = len(
+        json.dumps([{**example, "score": score} for example, score in top])
+    )
+
+    sqlite = SQLiteExampleRepository(path, seed=None)
+    try:
+        await sqlite.bulk_load(examples)
+        results["sqlite"] = await measure_search(sqlite, queries, limit)
+    finally:
+        await sqlite.close()
+    return results
+
+
+def main() -> int:
+    """
+    ベンチマークのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="全文検索のレイテンシとレスポンスサイズの計測")
+    parser.add_argument("--records", type=int, default=10000, help="登録件数")
+    parser.add_argument("--queries", type=int, default=2000, help="検索回数")
+    parser.add_argument("--limit", type=int, default=10, help="検索結果の件数")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="語彙の語数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = build_vocabulary(args.vocabulary, rng)
+    examples = build_examples(args.records, vocabulary, rng)
+    # 3文字の前方一致と2語の検索を混ぜる
+    queries = [
+        rng.choice(vocabulary)[:3]
+        if i % 2
+        else f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}"
+        for i in range(args.queries)
+    ]
+    scan_queries = [query.split()[0] for query in queries[: max(1, args.queries // 10)]]
+
+    results: Dict[str, Any] = {
+        "records": args.records,
+        "scan_ms": measure_scan(examples, scan_queries),
+        "scan_payload_bytes": len(json.dumps(examples)),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        results.update(
+            asyncio.run(
+                run_benchmarks(
+                    examples, queries, args.limit, os.path.join(directory, "examples.db")
+                )
+            )
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.records} records, {args.queries} queries, limit {args.limit}")
+        print(f"  scan     {results['scan_ms']:10.3f} ms/query (excluding the download)")
+        for name in ("memory", "sqlite"):
+            print(
+                f"  {name:<8} p50 {results[name]['p50_ms']:8.3f} ms  "
+                f"p99 {results[name]['p99_ms']:8.3f} ms"
+            )
+        print(
+            f"  payload  all {results['scan_payload_bytes']} bytes, "
+            f"search {results['search_payload_bytes']} bytes"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
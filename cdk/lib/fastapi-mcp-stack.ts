@@ -38,6 +38,8 @@ export class FastApiMcpStack extends cdk.Stack {
       environment: {
         PYTHONPATH: '/var/task',
         STAGE: this.node.tryGetContext('stage') || 'dev',
+        // MCPサーバーの構築を /mcp への最初のリクエストまで遅延させ、コールドスタートを短縮する
+        MCP_LAZY_INIT: 'true',
       },
       logGroup,
     });
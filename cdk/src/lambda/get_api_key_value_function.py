@@ -1,12 +1,73 @@
 import json
 import os
+import time
+from collections import OrderedDict
 import boto3
+from botocore.config import Config
+
+# API Gateway クライアントの設定（Lambda の短い実行時間に合わせてタイムアウトを短くし、
+# スロットリングなどの一時的なエラーは standard モードで再試行する）
+CLIENT_CONFIG = Config(
+    connect_timeout=int(os.environ.get('BOTO_CONNECT_TIMEOUT', '2')),
+    read_timeout=int(os.environ.get('BOTO_READ_TIMEOUT', '10')),
+    retries={'max_attempts': int(os.environ.get('BOTO_MAX_ATTEMPTS', '3')), 'mode': 'standard'},
+    max_pool_connections=int(os.environ.get('BOTO_MAX_POOL_CONNECTIONS', '4')),
+    tcp_keepalive=True,
+)
+
+# リージョンごとの API Gateway クライアント。ウォームスタートの呼び出しでは作成済みの
+# クライアントを再利用し、エンドポイント解決やコネクションプールの作成を省略する
+_clients = {}
+
+def get_apigateway_client(region_name):
+    """リージョンの API Gateway クライアントを返す（初回の呼び出し時に作成）"""
+    client = _clients.get(region_name)
+    if client is None:
+        client = _clients[region_name] = boto3.client(
+            'apigateway', region_name=region_name, config=CLIENT_CONFIG
+        )
+    return client
+
+# APIキーの値のキャッシュ（コンテナ内で共有する有効期限付きのLRU）。
+# (リージョン, APIキーID) -> (有効期限, 値)。末尾ほど最近参照されたエントリー
+API_KEY_CACHE_TTL_SECONDS = float(os.environ.get('API_KEY_CACHE_TTL_SECONDS', '300'))
+API_KEY_CACHE_MAX_ENTRIES = int(os.environ.get('API_KEY_CACHE_MAX_ENTRIES', '128'))
+_api_key_values = OrderedDict()
+
+def get_cached_api_key_value(region_name, api_key_id):
+    """有効期限内のキャッシュされた値を返す。存在しないか期限切れの場合はNone"""
+    key = (region_name, api_key_id)
+    entry = _api_key_values.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at <= time.monotonic():
+        del _api_key_values[key]
+        return None
+    _api_key_values.move_to_end(key)
+    return value
+
+def cache_api_key_value(region_name, api_key_id, value):
+    """値をキャッシュする（上限を超えた場合は最も長く参照されていない値から破棄する）"""
+    key = (region_name, api_key_id)
+    _api_key_values[key] = (time.monotonic() + API_KEY_CACHE_TTL_SECONDS, value)
+    _api_key_values.move_to_end(key)
+    while len(_api_key_values) > API_KEY_CACHE_MAX_ENTRIES:
+        _api_key_values.popitem(last=False)
+
+def invalidate_api_key_value(region_name, api_key_id):
+    """キャッシュされた値を破棄する（キーのローテーション後に使用する）"""
+    _api_key_values.pop((region_name, api_key_id), None)
 
 def lambda_handler(event, context):
     """
     API GatewayのAPIキーの値を取得するLambda関数。
     環境変数 API_KEY_ID からAPIキーIDを読み込み、
     実行リージョンを自動的に使用する。
+
+    取得した値は API_KEY_CACHE_TTL_SECONDS 秒の間コンテナ内にキャッシュする。
+    キーをローテーションした後は、イベントに {"invalidateCache": true} を指定して
+    呼び出すと、キャッシュを破棄して最新の値を取得する。
     """
     api_key_id = os.environ.get('API_KEY_ID')
     region_name = os.environ.get('AWS_REGION')
@@ -22,8 +83,17 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': 'AWS_REGION environment variable is not set (should be set by Lambda runtime)'})
         }
 
+    if (event or {}).get('invalidateCache'):
+        invalidate_api_key_value(region_name, api_key_id)
+    api_key_value = get_cached_api_key_value(region_name, api_key_id)
+    if api_key_value:
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'api_key_id': api_key_id, 'api_key_value': api_key_value, 'cached': True})
+        }
+
     try:
-        client = boto3.client('apigateway', region_name=region_name)
+        client = get_apigateway_client(region_name)
         response = client.get_api_key(
             apiKey=api_key_id,
             includeValue=True
@@ -31,9 +101,10 @@ def lambda_handler(event, context):
         api_key_value = response.get('value')
 
         if api_key_value:
+            cache_api_key_value(region_name, api_key_id, api_key_value)
             return {
                 'statusCode': 200,
-                'body': json.dumps({'api_key_id': api_key_id, 'api_key_value': api_key_value})
+                'body': json.dumps({'api_key_id': api_key_id, 'api_key_value': api_key_value, 'cached': False})
             }
         else:
             return {
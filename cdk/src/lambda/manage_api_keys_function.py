@@ -1,131 +1,444 @@
 import json
 import os
+import random
+import time
 import boto3
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# API Gateway クライアントの設定（Lambda の短い実行時間に合わせてタイムアウトを短くし、
+# スロットリングなどの一時的なエラーは standard モードで再試行する）
+CLIENT_CONFIG = Config(
+    connect_timeout=int(os.environ.get('BOTO_CONNECT_TIMEOUT', '2')),
+    read_timeout=int(os.environ.get('BOTO_READ_TIMEOUT', '10')),
+    retries={'max_attempts': int(os.environ.get('BOTO_MAX_ATTEMPTS', '3')), 'mode': 'standard'},
+    max_pool_connections=int(os.environ.get('BOTO_MAX_POOL_CONNECTIONS', '4')),
+    tcp_keepalive=True,
+)
+
+# 一括操作（batch_create / rotate / delete）の同時実行数と1回あたりの上限件数。
+# API Gateway の管理APIはアカウント単位のレート制限が低いため、同時実行数は
+# コネクションプールの大きさ（BOTO_MAX_POOL_CONNECTIONS）以下にする
+BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', '4'))
+BATCH_MAX_KEYS = int(os.environ.get('BATCH_MAX_KEYS', '500'))
+
+# レート制限（429）時の再試行。botocore の再試行を使い切った後も、指数バックオフ
+# （フルジッター）で待機して再試行する。Retry-After ヘッダーがある場合はその秒数以上待つ
+RETRY_MAX_ATTEMPTS = int(os.environ.get('RETRY_MAX_ATTEMPTS', '5'))
+RETRY_BASE_DELAY_SECONDS = float(os.environ.get('RETRY_BASE_DELAY_SECONDS', '0.2'))
+RETRY_MAX_DELAY_SECONDS = float(os.environ.get('RETRY_MAX_DELAY_SECONDS', '5'))
+THROTTLING_ERROR_CODES = {'TooManyRequestsException', 'ThrottlingException', 'LimitExceededException'}
+
+SUPPORTED_ACTIONS = ('create', 'batch_create', 'list', 'rotate', 'delete')
+
+# リージョンごとの API Gateway クライアント。ウォームスタートの呼び出しでは作成済みの
+# クライアントを再利用し、エンドポイント解決やコネクションプールの作成を省略する
+_clients = {}
+
+def get_apigateway_client(region_name):
+    """リージョンの API Gateway クライアントを返す（初回の呼び出し時に作成）"""
+    client = _clients.get(region_name)
+    if client is None:
+        client = _clients[region_name] = boto3.client(
+            'apigateway', region_name=region_name, config=CLIENT_CONFIG
+        )
+    return client
+
+def call_with_retry(operation, **kwargs):
+    """
+    API Gateway の操作を呼び出す。レート制限のエラーの場合はジッター付きで再試行する。
+    """
+    for attempt in range(RETRY_MAX_ATTEMPTS):
+        try:
+            return operation(**kwargs)
+        except ClientError as e:
+            code = e.response.get('Error', {}).get('Code')
+            if code not in THROTTLING_ERROR_CODES or attempt == RETRY_MAX_ATTEMPTS - 1:
+                raise
+            delay = random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+            retry_after = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('retry-after')
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            time.sleep(delay)
+
+def parse_stage_arn(api_gateway_stage_arn):
+    """
+    API GatewayのステージARNからAPI IDとステージ名を取得
+    arn:aws:apigateway:{region}::/restapis/{api_id}/stages/{stage_name}
+    """
+    parts = api_gateway_stage_arn.split(':')
+    api_id_part = parts[5].split('/')
+    return api_id_part[2], api_id_part[4]
+
+def parse_key_spec(spec):
+    """
+    作成するAPIキーの指定を検証し、スロットリングとクォータのデフォルト値を補う。
+    不正な値の場合は ValueError を送出する。
+    """
+    key_name = spec.get('keyName')
+    if not key_name:
+        raise ValueError('keyName is required')
+    # スロットリングとクォータのデフォルト値と型変換
+    try:
+        throttle_rate_limit = int(spec.get('throttleRateLimit', 10))
+        throttle_burst_limit = int(spec.get('throttleBurstLimit', 5))
+        quota_limit = int(spec.get('quotaLimit', 10000))
+        quota_period = spec.get('quotaPeriod', 'MONTH').upper()
+        if quota_period not in ['DAY', 'WEEK', 'MONTH']:
+            raise ValueError("Invalid quotaPeriod. Must be DAY, WEEK, or MONTH.")
+    except ValueError as e:
+        raise ValueError(f"Invalid throttle/quota parameter: {str(e)}")
+    return {
+        'keyName': key_name,
+        'description': spec.get('description', f"API Key for {key_name}"),
+        'throttleRateLimit': throttle_rate_limit,
+        'throttleBurstLimit': throttle_burst_limit,
+        'quotaLimit': quota_limit,
+        'quotaPeriod': quota_period,
+    }
+
+def delete_usage_plan(client, usage_plan_id, api_id, stage_name):
+    """使用量プランを削除する（ステージが関連付けられたプランは削除できないため、先に外す）"""
+    call_with_retry(
+        client.update_usage_plan,
+        usagePlanId=usage_plan_id,
+        patchOperations=[{'op': 'remove', 'path': '/apiStages', 'value': f"{api_id}:{stage_name}"}]
+    )
+    call_with_retry(client.delete_usage_plan, usagePlanId=usage_plan_id)
+
+def rollback(client, created, api_id, stage_name):
+    """
+    作成済みのリソースを作成と逆の順に削除する。
+    削除に失敗しても残りの削除を続け、削除できなかったリソースを返す。
+    """
+    leftovers = []
+    for kind, resource_id in reversed(created):
+        try:
+            if kind == 'usagePlanKey':
+                usage_plan_id, api_key_id = resource_id
+                call_with_retry(client.delete_usage_plan_key, usagePlanId=usage_plan_id, keyId=api_key_id)
+            elif kind == 'usagePlan':
+                delete_usage_plan(client, resource_id, api_id, stage_name)
+            else:
+                call_with_retry(client.delete_api_key, apiKey=resource_id)
+        except Exception as e:
+            print(f"Error rolling back {kind} {resource_id}: {e}")
+            leftovers.append({'type': kind, 'id': resource_id})
+    return leftovers
+
+def provision_api_key(client, spec, api_id, stage_name):
+    """
+    APIキーと使用量プランを作成して関連付ける。
+    途中で失敗した場合は作成済みのリソースを削除してから例外を送出する。
+    """
+    created = []
+    try:
+        # 1. APIキーを作成
+        api_key_response = call_with_retry(
+            client.create_api_key,
+            name=spec['keyName'],
+            description=spec['description'],
+            enabled=True,
+            generateDistinctId=True # 推奨
+        )
+        api_key_id = api_key_response['id']
+        api_key_value = api_key_response['value'] # この値を発行者に返す
+        created.append(('apiKey', api_key_id))
+
+        # 2. 使用量プランを作成
+        usage_plan_name = f"UsagePlan-{spec['keyName'].replace(' ', '-')}-{str(uuid.uuid4())[:8]}" # 一意なプラン名
+        usage_plan_response = call_with_retry(
+            client.create_usage_plan,
+            name=usage_plan_name,
+            description=f"Usage plan for API Key {spec['keyName']}",
+            apiStages=[
+                {
+                    'apiId': api_id,
+                    'stage': stage_name,
+                    # スロットリング設定はステージごとにも設定可能だが、プラン全体で設定
+                    # 'throttle': {
+                    #     'resource_path': { # 特定リソースパスごとのスロットリング
+                    #         'rateLimit': throttle_rate_limit,
+                    #         'burstLimit': throttle_burst_limit
+                    #     }
+                    # }
+                }
+            ],
+            throttle={
+                'rateLimit': spec['throttleRateLimit'],
+                'burstLimit': spec['throttleBurstLimit']
+            },
+            quota={
+                'limit': spec['quotaLimit'],
+                'offset': 0, # 通常は0
+                'period': spec['quotaPeriod']
+            }
+        )
+        usage_plan_id = usage_plan_response['id']
+        created.append(('usagePlan', usage_plan_id))
+
+        # 3. APIキーを使用量プランに関連付け
+        call_with_retry(
+            client.create_usage_plan_key,
+            usagePlanId=usage_plan_id,
+            keyId=api_key_id,
+            keyType='API_KEY' # 明示的に指定
+        )
+    except Exception:
+        rollback(client, created, api_id, stage_name)
+        raise
+
+    return {
+        'apiKeyId': api_key_id,
+        'apiKeyValue': api_key_value, # 注意: この値は安全に扱う必要があります
+        'usagePlanId': usage_plan_id,
+        **spec,
+    }
+
+def get_usage_plan_ids(client, api_key_id):
+    """APIキーが関連付けられた使用量プランのIDを返す"""
+    paginator = client.get_paginator('get_usage_plans')
+    return [
+        plan['id']
+        for page in paginator.paginate(keyId=api_key_id)
+        for plan in page.get('items', [])
+    ]
+
+def rotate_api_key(client, api_key_id, api_id, stage_name, delete_old):
+    """
+    新しいAPIキーを作成し、古いキーと同じ使用量プランに関連付ける。
+    古いキーは delete_old が True の場合は削除し、False の場合は無効化する。
+    古いキーの削除・無効化に失敗した場合は新しいキーを削除し、古いキーを使い続けられる状態に戻す。
+    """
+    old_key = call_with_retry(client.get_api_key, apiKey=api_key_id, includeValue=False)
+    usage_plan_ids = get_usage_plan_ids(client, api_key_id)
+    created = []
+    try:
+        new_key = call_with_retry(
+            client.create_api_key,
+            name=old_key['name'],
+            description=old_key.get('description', ''),
+            enabled=True,
+            generateDistinctId=True
+        )
+        created.append(('apiKey', new_key['id']))
+        for usage_plan_id in usage_plan_ids:
+            call_with_retry(
+                client.create_usage_plan_key,
+                usagePlanId=usage_plan_id,
+                keyId=new_key['id'],
+                keyType='API_KEY'
+            )
+            created.append(('usagePlanKey', (usage_plan_id, new_key['id'])))
+
+        # 新しいキーが使えるようになってから古いキーを無効化する
+        if delete_old:
+            call_with_retry(client.delete_api_key, apiKey=api_key_id)
+        else:
+            call_with_retry(
+                client.update_api_key,
+                apiKey=api_key_id,
+                patchOperations=[{'op': 'replace', 'path': '/enabled', 'value': 'false'}]
+            )
+    except Exception:
+        rollback(client, created, api_id, stage_name)
+        raise
+    return {
+        'oldApiKeyId': api_key_id,
+        'apiKeyId': new_key['id'],
+        'apiKeyValue': new_key['value'], # 注意: この値は安全に扱う必要があります
+        'usagePlanIds': usage_plan_ids,
+        'oldKeyDeleted': delete_old,
+    }
+
+def delete_api_key(client, api_key_id, api_id, stage_name, delete_usage_plans):
+    """
+    APIキーを削除する。delete_usage_plans が True の場合は、関連付けられていた使用量プランのうち
+    他のキーが残っていないものも削除する。
+    """
+    usage_plan_ids = get_usage_plan_ids(client, api_key_id) if delete_usage_plans else []
+    call_with_retry(client.delete_api_key, apiKey=api_key_id)
+    deleted_usage_plan_ids = []
+    for usage_plan_id in usage_plan_ids:
+        remaining = call_with_retry(client.get_usage_plan_keys, usagePlanId=usage_plan_id, limit=1)
+        if not remaining.get('items'):
+            delete_usage_plan(client, usage_plan_id, api_id, stage_name)
+            deleted_usage_plan_ids.append(usage_plan_id)
+    return {'apiKeyId': api_key_id, 'deletedUsagePlanIds': deleted_usage_plan_ids}
+
+def list_api_keys(client, name_query=None):
+    """APIキーの一覧を返す（キーの値は含めない）"""
+    kwargs = {'includeValues': False}
+    if name_query:
+        kwargs['nameQuery'] = name_query
+    paginator = client.get_paginator('get_api_keys')
+    return [
+        {
+            'apiKeyId': item['id'],
+            'keyName': item.get('name'),
+            'description': item.get('description'),
+            'enabled': item.get('enabled'),
+            'createdDate': item['createdDate'].isoformat() if item.get('createdDate') else None,
+        }
+        for page in paginator.paginate(**kwargs)
+        for item in page.get('items', [])
+    ]
+
+def run_batch(items, operation):
+    """
+    items の各要素に operation を並行に適用し、入力と同じ順序で結果を返す。
+    失敗した要素は {'error': ...} とし、他の要素の処理は続ける。
+    """
+    def run(item):
+        try:
+            return operation(item)
+        except Exception as e:
+            print(f"Error in batch item: {e}")
+            return {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(BATCH_MAX_WORKERS, len(items)))) as executor:
+        return list(executor.map(run, items))
+
+def batch_response(results, success_status):
+    """一括操作の結果のレスポンス。一部が失敗した場合は 207、全て失敗した場合は 500 を返す"""
+    failed = sum(1 for result in results if 'error' in result)
+    if failed == 0:
+        status_code = success_status
+    elif failed == len(results):
+        status_code = 500
+    else:
+        status_code = 207
+    return {
+        'statusCode': status_code,
+        'body': json.dumps({
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'results': results
+        })
+    }
+
+def get_api_key_ids(event):
+    """イベントから対象のAPIキーIDの一覧を取得する（apiKeyId または apiKeyIds）"""
+    api_key_ids = event.get('apiKeyIds')
+    if api_key_ids is None and event.get('apiKeyId'):
+        api_key_ids = [event['apiKeyId']]
+    if not api_key_ids or not isinstance(api_key_ids, list):
+        raise ValueError('apiKeyId or apiKeyIds is required')
+    if len(api_key_ids) > BATCH_MAX_KEYS:
+        raise ValueError(f"At most {BATCH_MAX_KEYS} keys can be processed at once")
+    return api_key_ids
+
+def error_response(status_code, message):
+    return {'statusCode': status_code, 'body': json.dumps({'error': message})}
 
 def lambda_handler(event, context):
     """
     API GatewayのAPIキーと使用量プランを管理するLambda関数。
-    現在は 'create' アクションのみをサポート。
+
+    アクション:
+    - create: APIキーと使用量プランを1件作成
+    - batch_create: keys の各要素について create を並行に実行
+      （atomic が True の場合は、1件でも失敗したら作成済みの全てを削除）
+    - list: APIキーの一覧（nameQuery で名前の前方一致）
+    - rotate: apiKeyId / apiKeyIds のキーを新しいキーに置き換え（deleteOld が False の場合は古いキーを無効化）
+    - delete: apiKeyId / apiKeyIds のキーを削除（deleteUsagePlans が True の場合は空になった使用量プランも削除）
     """
     action = event.get('action')
     region_name = os.environ.get('AWS_REGION')
     api_gateway_stage_arn = os.environ.get('API_GATEWAY_STAGE_ARN') # 例: arn:aws:apigateway:us-east-1::/restapis/xxxx/stages/dev
 
     if not region_name:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'AWS_REGION environment variable is not set'})
-        }
+        return error_response(500, 'AWS_REGION environment variable is not set')
     if not api_gateway_stage_arn:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'API_GATEWAY_STAGE_ARN environment variable is not set'})
-        }
+        return error_response(500, 'API_GATEWAY_STAGE_ARN environment variable is not set')
 
-    client = boto3.client('apigateway', region_name=region_name)
+    client = get_apigateway_client(region_name)
+    api_id, stage_name = parse_stage_arn(api_gateway_stage_arn)
 
     if action == 'create':
-        key_name = event.get('keyName')
-        description = event.get('description', f"API Key for {key_name}")
-        # スロットリングとクォータのデフォルト値と型変換
         try:
-            throttle_rate_limit = int(event.get('throttleRateLimit', 10))
-            throttle_burst_limit = int(event.get('throttleBurstLimit', 5))
-            quota_limit = int(event.get('quotaLimit', 10000))
-            quota_period = event.get('quotaPeriod', 'MONTH').upper()
-            if quota_period not in ['DAY', 'WEEK', 'MONTH']:
-                raise ValueError("Invalid quotaPeriod. Must be DAY, WEEK, or MONTH.")
+            spec = parse_key_spec(event)
         except ValueError as e:
-            return {'statusCode': 400, 'body': json.dumps({'error': f"Invalid throttle/quota parameter: {str(e)}"}) }
-
-
-        if not key_name:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'keyName is required for create action'})
-            }
-
+            return error_response(400, f"{str(e)} for create action")
         try:
-            # 1. APIキーを作成
-            api_key_response = client.create_api_key(
-                name=key_name,
-                description=description,
-                enabled=True,
-                generateDistinctId=True # 推奨
-            )
-            api_key_id = api_key_response['id']
-            api_key_value = api_key_response['value'] # この値を発行者に返す
-
-            # 2. 使用量プランを作成
-            usage_plan_name = f"UsagePlan-{key_name.replace(' ', '-')}-{str(uuid.uuid4())[:8]}" # 一意なプラン名
-            # API GatewayのステージARNからAPI IDとステージ名を取得
-            # arn:aws:apigateway:{region}::/restapis/{api_id}/stages/{stage_name}
-            parts = api_gateway_stage_arn.split(':')
-            api_id_part = parts[5].split('/')
-            api_id = api_id_part[2]
-            stage_name = api_id_part[4]
-
-
-            usage_plan_response = client.create_usage_plan(
-                name=usage_plan_name,
-                description=f"Usage plan for API Key {key_name}",
-                apiStages=[
-                    {
-                        'apiId': api_id,
-                        'stage': stage_name,
-                        # スロットリング設定はステージごとにも設定可能だが、プラン全体で設定
-                        # 'throttle': {
-                        #     'resource_path': { # 特定リソースパスごとのスロットリング
-                        #         'rateLimit': throttle_rate_limit,
-                        #         'burstLimit': throttle_burst_limit
-                        #     }
-                        # }
-                    }
-                ],
-                throttle={
-                    'rateLimit': throttle_rate_limit,
-                    'burstLimit': throttle_burst_limit
-                },
-                quota={
-                    'limit': quota_limit,
-                    'offset': 0, # 通常は0
-                    'period': quota_period
-                }
-            )
-            usage_plan_id = usage_plan_response['id']
-
-            # 3. APIキーを使用量プランに関連付け
-            client.create_usage_plan_key(
-                usagePlanId=usage_plan_id,
-                keyId=api_key_id,
-                keyType='API_KEY' # 明示的に指定
-            )
+            result = provision_api_key(client, spec, api_id, stage_name)
+        except Exception as e:
+            print(f"Error creating API Key/Usage Plan: {e}")
+            return error_response(500, f"Failed to create API Key/Usage Plan: {str(e)}")
+        return {
+            'statusCode': 201,
+            'body': json.dumps({'message': 'API Key and Usage Plan created successfully', **result})
+        }
 
+    if action == 'batch_create':
+        keys = event.get('keys')
+        if not keys or not isinstance(keys, list):
+            return error_response(400, 'keys is required for batch_create action')
+        if len(keys) > BATCH_MAX_KEYS:
+            return error_response(400, f"At most {BATCH_MAX_KEYS} keys can be created at once")
+        # 全件を先に検証し、不正な指定がある場合は何も作成しない
+        try:
+            specs = [parse_key_spec(spec) for spec in keys]
+        except (ValueError, AttributeError) as e:
+            return error_response(400, f"{str(e)} for batch_create action")
+        results = run_batch(specs, lambda spec: provision_api_key(client, spec, api_id, stage_name))
+        if event.get('atomic') and any('error' in result for result in results):
+            created = [
+                resource
+                for result in results if 'error' not in result
+                for resource in (
+                    ('apiKey', result['apiKeyId']),
+                    ('usagePlan', result['usagePlanId']),
+                    ('usagePlanKey', (result['usagePlanId'], result['apiKeyId']))
+                )
+            ]
+            leftovers = rollback(client, created, api_id, stage_name)
             return {
-                'statusCode': 201,
+                'statusCode': 500,
                 'body': json.dumps({
-                    'message': 'API Key and Usage Plan created successfully',
-                    'apiKeyId': api_key_id,
-                    'apiKeyValue': api_key_value, # 注意: この値は安全に扱う必要があります
-                    'usagePlanId': usage_plan_id,
-                    'keyName': key_name,
-                    'throttleRateLimit': throttle_rate_limit,
-                    'throttleBurstLimit': throttle_burst_limit,
-                    'quotaLimit': quota_limit,
-                    'quotaPeriod': quota_period
+                    'error': 'Failed to create some API Keys; all created resources were rolled back',
+                    'results': [{'keyName': spec['keyName'], **({'error': result['error']} if 'error' in result else {})}
+                                for spec, result in zip(specs, results)],
+                    'leftovers': leftovers
                 })
             }
+        results = [
+            {'keyName': spec['keyName'], **result} if 'error' in result else result
+            for spec, result in zip(specs, results)
+        ]
+        return batch_response(results, 201)
 
+    if action == 'list':
+        try:
+            items = list_api_keys(client, event.get('nameQuery'))
         except Exception as e:
-            # エラー発生時は作成されたリソースをクリーンアップするロジックも考慮が必要だが、ここでは省略
-            print(f"Error creating API Key/Usage Plan: {e}")
-            return {
-                'statusCode': 500,
-                'body': json.dumps({'error': f"Failed to create API Key/Usage Plan: {str(e)}"})
-            }
-    else:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({'error': f"Action '{action}' is not supported. Only 'create' is currently supported."})
-        }
\ No newline at end of file
+            print(f"Error listing API Keys: {e}")
+            return error_response(500, f"Failed to list API Keys: {str(e)}")
+        return {'statusCode': 200, 'body': json.dumps({'items': items})}
+
+    if action in ('rotate', 'delete'):
+        try:
+            api_key_ids = get_api_key_ids(event)
+        except ValueError as e:
+            return error_response(400, f"{str(e)} for {action} action")
+        if action == 'rotate':
+            delete_old = bool(event.get('deleteOld', True))
+            operation = lambda api_key_id: rotate_api_key(client, api_key_id, api_id, stage_name, delete_old)
+        else:
+            delete_usage_plans = bool(event.get('deleteUsagePlans', True))
+            operation = lambda api_key_id: delete_api_key(client, api_key_id, api_id, stage_name, delete_usage_plans)
+        results = run_batch(api_key_ids, operation)
+        results = [
+            {'apiKeyId': api_key_id, **result} if 'error' in result else result
+            for api_key_id, result in zip(api_key_ids, results)
+        ]
+        return batch_response(results, 200)
+
+    return error_response(
+        400, f"Action '{action}' is not supported. Supported actions: {', '.join(SUPPORTED_ACTIONS)}"
+    )
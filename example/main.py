@@ -4,13 +4,18 @@ FastAPI MCP サンプルアプリケーション
 このサンプルアプリケーションは、FastAPI MCPテンプレートを使用して
 シンプルなAPIを実装する方法を示します。
 """
+import itertools
 import os
+import threading
 import uvicorn
-from fastapi import FastAPI, HTTPException, Query
+from array import array
+from bisect import bisect_right
+from fastapi import APIRouter, Body, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import Callable, Coroutine, List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 
 app = FastAPI(
     title="FastAPI MCP サンプルアプリケーション",
@@ -27,12 +32,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# サンプルデータ
-EXAMPLES = [
-    {"id": 1, "name": "Example 1", "description": "This is example 1"},
-    {"id": 2, "name": "Example 2", "description": "This is example 2"},
-    {"id": 3, "name": "Example 3", "description": "This is example 3"},
-]
+# サンプルデータ（id をキーとした辞書。挿入順＝作成順を保持する）
+# version は更新のたびに1ずつ増え、ETag / If-Match による楽観的排他制御に使用する
+EXAMPLES: Dict[int, Dict[str, Any]] = {
+    1: {"id": 1, "name": "Example 1", "description": "This is example 1", "version": 1},
+    2: {"id": 2, "name": "Example 2", "description": "This is example 2", "version": 1},
+    3: {"id": 3, "name": "Example 3", "description": "This is example 3", "version": 1},
+}
+
+# 書き込みの排他制御（一括処理の途中の状態が他のリクエストから見えないようにする）
+STORE_LOCK = threading.Lock()
+
+class IdSequence:
+    """
+    IDを払い出すアロケーター（実際のアプリケーションではデータベースのシーケンスに相当）
+
+    スレッドごとに block_size 件のIDのブロックを確保し、そのスレッドのリクエストには
+    ブロックから払い出します（スレッド単位のシャーディング）。ブロック番号は
+    itertools.count から取得し、CPython では next() がアトミックなためロックを取得しません。
+    IDはスレッドをまたぐと作成順に並びませんが、重複することはありません。
+    """
+
+    def __init__(self, start: int = 1, block_size: int = 64):
+        self._start = start
+        self._block_size = block_size
+        self._blocks = itertools.count()
+        self._local = threading.local()
+
+    def _next_block(self) -> range:
+        first = self._start + next(self._blocks) * self._block_size
+        return range(first, first + self._block_size)
+
+    def allocate(self, count: int = 1) -> List[int]:
+        """count 件分のIDを払い出す"""
+        ids: List[int] = []
+        remaining = getattr(self._local, "remaining", range(0))
+        while len(ids) < count:
+            if not remaining:
+                remaining = self._next_block()
+            taken = remaining[: count - len(ids)]
+            ids.extend(taken)
+            remaining = remaining[len(taken):]
+        self._local.remaining = remaining
+        return ids
+
+ID_SEQUENCE = IdSequence(max(EXAMPLES, default=0) + 1)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def example_etag(example: Dict[str, Any]) -> str:
+    return f'"{example["version"]}"'
+
+def check_if_match(example: Dict[str, Any], if_match: Optional[str]) -> None:
+    """If-Match ヘッダーが指定され、サンプルの現在の ETag と一致しない場合は 412 を返す"""
+    if if_match is None:
+        return
+    tags = [tag.strip() for tag in if_match.split(",")]
+    if "*" in tags or example_etag(example) in tags:
+        return
+    raise HTTPException(
+        status_code=412,
+        detail=f"サンプルID {example['id']} は更新されています（現在の ETag: {example_etag(example)}）",
+    )
 
 # モデル定義
 class ExampleCreate(BaseModel):
@@ -43,9 +104,56 @@ class ExampleUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
 
+class ExampleBulkUpdate(ExampleUpdate):
+    id: int
+
 class CommentCreate(BaseModel):
     content: str
 
+class BulkRoute(APIRoute):
+    """
+    一括処理のルート（リクエストボディは JSON配列または NDJSON）
+
+    NDJSON（Content-Type: application/x-ndjson）は各行を要素とするJSON配列に組み立ててから
+    FastAPI に渡すため、どちらの形式でも宣言したボディのモデルで配列全体を1回で検証します。
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type == NDJSON_MEDIA_TYPE:
+                lines = [line for line in (await request.body()).splitlines() if line.strip()]
+                request = json_request(request, b"[" + b",".join(lines) + b"]")
+            return await handler(request)
+
+        return route_handler
+
+def json_request(request: Request, body: bytes) -> Request:
+    """ボディを置き換え、Content-Type を application/json にしたリクエストを作成する"""
+    scope = dict(request.scope)
+    scope["headers"] = [
+        (name, value) for name, value in request.scope["headers"] if name != b"content-type"
+    ] + [(b"content-type", b"application/json")]
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+def ndjson_request_body(schema_name: Optional[str] = None) -> Dict[str, Any]:
+    """OpenAPI に NDJSON のリクエストボディ（1行に1要素）を追加する openapi_extra"""
+    item_schema = (
+        {"$ref": f"#/components/schemas/{schema_name}"} if schema_name else {"type": "integer"}
+    )
+    return {"requestBody": {"content": {NDJSON_MEDIA_TYPE: {"schema": item_schema}}}}
+
+bulk_router = APIRouter(route_class=BulkRoute)
+
+def not_found_detail(example_ids: List[int]) -> str:
+    return f"サンプルID {', '.join(map(str, example_ids))} が見つかりません"
+
 # ルート定義
 @app.get("/")
 def read_root():
@@ -58,7 +166,10 @@ def read_root():
             {"path": "/api/examples/{example_id}", "method": "PUT", "description": "サンプルを更新"},
             {"path": "/api/examples/{example_id}", "method": "DELETE", "description": "サンプルを削除"},
             {"path": "/api/examples/{example_id}/comments", "method": "POST", "description": "コメントを追加"},
-            {"path": "/api/examples/{example_id}/comments", "description": "コメント一覧を取得"},
+            {"path": "/api/examples/{example_id}/comments", "description": "コメント一覧を取得（since / limit でページング）"},
+            {"path": "/api/examples/bulk", "method": "POST", "description": "サンプルを一括作成"},
+            {"path": "/api/examples/bulk", "method": "PATCH", "description": "サンプルを一括更新"},
+            {"path": "/api/examples/bulk-delete", "method": "POST", "description": "サンプルを一括削除"},
         ]
     }
 
@@ -66,106 +177,232 @@ def read_root():
 @app.get("/api/examples")
 def get_examples():
     """サンプル一覧を取得"""
-    return EXAMPLES
+    return list(EXAMPLES.values())
+
+# 一括処理のエンドポイント（/api/examples/{example_id} より先に登録する）
+@bulk_router.post(
+    "/api/examples/bulk", status_code=201, openapi_extra=ndjson_request_body("ExampleCreate")
+)
+def bulk_create_examples(items: List[ExampleCreate]):
+    """サンプルを一括作成（JSON配列または NDJSON）"""
+    new_ids = ID_SEQUENCE.allocate(len(items))
+    created = [
+        {
+            "id": new_id,
+            "name": item.name,
+            "description": item.description or f"This is example {new_id}",
+            "version": 1
+        }
+        for new_id, item in zip(new_ids, items)
+    ]
+    response = [dict(example) for example in created]
+    with STORE_LOCK:
+        EXAMPLES.update((example["id"], example) for example in created)
+    return response
+
+@bulk_router.patch("/api/examples/bulk", openapi_extra=ndjson_request_body("ExampleBulkUpdate"))
+def bulk_update_examples(items: List[ExampleBulkUpdate]):
+    """サンプルを一括更新（JSON配列または NDJSON）。1件でも存在しなければ何も更新しない"""
+    with STORE_LOCK:
+        missing = [item.id for item in items if item.id not in EXAMPLES]
+        if missing:
+            raise HTTPException(status_code=404, detail=not_found_detail(missing))
+        updated = []
+        for item in items:
+            # 更新するフィールドのみ変更
+            example = EXAMPLES[item.id]
+            example.update(item.model_dump(exclude={"id"}, exclude_none=True))
+            example["version"] += 1
+            updated.append(dict(example))
+    return updated
+
+@bulk_router.post("/api/examples/bulk-delete", openapi_extra=ndjson_request_body())
+def bulk_delete_examples(example_ids: List[int] = Body(...)):
+    """サンプルを一括削除（IDのJSON配列または NDJSON）。1件でも存在しなければ何も削除しない"""
+    example_ids = list(dict.fromkeys(example_ids))
+    with STORE_LOCK:
+        missing = [example_id for example_id in example_ids if example_id not in EXAMPLES]
+        if missing:
+            raise HTTPException(status_code=404, detail=not_found_detail(missing))
+        deleted = [EXAMPLES.pop(example_id) for example_id in example_ids]
+        for example_id in example_ids:
+            COMMENTS.discard(example_id)
+    return {"message": f"{len(deleted)} 件のサンプルを削除しました", "deleted": deleted}
+
+app.include_router(bulk_router)
 
 @app.get("/api/examples/{example_id}")
-def get_example(example_id: int):
-    """サンプル詳細を取得"""
-    for example in EXAMPLES:
-        if example["id"] == example_id:
-            return example
-    raise HTTPException(status_code=404, detail=f"サンプルID {example_id} が見つかりません")
+def get_example(example_id: int, response: Response):
+    """サンプル詳細を取得（ETag ヘッダーで現在のバージョンを返す）"""
+    # ロックの外でシリアライズされるため、ETag と内容が食い違わないようコピーを返す
+    with STORE_LOCK:
+        example = EXAMPLES.get(example_id)
+        if example is None:
+            raise HTTPException(status_code=404, detail=not_found_detail([example_id]))
+        example = dict(example)
+    response.headers["ETag"] = example_etag(example)
+    return example
 
 @app.post("/api/examples", status_code=201)
-def create_example(example: ExampleCreate):
+def create_example(example: ExampleCreate, response: Response):
     """サンプルを作成"""
-    # 新しいIDを生成（実際のアプリケーションではデータベースで自動生成される）
-    new_id = max([example["id"] for example in EXAMPLES]) + 1 if EXAMPLES else 1
+    # 新しいIDを払い出す（実際のアプリケーションではデータベースで自動生成される）
+    new_id = ID_SEQUENCE.allocate()[0]
     
     new_example = {
         "id": new_id,
         "name": example.name,
-        "description": example.description or f"This is example {new_id}"
+        "description": example.description or f"This is example {new_id}",
+        "version": 1
     }
+    response.headers["ETag"] = example_etag(new_example)
     
     # サンプルデータに追加（実際のアプリケーションではデータベースに保存）
-    EXAMPLES.append(new_example)
+    with STORE_LOCK:
+        EXAMPLES[new_id] = new_example
     
     return new_example
 
 @app.put("/api/examples/{example_id}")
-def update_example(example_id: int, example: ExampleUpdate):
-    """サンプルを更新"""
-    for i, existing_example in enumerate(EXAMPLES):
-        if existing_example["id"] == example_id:
-            # 更新するフィールドのみ変更
-            if example.name is not None:
-                EXAMPLES[i]["name"] = example.name
-            if example.description is not None:
-                EXAMPLES[i]["description"] = example.description
-            return EXAMPLES[i]
-    
-    raise HTTPException(status_code=404, detail=f"サンプルID {example_id} が見つかりません")
+def update_example(
+    example_id: int,
+    example: ExampleUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="取得時の ETag（一致しない場合は 412）"),
+):
+    """サンプルを更新（If-Match を指定すると、取得後に他で更新されていた場合は 412 を返す）"""
+    with STORE_LOCK:
+        existing_example = EXAMPLES.get(example_id)
+        if existing_example is None:
+            raise HTTPException(status_code=404, detail=not_found_detail([example_id]))
+        check_if_match(existing_example, if_match)
+        # 更新するフィールドのみ変更
+        existing_example.update(example.model_dump(exclude_none=True))
+        existing_example["version"] += 1
+        response.headers["ETag"] = example_etag(existing_example)
+        return dict(existing_example)
 
 @app.delete("/api/examples/{example_id}")
-def delete_example(example_id: int):
-    """サンプルを削除"""
-    for i, example in enumerate(EXAMPLES):
-        if example["id"] == example_id:
-            # サンプルデータから削除（実際のアプリケーションではデータベースから削除）
-            deleted = EXAMPLES.pop(i)
-            return {"message": f"サンプルID {example_id} を削除しました", "deleted": deleted}
-    
-    raise HTTPException(status_code=404, detail=f"サンプルID {example_id} が見つかりません")
+def delete_example(
+    example_id: int,
+    if_match: Optional[str] = Header(None, description="取得時の ETag（一致しない場合は 412）"),
+):
+    """サンプルを削除（If-Match を指定すると、取得後に他で更新されていた場合は 412 を返す）"""
+    with STORE_LOCK:
+        existing_example = EXAMPLES.get(example_id)
+        if existing_example is None:
+            raise HTTPException(status_code=404, detail=not_found_detail([example_id]))
+        check_if_match(existing_example, if_match)
+        # サンプルデータから削除（実際のアプリケーションではデータベースから削除）
+        deleted = EXAMPLES.pop(example_id)
+        COMMENTS.discard(example_id)
+    return {"message": f"サンプルID {example_id} を削除しました", "deleted": deleted}
 
 # コメント関連のエンドポイント（インメモリで実装）
-COMMENTS = {}  # example_id をキーとしたコメントのリスト
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# コメント一覧の次ページの since を返すレスポンスヘッダー
+NEXT_SINCE_HEADER = "X-Next-Since"
+
+class CommentLog:
+    """1件のサンプルのコメント（追記専用）。投稿時刻は int64 の配列で保持する"""
+
+    __slots__ = ("timestamps", "contents")
+
+    def __init__(self):
+        # 投稿時刻（1970-01-01 からのマイクロ秒）。狭義単調増加で、添字 + 1 がコメントID
+        self.timestamps = array("q")
+        self.contents: List[str] = []
+
+class CommentStore:
+    """
+    サンプルごとのコメントを保持するストア
+
+    コメントは投稿順（＝時刻順）に追記するだけなので、since 以降のコメントは
+    投稿時刻の配列の二分探索で求められます。書き込みは STORE_LOCK の内側で行います。
+    """
+
+    def __init__(self):
+        self._logs: Dict[int, CommentLog] = {}
+
+    def add(self, example_id: int, content: str) -> Dict[str, Any]:
+        """コメントを追加する"""
+        log = self._logs.get(example_id)
+        if log is None:
+            log = self._logs[example_id] = CommentLog()
+        timestamp = (datetime.now() - _EPOCH) // _MICROSECOND
+        # 時刻が重複・逆行しても since で位置が一意に決まるよう、直前の投稿より後にする
+        if log.timestamps and timestamp <= log.timestamps[-1]:
+            timestamp = log.timestamps[-1] + 1
+        log.timestamps.append(timestamp)
+        log.contents.append(content)
+        return self._render(log, len(log.contents) - 1)
+
+    def page(
+        self, example_id: int, since: Optional[datetime], limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        since より後に投稿されたコメントを時刻順に最大 limit 件取得する
+
+        Returns:
+            (コメント一覧, 続きがある場合は次ページの since、ない場合はNone)
+        """
+        log = self._logs.get(example_id)
+        if log is None:
+            return [], None
+        # 追記中の要素を読まないよう、内容の件数で打ち切る（内容は時刻の後に追記される）
+        count = len(log.contents)
+        start = 0
+        if since is not None:
+            if since.tzinfo is not None:
+                since = since.astimezone().replace(tzinfo=None)
+            start = bisect_right(log.timestamps, (since - _EPOCH) // _MICROSECOND, 0, count)
+        end = min(start + limit, count)
+        comments = [self._render(log, index) for index in range(start, end)]
+        next_since = comments[-1]["created_at"] if end < count else None
+        return comments, next_since
+
+    def discard(self, example_id: int) -> None:
+        """サンプルのコメントを全て削除する"""
+        self._logs.pop(example_id, None)
+
+    @staticmethod
+    def _render(log: CommentLog, index: int) -> Dict[str, Any]:
+        return {
+            "id": index + 1,
+            "content": log.contents[index],
+            "created_at": (_EPOCH + log.timestamps[index] * _MICROSECOND).isoformat()
+        }
+
+COMMENTS = CommentStore()
 
 @app.post("/api/examples/{example_id}/comments", status_code=201)
 def add_comment(example_id: int, comment: CommentCreate):
     """サンプルにコメントを追加"""
-    # サンプルが存在するか確認
-    example_exists = False
-    for example in EXAMPLES:
-        if example["id"] == example_id:
-            example_exists = True
-            break
-    
-    if not example_exists:
-        raise HTTPException(status_code=404, detail=f"サンプルID {example_id} が見つかりません")
-    
-    # コメントを追加
-    if example_id not in COMMENTS:
-        COMMENTS[example_id] = []
-    
-    comment_id = len(COMMENTS[example_id]) + 1
-    timestamp = datetime.now().isoformat()
-    
-    new_comment = {
-        "id": comment_id,
-        "content": comment.content,
-        "created_at": timestamp
-    }
-    
-    COMMENTS[example_id].append(new_comment)
-    
-    return new_comment
+    with STORE_LOCK:
+        # サンプルが存在するか確認
+        if example_id not in EXAMPLES:
+            raise HTTPException(status_code=404, detail=not_found_detail([example_id]))
+        return COMMENTS.add(example_id, comment.content)
 
 @app.get("/api/examples/{example_id}/comments")
-def get_comments(example_id: int):
-    """サンプルのコメント一覧を取得"""
+def get_comments(
+    example_id: int,
+    response: Response,
+    since: Optional[datetime] = Query(None, description="この投稿時刻（created_at）より後のコメントを取得"),
+    limit: int = Query(50, ge=1, le=1000, description="1ページあたりの最大件数"),
+):
+    """サンプルのコメント一覧を投稿時刻順に取得（続きがある場合は X-Next-Since ヘッダーで次ページの since を返す）"""
     # サンプルが存在するか確認
-    example_exists = False
-    for example in EXAMPLES:
-        if example["id"] == example_id:
-            example_exists = True
-            break
-    
-    if not example_exists:
-        raise HTTPException(status_code=404, detail=f"サンプルID {example_id} が見つかりません")
+    if example_id not in EXAMPLES:
+        raise HTTPException(status_code=404, detail=not_found_detail([example_id]))
     
     # コメントを取得
-    return COMMENTS.get(example_id, [])
+    comments, next_since = COMMENTS.page(example_id, since, limit)
+    if next_since is not None:
+        response.headers[NEXT_SINCE_HEADER] = next_since
+    return comments
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
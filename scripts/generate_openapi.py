@@ -1,48 +1,139 @@
 """
 OpenAPI仕様書をYAML形式で生成するスクリプト
+
+サーバーを起動せずに app.main のFastAPIアプリケーションをインポートし、
+インプロセスでOpenAPIスキーマを生成します。
+
+使い方:
+    python scripts/generate_openapi.py [出力ディレクトリ] [出力ファイル名]
+    python scripts/generate_openapi.py --check   # docs/openapi.yaml が最新か確認
 """
+import argparse
+import difflib
 import json
-import yaml
 import os
 import sys
-import requests
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Timings = List[Tuple[str, float]]
+
+
+@contextmanager
+def timed(timings: Timings, phase: str) -> Iterator[None]:
+    """
+    処理時間を計測するコンテキストマネージャー
 
-def generate_openapi_yaml(output_dir: str = "docs", output_file: str = "openapi.yaml"):
+    Args:
+        timings: 計測結果の格納先
+        phase: フェーズ名
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.append((phase, time.perf_counter() - started))
+
+
+def dump_schema(openapi_schema: Dict[str, Any], output_path: Path) -> str:
+    """
+    OpenAPIスキーマを出力ファイルの形式（.json または YAML）の文字列に変換
+
+    Args:
+        openapi_schema: OpenAPIスキーマ
+        output_path: 出力ファイルのパス
+
+    Returns:
+        変換後の文字列
+    """
+    if output_path.suffix == ".json":
+        return json.dumps(openapi_schema, indent=2, ensure_ascii=False) + "\n"
+    return yaml.dump(openapi_schema, sort_keys=False, allow_unicode=True)
+
+
+def generate_openapi_yaml(
+    output_dir: str = "docs", output_file: str = "openapi.yaml", check: bool = False
+) -> int:
     """
     FastAPIアプリケーションからOpenAPI仕様書をYAML形式で生成する
-    
+
     Args:
         output_dir: 出力ディレクトリ
         output_file: 出力ファイル名
+        check: Trueの場合はファイルを書き込まず、既存ファイルとの差分を確認する
+
+    Returns:
+        int: 終了コード（0: 成功、1: 差分あり）
     """
-    # 出力ディレクトリの作成
-    os.makedirs(output_dir, exist_ok=True)
-    
-    try:
-        # ローカルサーバーが起動していると仮定して、OpenAPI仕様を取得
-        response = requests.get("http://localhost:8000/openapi.json")
-        response.raise_for_status()
-        openapi_json = response.json()
-    except requests.RequestException as e:
-        print(f"Error: ローカルサーバーからOpenAPI仕様を取得できませんでした: {e}")
-        print("サーバーが起動していることを確認してください。")
-        sys.exit(1)
-    
-    # JSONをYAMLに変換
-    openapi_yaml = yaml.dump(openapi_json, sort_keys=False)
-    
-    # ファイルに保存
+    timings: Timings = []
     output_path = Path(output_dir) / output_file
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(openapi_yaml)
-    
+
+    with timed(timings, "アプリケーションのインポート"):
+        from app.main import app
+        from app.presentation.api.openapi import generate_openapi_schema
+
+    with timed(timings, "スキーマ生成"):
+        # スナップショットの設定に関わらず、ルート定義からスキーマを生成する
+        openapi_schema = generate_openapi_schema(app)
+
+    with timed(timings, "シリアライズ"):
+        generated = dump_schema(openapi_schema, output_path)
+
+    if check:
+        with timed(timings, "差分チェック"):
+            current = output_path.read_text(encoding="utf-8") if output_path.exists() else ""
+            diff = list(
+                difflib.unified_diff(
+                    current.splitlines(keepends=True),
+                    generated.splitlines(keepends=True),
+                    fromfile=str(output_path),
+                    tofile="generated",
+                )
+            )
+        print_timings(timings)
+        if diff:
+            sys.stdout.writelines(diff)
+            print(f"\n{output_path} が最新ではありません。このスクリプトを実行して更新してください。")
+            return 1
+        print(f"{output_path} は最新です")
+        return 0
+
+    with timed(timings, "ファイル書き込み"):
+        os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(generated)
+
+    print_timings(timings)
     print(f"OpenAPI仕様書を生成しました: {output_path}")
-    return str(output_path)
+    return 0
+
+
+def print_timings(timings: Timings) -> None:
+    """
+    フェーズごとの処理時間を表示
+
+    Args:
+        timings: 計測結果
+    """
+    print("処理時間:")
+    for phase, elapsed in timings:
+        print(f"  {phase}: {elapsed * 1000:.1f} ms")
+    print(f"  合計: {sum(elapsed for _, elapsed in timings) * 1000:.1f} ms")
+
 
 if __name__ == "__main__":
-    # コマンドライン引数から出力ディレクトリと出力ファイル名を取得
-    output_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "openapi.yaml"
-    
-    generate_openapi_yaml(output_dir, output_file)
+    parser = argparse.ArgumentParser(description="OpenAPI仕様書を生成する")
+    parser.add_argument("output_dir", nargs="?", default="docs", help="出力ディレクトリ")
+    parser.add_argument("output_file", nargs="?", default="openapi.yaml", help="出力ファイル名")
+    parser.add_argument(
+        "--check", action="store_true", help="ファイルを書き込まず、既存ファイルとの差分を確認する"
+    )
+    args = parser.parse_args()
+
+    sys.exit(generate_openapi_yaml(args.output_dir, args.output_file, check=args.check))
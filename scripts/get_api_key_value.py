@@ -1,28 +1,177 @@
 import argparse
 import boto3
+import json
 import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Callable
 
-def get_api_key_value(api_key_id: str, region_name: str) -> str | None:
+# APIキーの値のキャッシュの既定値（キーのローテーション後も最大でTTLの間は古い値が返るため、
+# ローテーション時は --invalidate または invalidate_api_key_value() で明示的に破棄する）
+DEFAULT_CACHE_TTL_SECONDS = 300.0
+DEFAULT_CACHE_MAX_ENTRIES = 128
+DEFAULT_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "fastapi-mcp-template", "api_key_values.json"
+)
+
+class TTLCache:
+    """
+    有効期限（TTL）付きのLRUキャッシュ。
+
+    max_entries を超えた場合は、最も長く参照されていないエントリーから削除します。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        # キー -> (有効期限, 値)。末尾ほど最近参照されたエントリー
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        """有効期限内の値を返す。存在しないか期限切れの場合はNone。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            self.invalidate(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """値を登録する。"""
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """指定したキーのエントリーを破棄する。キーを省略した場合は全て破棄する。"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+class DiskTTLCache(TTLCache):
+    """
+    ファイルに保存する TTLCache。CLIの実行をまたいで値を再利用するために使用します。
+
+    有効期限は UNIX 時刻で保存します。APIキーの値を含むため、ファイルは所有者のみが
+    読み書きできる権限（0600）で作成します。
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_FILE,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ):
+        super().__init__(ttl_seconds, max_entries, clock=time.time)
+        self.path = path
+        self._load()
+
+    def get(self, key: str) -> str | None:
+        # 期限切れのエントリーを削除した場合も保存する
+        count = len(self._entries)
+        value = super().get(key)
+        if len(self._entries) != count:
+            self._save()
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        super().set(key, value)
+        self._save()
+
+    def invalidate(self, key: str | None = None) -> None:
+        super().invalidate(key)
+        self._save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = self._clock()
+        for key, (expires_at, value) in entries.items():
+            if expires_at > now:
+                self._entries[key] = (expires_at, value)
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # 一時ファイルに書き込んでから置き換え、書き込み途中のファイルを読まないようにする
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".api_key_values.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+# プロセス内で共有するキャッシュ
+_cache = TTLCache()
+
+def _cache_key(api_key_id: str, region_name: str) -> str:
+    return f"{region_name}/{api_key_id}"
+
+def get_api_key_value(
+    api_key_id: str, region_name: str, cache: TTLCache | None = _cache
+) -> str | None:
     """
     指定されたAPIキーIDに対応するAPIキーの値を取得します。
 
+    キャッシュに有効期限内の値があれば、API Gatewayを呼び出さずにその値を返します。
+
     Args:
         api_key_id: 取得するAPIキーのID。
         region_name: APIキーがデプロイされているAWSリージョン。
+        cache: 値のキャッシュ。Noneの場合はキャッシュしない。
 
     Returns:
         APIキーの値。見つからない場合はNone。
     """
+    key = _cache_key(api_key_id, region_name)
+    if cache is not None:
+        value = cache.get(key)
+        if value is not None:
+            return value
     try:
         client = boto3.client('apigateway', region_name=region_name)
         response = client.get_api_key(
             apiKey=api_key_id,
             includeValue=True
         )
-        return response.get('value')
+        value = response.get('value')
     except Exception as e:
         print(f"Error getting API key value: {e}")
         return None
+    if value and cache is not None:
+        cache.set(key, value)
+    return value
+
+def invalidate_api_key_value(
+    api_key_id: str, region_name: str, cache: TTLCache = _cache
+) -> None:
+    """
+    キャッシュしたAPIキーの値を破棄します（キーのローテーション後に呼び出します）。
+
+    Args:
+        api_key_id: 破棄するAPIキーのID。
+        region_name: APIキーがデプロイされているAWSリージョン。
+        cache: 値のキャッシュ。
+    """
+    cache.invalidate(_cache_key(api_key_id, region_name))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Get API Gateway API Key value.")
@@ -36,11 +185,38 @@ if __name__ == "__main__":
         default=os.environ.get("AWS_REGION", "ap-northeast-1"), # 環境変数 AWS_REGION があればそれを使う
         help="AWS region where the API Key is deployed (default: ap-northeast-1)."
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the value across runs through an on-disk cache (see --cache-file)."
+    )
+    parser.add_argument(
+        "--cache-file",
+        default=DEFAULT_CACHE_FILE,
+        help=f"On-disk cache file used with --cache (default: {DEFAULT_CACHE_FILE})."
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL_SECONDS,
+        help=f"Seconds a cached value stays valid (default: {DEFAULT_CACHE_TTL_SECONDS:g})."
+    )
+    parser.add_argument(
+        "--invalidate",
+        action="store_true",
+        help="Discard the cached value before the lookup (use after rotating the key)."
+    )
     args = parser.parse_args()
 
-    api_key_value = get_api_key_value(args.api_key_id, args.region)
+    cache = TTLCache(args.cache_ttl)
+    if args.cache:
+        cache = DiskTTLCache(args.cache_file, args.cache_ttl)
+    if args.invalidate:
+        invalidate_api_key_value(args.api_key_id, args.region, cache)
+
+    api_key_value = get_api_key_value(args.api_key_id, args.region, cache)
 
     if api_key_value:
         print(api_key_value)
     else:
-        print(f"Could not retrieve API key value for ID: {args.api_key_id}")
\ No newline at end of file
+        print(f"Could not retrieve API key value for ID: {args.api_key_id}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+app.main の起動時間レポートを出力するスクリプト
+
+新しいPythonプロセスで app.main をインポートし（コールドスタート相当）、
+フェーズ（dotenv, fastapi, fastapi_mcp, mangum）ごとのインポート時間を計測します。
+MCPサーバーの即時初期化（eager）と遅延初期化（lazy, MCP_LAZY_INIT=true）を比較します。
+
+使い方:
+    python scripts/report_startup_time.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = "import json, app.main as m; print('STARTUP_REPORT ' + json.dumps(m.startup_timer.report()))"
+
+PHASES = ("dotenv", "fastapi", "fastapi_mcp", "mangum", "total")
+
+
+def measure_once(lazy: bool) -> Dict[str, float]:
+    """
+    新しいプロセスで app.main をインポートして起動時間を計測
+
+    Args:
+        lazy: MCPサーバーを遅延初期化する場合はTrue
+
+    Returns:
+        フェーズごとの経過時間（ミリ秒）
+    """
+    env = dict(os.environ, MCP_LAZY_INIT="true" if lazy else "false")
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_REPORT "):
+            return json.loads(line[len("STARTUP_REPORT "):])
+    raise RuntimeError(f"起動時間レポートを取得できませんでした: {result.stdout}")
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    複数回の計測結果をフェーズごとの中央値に集約
+
+    Args:
+        samples: 計測結果の一覧
+
+    Returns:
+        フェーズごとの中央値（ミリ秒）
+    """
+    return {
+        phase: round(statistics.median(sample.get(phase, 0.0) for sample in samples), 3)
+        for phase in PHASES
+    }
+
+
+def main() -> int:
+    """
+    起動時間レポートのメインエントリーポイント
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="app.main の起動時間レポート")
+    parser.add_argument("--runs", type=int, default=5, help="モードごとの計測回数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    report = {
+        mode: summarize([measure_once(lazy=(mode == "lazy")) for _ in range(args.runs)])
+        for mode in ("eager", "lazy")
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"app.main インポート時間（ミリ秒, {args.runs}回の中央値）")
+    print(f"  {'phase':<12} {'eager':>10} {'lazy':>10}")
+    for phase in PHASES:
+        print(f"  {phase:<12} {report['eager'][phase]:>10.1f} {report['lazy'][phase]:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,33 @@ import sys
 from typing import List, Optional
 
 
+def run_bench(extra_args: List[str]) -> int:
+    """
+    負荷試験を実行し、保存済みのベースラインと比較
+
+    Args:
+        extra_args: 負荷試験に渡す追加の引数（例: --update-baseline）
+
+    Returns:
+        int: 終了コード（0: 成功、1: ベースラインから悪化）
+    """
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_load",
+        "--target",
+        "all",
+        "--repeat",
+        "3",
+        "--baseline",
+        os.path.join("benchmarks", "baseline.json"),
+    ] + extra_args
+    print(f"実行コマンド: python {' '.join(command[1:])}")
+    result = subprocess.run(command, cwd=root_dir)
+    return result.returncode
+
+
 def main() -> int:
     """
     テスト実行スクリプトのメインエントリーポイント
@@ -30,6 +57,11 @@ def main() -> int:
     parser.add_argument(
         "--all", action="store_true", help="すべてのテストを実行"
     )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="負荷試験（benchmarks.bench_load）を実行し、ベースラインと比較",
+    )
     parser.add_argument(
         "--coverage", action="store_true", help="カバレッジレポートを生成"
     )
@@ -40,11 +72,16 @@ def main() -> int:
         "--verbose", "-v", action="store_true", help="詳細なログを出力"
     )
     parser.add_argument(
-        "pytest_args", nargs="*", help="pytestに渡す追加の引数"
+        "pytest_args",
+        nargs="*",
+        help="pytestに渡す追加の引数（--bench の場合は負荷試験に渡す引数）",
     )
 
     args = parser.parse_args()
 
+    if args.bench:
+        return run_bench(args.pytest_args)
+
     # デフォルトですべてのテストを実行
     if not (args.unit or args.integration or args.e2e or args.all):
         args.all = True
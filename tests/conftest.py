@@ -15,11 +15,22 @@ from dotenv import load_dotenv
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.presentation.mcp.tool_cache import tool_result_cache
 
 # .envファイルを読み込む
 load_dotenv()
 
 
+@pytest.fixture(autouse=True)
+def clear_tool_result_cache() -> Generator[None, None, None]:
+    """
+    テストの間でMCPツールの結果キャッシュを共有しないよう、各テストの前後で破棄するフィクスチャ
+    """
+    tool_result_cache.invalidate()
+    yield
+    tool_result_cache.invalidate()
+
+
 @pytest.fixture
 def test_client() -> TestClient:
     """
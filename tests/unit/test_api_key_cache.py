@@ -0,0 +1,57 @@
+"""
+APIキーの値のキャッシュ（scripts/get_api_key_value.py）のユニットテスト
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "get_api_key_value.py"
+
+
+@pytest.fixture(scope="module")
+def script():
+    """
+    スクリプトをモジュールとして読み込む
+    """
+    pytest.importorskip("boto3")
+    spec = importlib.util.spec_from_file_location("get_api_key_value", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_ttl_cache_expires_and_evicts_lru(script) -> None:
+    """
+    有効期限切れのエントリーと、最も長く参照されていないエントリーが破棄されることのテスト
+    """
+    now = [0.0]
+    cache = script.TTLCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    cache.set("d", "4")
+    cache.invalidate("d")
+    assert cache.get("d") is None
+
+
+def test_disk_cache_persists_and_invalidates(script, tmp_path) -> None:
+    """
+    ファイルのキャッシュが実行をまたいで読み込まれ、明示的に破棄できることのテスト
+    """
+    path = str(tmp_path / "cache" / "values.json")
+    script.DiskTTLCache(path).set("key", "secret")
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    cache = script.DiskTTLCache(path)
+    assert cache.get("key") == "secret"
+    cache.invalidate()
+    assert script.DiskTTLCache(path).get("key") is None
@@ -0,0 +1,262 @@
+"""
+レスポンス圧縮ミドルウェアのユニットテスト
+"""
+
+import asyncio
+import gzip
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.infrastructure.example_repository import example_repository
+from app.main import handler, mcp_server
+from app.presentation.middleware.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+from app.presentation.middleware.response_cache import ResponseCacheMiddleware
+
+LARGE_BODY = "compressible text " * 200
+
+
+def create_app(**kwargs) -> FastAPI:  # type: ignore[no-untyped-def]
+    """
+    テスト用のアプリケーションを作成（main.py と同じく圧縮をレスポンスキャッシュの外側に配置）
+    """
+    app = FastAPI()
+
+    @app.get("/large")
+    def large() -> PlainTextResponse:
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/small")
+    def small() -> PlainTextResponse:
+        return PlainTextResponse("small")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for i in range(3):
+                yield f"line {i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/mcp/large")
+    def mcp_large() -> PlainTextResponse:
+        return PlainTextResponse(LARGE_BODY)
+
+    app.add_middleware(ResponseCacheMiddleware, route_paths=["/large", "/small"])
+    app.add_middleware(CompressionMiddleware, exclude_paths=["/mcp"], **kwargs)
+    return app
+
+
+def gzip_client(app: FastAPI) -> TestClient:
+    return TestClient(app, headers={"Accept-Encoding": "gzip"})
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("br, gzip", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip;q=0, *", "br"),
+        ("*;q=0", None),
+        ("deflate", None),
+    ],
+)
+def test_negotiate_encoding(header: str, expected: str) -> None:
+    """
+    q 値とワイルドカードを考慮したエンコーディングの選択のテスト
+    """
+    assert negotiate_encoding(header, ("br", "gzip")) == expected
+
+
+def test_compresses_large_response_and_caches_body() -> None:
+    """
+    最小サイズ以上のレスポンスの gzip 圧縮と、圧縮済みボディのキャッシュのテスト
+    """
+    app = create_app()
+    client = gzip_client(app)
+
+    response = client.get("/large")
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == LARGE_BODY
+    assert int(response.headers["content-length"]) < len(LARGE_BODY)
+    assert response.headers["etag"].startswith('W/"')
+
+    middleware = app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+    assert (middleware.cache.hits, middleware.cache.misses) == (0, 1)
+    assert client.get("/large").text == LARGE_BODY
+    assert (middleware.cache.hits, middleware.cache.misses) == (1, 1)
+
+
+def test_weak_etag_still_matches() -> None:
+    """
+    圧縮したレスポンスの弱いETagでも304が返ることのテスト
+    """
+    client = gzip_client(create_app())
+    etag = client.get("/large").headers["etag"]
+
+    response = client.get("/large", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+
+
+def test_skips_small_and_excluded_responses() -> None:
+    """
+    最小サイズ未満・除外パス・Accept-Encoding なしのレスポンスを圧縮しないことのテスト
+    """
+    client = gzip_client(create_app())
+    assert "content-encoding" not in client.get("/small").headers
+    assert "content-encoding" not in client.get("/mcp/large").headers
+
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == LARGE_BODY.encode()
+
+
+def test_compresses_streaming_response() -> None:
+    """
+    ストリーミングのレスポンスをチャンクごとに圧縮することのテスト
+    """
+    client = gzip_client(create_app())
+    with client.stream("GET", "/stream") as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"line 0\nline 1\nline 2\n"
+
+
+def test_brotli() -> None:
+    """
+    brotli がインストールされている場合に brotli を優先することのテスト
+    """
+    brotli = pytest.importorskip("brotli")
+    client = TestClient(create_app(), headers={"Accept-Encoding": "gzip, br"})
+    with client.stream("GET", "/large") as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == LARGE_BODY.encode()
+
+
+def test_precompressed_openapi_is_not_recompressed(test_client: TestClient) -> None:
+    """
+    既に gzip 圧縮されている /openapi.json を二重に圧縮しないことのテスト
+    """
+    response = test_client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(response.content)["openapi"] == "3.0.3"
+
+
+@pytest.fixture
+def many_examples() -> Iterator[None]:
+    """
+    最小サイズ以上のレスポンスになるよう、テスト中のみサンプルを追加するフィクスチャ
+    """
+    ids = range(1000, 1050)
+    for example_id in ids:
+        example_repository.add(
+            {"id": example_id, "name": f"Bulk {example_id}", "description": "x" * 100}
+        )
+    try:
+        yield
+    finally:
+        for example_id in ids:
+            example_repository.delete(example_id)
+
+
+def invoke_lambda(path: str, query: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Accept-Encoding: gzip を付けた API Gateway（REST API）のイベントで Lambda ハンドラーを呼び出す
+
+    圧縮したボディ（base64）が返されていないことを確認したレスポンスを返します。
+    """
+    event = {
+        "resource": "/{proxy+}",
+        "path": path,
+        "httpMethod": "GET",
+        "headers": {"Accept-Encoding": "gzip", "Host": "example.execute-api.amazonaws.com"},
+        "multiValueHeaders": {
+            "Accept-Encoding": ["gzip"],
+            "Host": ["example.execute-api.amazonaws.com"],
+        },
+        "queryStringParameters": query,
+        "multiValueQueryStringParameters": (
+            {name: [value] for name, value in query.items()} if query else None
+        ),
+        "requestContext": {"resourcePath": "/{proxy+}", "stage": "dev"},
+        "pathParameters": {"proxy": path.lstrip("/")},
+        "body": None,
+        "isBase64Encoded": False,
+    }
+    response = handler(event, None)
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is False
+    headers = {name.lower() for name in response.get("multiValueHeaders", {})}
+    headers |= {name.lower() for name in response.get("headers", {})}
+    assert "content-encoding" not in headers
+    return response
+
+
+def test_not_compressed_behind_lambda(many_examples: None) -> None:
+    """
+    Lambda（Mangum）では、API Gateway が base64 のまま返さないよう圧縮しないことのテスト
+    """
+    response = invoke_lambda("/api/examples/", {"limit": "100"})
+    assert len(json.loads(response["body"])) > 50
+
+
+def test_export_not_compressed_behind_lambda(many_examples: None) -> None:
+    """
+    Lambda（Mangum）では、NDJSON のエクスポートも gzip で送信しないことのテスト
+    """
+    response = invoke_lambda("/api/examples/export")
+    lines = response["body"].splitlines()
+    assert len(lines) > 50
+    assert json.loads(lines[0])["id"] == 1
+
+
+def test_openapi_not_compressed_behind_lambda() -> None:
+    """
+    Lambda（Mangum）では、圧縮済みの /openapi.json ではなく非圧縮のバイト列を返すことのテスト
+    """
+    response = invoke_lambda("/openapi.json")
+    assert json.loads(response["body"])["openapi"] == "3.0.3"
+
+
+def test_mcp_tool_calls_are_not_compressed(
+    many_examples: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    MCPツールの内部のHTTP呼び出しのレスポンスを圧縮しないことのテスト
+    """
+    encodings: List[str] = []
+    encoded_start = CompressionMiddleware._encoded_start
+
+    def record(start_message, encoding, content_length):  # type: ignore[no-untyped-def]
+        encodings.append(encoding)
+        return encoded_start(start_message, encoding, content_length)
+
+    monkeypatch.setattr(CompressionMiddleware, "_encoded_start", staticmethod(record))
+    result = asyncio.run(
+        mcp_server._execute_api_tool(
+            client=mcp_server._http_client,
+            tool_name="get_examples",
+            arguments={"limit": 100},
+            operation_map=mcp_server.operation_map,
+        )
+    )
+    assert len(json.loads(result[0].text)) > 50
+    assert encodings == []
@@ -0,0 +1,219 @@
+"""
+サンプルアプリケーション（example/main.py）のユニットテスト
+"""
+
+import importlib.util
+import json
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+import pytest
+from fastapi import Response
+from fastapi.testclient import TestClient
+
+EXAMPLE_APP_PATH = Path(__file__).resolve().parents[2] / "example" / "main.py"
+
+
+@pytest.fixture
+def example_app() -> ModuleType:
+    """
+    テストごとにデータを初期化したサンプルアプリケーションのモジュールを読み込むフィクスチャ
+    """
+    spec = importlib.util.spec_from_file_location("example_main", EXAMPLE_APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def client(example_app: ModuleType) -> TestClient:
+    return TestClient(example_app.app)
+
+
+def test_bulk_create_accepts_json_array_and_ndjson(client: TestClient) -> None:
+    """
+    JSON配列と NDJSON のいずれでも一括作成できることのテスト
+    """
+    response = client.post(
+        "/api/examples/bulk", json=[{"name": "A"}, {"name": "B", "description": "b"}]
+    )
+    assert response.status_code == 201
+    assert response.json() == [
+        {"id": 4, "name": "A", "description": "This is example 4", "version": 1},
+        {"id": 5, "name": "B", "description": "b", "version": 1},
+    ]
+
+    ndjson = "\n".join(json.dumps({"name": f"N{i}"}) for i in range(3)) + "\n"
+    response = client.post(
+        "/api/examples/bulk",
+        content=ndjson,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201
+    # IDはスレッドごとのブロックから払い出されるため、連番になるのはブロック内のみ
+    new_ids = [example["id"] for example in response.json()]
+    assert len(set(new_ids)) == 3 and min(new_ids) > 5
+    assert len(client.get("/api/examples").json()) == 8
+
+
+def test_bulk_create_is_rejected_as_a_whole_on_validation_error(
+    client: TestClient,
+) -> None:
+    """
+    1件でも不正な要素があれば 422 を返し、何も作成しないことのテスト
+    """
+    response = client.post("/api/examples/bulk", json=[{"name": "A"}, {"description": "x"}])
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "name"]
+    assert len(client.get("/api/examples").json()) == 3
+
+
+def test_bulk_endpoints_declare_request_body_schema(client: TestClient) -> None:
+    """
+    一括処理のリクエストボディのスキーマ（JSON配列と NDJSON）がOpenAPIに含まれることのテスト
+    """
+    paths = client.get("/openapi.json").json()["paths"]
+    content = paths["/api/examples/bulk"]["patch"]["requestBody"]["content"]
+    assert content["application/json"]["schema"]["items"] == {
+        "$ref": "#/components/schemas/ExampleBulkUpdate"
+    }
+    assert content["application/x-ndjson"]["schema"] == {
+        "$ref": "#/components/schemas/ExampleBulkUpdate"
+    }
+    content = paths["/api/examples/bulk-delete"]["post"]["requestBody"]["content"]
+    assert content["application/json"]["schema"]["items"] == {"type": "integer"}
+
+
+def test_bulk_update_and_delete_are_atomic(client: TestClient) -> None:
+    """
+    存在しないIDを含む一括更新・一括削除は 404 となり、他の要素にも適用されないことのテスト
+    """
+    response = client.patch("/api/examples/bulk", json=[{"id": 1, "name": "X"}, {"id": 99}])
+    assert response.status_code == 404
+    assert client.get("/api/examples/1").json()["name"] == "Example 1"
+
+    response = client.patch(
+        "/api/examples/bulk", json=[{"id": 1, "name": "X"}, {"id": 2, "description": "d"}]
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": 1, "name": "X", "description": "This is example 1", "version": 2},
+        {"id": 2, "name": "Example 2", "description": "d", "version": 2},
+    ]
+
+    response = client.post("/api/examples/bulk-delete", json=[1, 99])
+    assert response.status_code == 404
+    assert len(client.get("/api/examples").json()) == 3
+
+    response = client.post(
+        "/api/examples/bulk-delete",
+        content="1\n3\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert [example["id"] for example in response.json()["deleted"]] == [1, 3]
+    assert client.get("/api/examples").json() == [
+        {"id": 2, "name": "Example 2", "description": "d", "version": 2}
+    ]
+
+
+def test_ids_are_not_reused_after_delete(client: TestClient) -> None:
+    """
+    削除後も最大値から再計算せず、払い出し済みのIDを再利用しないことのテスト
+    """
+    assert client.delete("/api/examples/3").status_code == 200
+    response = client.post("/api/examples", json={"name": "New"})
+    assert response.status_code == 201
+    assert response.json()["id"] == 4
+
+
+def test_comments_are_paginated_by_since(client: TestClient) -> None:
+    """
+    コメント一覧が投稿時刻順に limit 件ずつ返り、X-Next-Since で続きを取得できることのテスト
+    """
+    for i in range(5):
+        response = client.post("/api/examples/1/comments", json={"content": f"c{i}"})
+        assert response.status_code == 201
+        assert response.json()["id"] == i + 1
+
+    contents = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/api/examples/1/comments", params=params)
+        assert response.status_code == 200
+        contents.extend(comment["content"] for comment in response.json())
+        next_since = response.headers.get("X-Next-Since")
+        if next_since is None:
+            break
+        params = {"limit": 2, "since": next_since}
+    assert contents == [f"c{i}" for i in range(5)]
+
+    assert client.get("/api/examples/2/comments").json() == []
+    assert client.get("/api/examples/99/comments").status_code == 404
+
+
+def test_comments_are_removed_with_example(client: TestClient) -> None:
+    """
+    サンプルを削除するとコメントへの追加・取得が 404 になることのテスト
+    """
+    client.post("/api/examples/1/comments", json={"content": "c"})
+    assert client.delete("/api/examples/1").status_code == 200
+    assert client.get("/api/examples/1/comments").status_code == 404
+    assert client.post("/api/examples/1/comments", json={"content": "c"}).status_code == 404
+
+
+def test_if_match_rejects_stale_updates(client: TestClient) -> None:
+    """
+    If-Match が現在の ETag と一致しない更新・削除が 412 で拒否されることのテスト
+    """
+    etag = client.get("/api/examples/1").headers["ETag"]
+    assert etag == '"1"'
+
+    response = client.put("/api/examples/1", json={"name": "A"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+
+    # 古い ETag での更新・削除は拒否され、内容は変わらない
+    response = client.put("/api/examples/1", json={"name": "B"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert client.delete("/api/examples/1", headers={"If-Match": etag}).status_code == 412
+    assert client.get("/api/examples/1").json()["name"] == "A"
+
+    # If-Match を省略した場合と * の場合は無条件に適用される
+    assert client.put("/api/examples/1", json={"name": "C"}).status_code == 200
+    assert client.delete("/api/examples/1", headers={"If-Match": "*"}).status_code == 200
+
+
+def test_get_example_returns_a_snapshot(example_app: ModuleType) -> None:
+    """
+    詳細取得が保存中の辞書ではなく、ETag と同じバージョンのコピーを返すことのテスト
+    """
+    response = Response()
+    example = example_app.get_example(1, response)
+    assert example is not example_app.EXAMPLES[1]
+    example_app.EXAMPLES[1]["version"] += 1
+    assert response.headers["ETag"] == f'"{example["version"]}"'
+
+
+def test_id_sequence_is_unique_across_threads(example_app: ModuleType) -> None:
+    """
+    複数スレッドから同時に払い出したIDが重複しないことのテスト
+    """
+    sequence = example_app.IdSequence(start=10, block_size=8)
+    results: List[List[int]] = []
+
+    def worker() -> None:
+        results.append([id_ for _ in range(50) for id_ in sequence.allocate(3)])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [id_ for ids in results for id_ in ids]
+    assert len(ids) == len(set(ids)) == 8 * 50 * 3
+    assert min(ids) == 10
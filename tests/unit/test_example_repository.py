@@ -0,0 +1,97 @@
+"""
+サンプルリポジトリのユニットテスト
+"""
+
+import pytest
+
+from app.infrastructure.example_repository import ExampleRepository
+
+
+@pytest.fixture
+def repository() -> ExampleRepository:
+    """
+    テスト用のリポジトリ
+
+    Returns:
+        ExampleRepository: 初期データを登録したリポジトリ
+    """
+    return ExampleRepository(
+        [
+            {"id": 1, "name": "Alpha", "description": "first"},
+            {"id": 2, "name": "Beta", "description": "second"},
+            {"id": 3, "name": "Alpha", "description": "third"},
+        ]
+    )
+
+
+def test_get_by_primary_key(repository: ExampleRepository) -> None:
+    """
+    主キーによる取得のテスト
+    """
+    assert repository.get(2)["name"] == "Beta"
+    assert repository.get(999) is None
+    assert len(repository) == 3
+
+
+def test_find_by_name(repository: ExampleRepository) -> None:
+    """
+    name の二次インデックスによる検索のテスト
+    """
+    assert [e["id"] for e in repository.find_by_name("Alpha")] == [1, 3]
+    assert repository.find_by_name("Unknown") == []
+
+
+def test_update_and_delete_keep_indexes_consistent(repository: ExampleRepository) -> None:
+    """
+    更新・削除時にインデックスが追従することのテスト
+    """
+    repository.update(1, name="Gamma")
+    assert [e["id"] for e in repository.find_by_name("Alpha")] == [3]
+    assert [e["id"] for e in repository.find_by_name("Gamma")] == [1]
+
+    deleted = repository.delete(3)
+    assert deleted is not None and deleted["id"] == 3
+    assert repository.find_by_name("Alpha") == []
+    assert repository.get(3) is None
+    assert repository.delete(3) is None
+
+
+def test_add_duplicate_id_raises(repository: ExampleRepository) -> None:
+    """
+    重複IDの追加がエラーになることのテスト
+    """
+    with pytest.raises(ValueError):
+        repository.add({"id": 1, "name": "Duplicate", "description": ""})
+
+
+def test_page_uses_keyset_order(repository: ExampleRepository) -> None:
+    """
+    キーセットページネーションのテスト
+    """
+    repository.add({"id": 0, "name": "Zero", "description": "inserted out of order"})
+    examples, next_after_id = repository.page(2)
+    assert [e["id"] for e in examples] == [0, 1]
+    assert next_after_id == 1
+
+    examples, next_after_id = repository.page(2, after_id=next_after_id)
+    assert [e["id"] for e in examples] == [2, 3]
+    assert next_after_id is None
+
+    examples, next_after_id = repository.page(1, name="Alpha")
+    assert [e["id"] for e in examples] == [1]
+    assert repository.page(1, after_id=next_after_id, name="Alpha")[0][0]["id"] == 3
+
+
+def test_name_index_stays_sorted(repository: ExampleRepository) -> None:
+    """
+    name の二次インデックスが id の昇順を保ち、名前で絞り込んだページが正しく続くことのテスト
+    """
+    repository.add({"id": 0, "name": "Alpha", "description": "inserted out of order"})
+    repository.update(2, name="Alpha")
+    assert [e["id"] for e in repository.find_by_name("Alpha")] == [0, 1, 2, 3]
+
+    examples, next_after_id = repository.page(2, after_id=0, name="Alpha")
+    assert [e["id"] for e in examples] == [1, 2]
+    assert next_after_id == 2
+    repository.delete(3)
+    assert repository.page(2, after_id=next_after_id, name="Alpha") == ([], None)
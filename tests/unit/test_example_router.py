@@ -2,6 +2,8 @@
 サンプルAPIエンドポイントのユニットテスト
 """
 
+import json
+
 from fastapi.testclient import TestClient
 
 
@@ -35,3 +37,125 @@ def test_get_example(test_client: TestClient) -> None:
     response = test_client.get("/api/examples/999")
     assert response.status_code == 404
     assert "detail" in response.json()
+
+
+def test_get_examples_filtered_by_name(test_client: TestClient) -> None:
+    """
+    サンプル名で絞り込んだ一覧取得のテスト
+    """
+    response = test_client.get("/api/examples/", params={"name": "Example 2"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [example["id"] for example in data] == [2]
+
+    response = test_client.get("/api/examples/", params={"name": "No such example"})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_get_examples_pagination(test_client: TestClient) -> None:
+    """
+    カーソルによるページネーションのテスト
+    """
+    response = test_client.get("/api/examples/", params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
+    next_cursor = response.headers["X-Next-Cursor"]
+    assert 'rel="next"' in response.headers["Link"]
+
+    response = test_client.get("/api/examples/", params={"limit": 2, "cursor": next_cursor})
+    assert response.status_code == 200
+    second_page = response.json()
+    assert second_page[0]["id"] > first_page[-1]["id"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = test_client.get("/api/examples/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_get_examples_field_projection(test_client: TestClient) -> None:
+    """
+    フィールド射影のテスト
+    """
+    response = test_client.get("/api/examples/", params={"fields": "id,name"})
+    assert response.status_code == 200
+    for example in response.json():
+        assert set(example) == {"id", "name"}
+
+    response = test_client.get("/api/examples/", params={"fields": "id,unknown"})
+    assert response.status_code == 400
+
+
+def test_get_examples_batch(test_client: TestClient) -> None:
+    """
+    IDのカンマ区切りによる一括取得のテスト
+    """
+    response = test_client.get("/api/examples/batch", params={"ids": "3,1,999,1"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [example["id"] for example in data["items"]] == [3, 1]
+    assert data["missing"] == [999]
+
+    response = test_client.get("/api/examples/batch", params={"ids": "1,x"})
+    assert response.status_code == 400
+
+
+def test_batch_get_examples(test_client: TestClient) -> None:
+    """
+    リクエストボディによる一括取得のテスト
+    """
+    response = test_client.post(
+        "/api/examples:batchGet", json={"ids": [2, 1], "fields": "id,name"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == [{"id": 2, "name": "Example 2"}, {"id": 1, "name": "Example 1"}]
+    assert data["missing"] == []
+
+    response = test_client.post("/api/examples:batchGet", json={"ids": []})
+    assert response.status_code == 422
+
+
+def test_export_examples_ndjson(test_client: TestClient) -> None:
+    """
+    NDJSONエクスポート（非圧縮・gzip・フィールド射影）のテスト
+    """
+    response = test_client.get(
+        "/api/examples/export", headers={"Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [example["id"] for example in lines] == [1, 2, 3]
+
+    response = test_client.get(
+        "/api/examples/export",
+        params={"fields": "id"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    # httpx が展開した本文
+    assert response.text == '{"id":1}\n{"id":2}\n{"id":3}\n'
+
+
+def test_search_examples(test_client: TestClient) -> None:
+    """
+    全文検索エンドポイントのテスト
+    """
+    response = test_client.get("/api/examples/search", params={"q": "example 2"})
+    assert response.status_code == 200
+    results = response.json()
+    # 全てのサンプルが "example" に一致し、"2" にも一致するサンプルが先頭になる
+    assert [result["id"] for result in results] == [2, 1, 3]
+    assert results[0]["score"] > results[1]["score"] > 0
+
+    response = test_client.get(
+        "/api/examples/search", params={"q": "exa", "limit": 1, "fields": "id"}
+    )
+    assert response.status_code == 200
+    assert list(response.json()[0]) == ["id", "score"]
+
+    assert test_client.get("/api/examples/search", params={"q": "nothing"}).json() == []
+    assert test_client.get("/api/examples/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,42 @@
+"""
+本番サーバーの設定（app.core.gunicorn_conf）のユニットテスト
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.gunicorn_conf import available_cpus, resolve_loop, resolve_workers
+
+
+def test_available_cpus_respects_cgroup_quota(tmp_path: Path) -> None:
+    """
+    コンテナのCPUクォータ（cgroup v2 / v1）でCPU数が制限されることのテスト
+    """
+    affinity = len(os.sched_getaffinity(0))
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert available_cpus(str(tmp_path)) == affinity
+
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+    assert available_cpus(str(tmp_path)) == 1
+
+    (tmp_path / "cpu.max").unlink()
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert available_cpus(str(tmp_path)) == affinity
+
+
+def test_resolve_workers_and_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    ワーカー数の明示指定と、uvloop がない場合のイベントループのフォールバックのテスト
+    """
+    assert resolve_workers(3, str(tmp_path)) == 3
+    assert resolve_workers(0, str(tmp_path)) == available_cpus(str(tmp_path))
+
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    assert resolve_loop("auto") == "asyncio"
+    assert resolve_loop("uvloop") == "uvloop"
@@ -0,0 +1,59 @@
+"""
+JSONレスポンスクラス選択のユニットテスト
+"""
+
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import json_response
+from app.core.config import settings
+from app.core.json_response import StdlibJSONResponse, get_json_response_class
+
+
+@pytest.fixture(autouse=True)
+def clear_response_class_cache() -> Generator[None, None, None]:
+    """
+    テストごとにレスポンスクラスの選択結果のキャッシュを破棄するフィクスチャ
+    """
+    get_json_response_class.cache_clear()
+    yield
+    get_json_response_class.cache_clear()
+
+
+def test_unknown_encoder_raises() -> None:
+    """
+    未知のエンコーダー名がエラーになることのテスト
+    """
+    with pytest.raises(ValueError):
+        get_json_response_class("unknown")
+
+
+def test_missing_encoder_falls_back_to_stdlib(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    ライブラリが未インストールの場合に stdlib へフォールバックすることのテスト
+    """
+    monkeypatch.setattr(json_response, "is_encoder_available", lambda name: name == "stdlib")
+    assert get_json_response_class("orjson") is StdlibJSONResponse
+    assert get_json_response_class("msgspec") is StdlibJSONResponse
+    assert get_json_response_class("auto") is StdlibJSONResponse
+
+
+@pytest.mark.parametrize("encoder", ["stdlib", "orjson", "msgspec"])
+def test_encoders_produce_same_payload(
+    test_client: TestClient, monkeypatch: pytest.MonkeyPatch, encoder: str
+) -> None:
+    """
+    どのエンコーダーでも同じペイロードが返ることのテスト
+
+    未インストールのエンコーダーは stdlib にフォールバックして同じ経路を再度テストするだけになるため、
+    スキップします。
+    """
+    if encoder != "stdlib":
+        pytest.importorskip(encoder)
+    monkeypatch.setattr(settings, "JSON_RESPONSE_CLASS", encoder)
+    response = test_client.get("/api/examples/1")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"id": 1, "name": "Example 1", "description": "This is example 1"}
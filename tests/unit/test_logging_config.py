@@ -0,0 +1,116 @@
+"""
+ロギング設定のユニットテスト
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.logging_config import (
+    JSONLinesFormatter,
+    capture_request_body,
+    redact_headers,
+)
+from app.main import global_exception_handler
+
+
+def test_json_lines_formatter_includes_extra_fields() -> None:
+    """
+    JSON Lines フォーマッターが extra のフィールドと例外を出力することのテスト
+    """
+    try:
+        raise ValueError("boom")
+    except ValueError as e:
+        record = logging.LogRecord(
+            "app.test", logging.ERROR, __file__, 1, "failed: %s", ("x",), (type(e), e, e.__traceback__)
+        )
+    record.path = "/api/examples/"
+    entry = json.loads(JSONLinesFormatter().format(record))
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "app.test"
+    assert entry["message"] == "failed: x"
+    assert entry["path"] == "/api/examples/"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_redact_headers() -> None:
+    """
+    認証情報を含むヘッダーがマスクされることのテスト
+    """
+    redacted = redact_headers({"Authorization": "Bearer secret", "Accept": "*/*"})
+    assert redacted == {"Authorization": "***", "Accept": "*/*"}
+
+
+def test_request_body_capture_is_size_capped() -> None:
+    """
+    リクエストボディの読み込みが上限で打ち切られることのテスト
+    """
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request) -> dict:
+        body, truncated = await capture_request_body(request, 8)
+        return {"body": body.decode(), "truncated": truncated}
+
+    response = TestClient(app).post("/echo", content=b"0123456789abcdef")
+    assert response.json() == {"body": "01234567", "truncated": True}
+
+
+def test_global_exception_handler_logs_error(
+    caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    グローバル例外ハンドラーがエラーをログに出力し、500を返すことのテスト
+    """
+    app = FastAPI()
+    app.add_exception_handler(Exception, global_exception_handler)
+
+    @app.post("/fail")
+    async def fail() -> dict:
+        raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(settings, "LOG_REQUEST_BODY_MAX_BYTES", 4)
+    with caplog.at_level(logging.DEBUG, logger="app.main"):
+        response = TestClient(app, raise_server_exceptions=False).post(
+            "/fail", content=b"payload", headers={"Authorization": "secret"}
+        )
+
+    assert response.status_code == 500
+    assert response.json()["message"] == "unexpected"
+    messages = [record.getMessage() for record in caplog.records if record.name == "app.main"]
+    assert "例外が発生しました: unexpected" in messages
+    assert all("secret" not in message for message in messages)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork が使えない環境")
+def test_logging_works_in_forked_child() -> None:
+    """
+    fork した子プロセス（preload 後の gunicorn ワーカー）でもログが出力されることのテスト
+    """
+    script = textwrap.dedent(
+        """
+        import logging, os
+        from app.core.config import Settings
+        from app.core.logging_config import setup_logging, shutdown_logging
+
+        setup_logging(Settings(LOG_FORMAT="text"))
+        pid = os.fork()
+        if pid == 0:
+            logging.getLogger("child").warning("from child")
+            shutdown_logging()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=30
+    )
+    assert "from child" in result.stdout
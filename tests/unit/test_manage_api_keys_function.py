@@ -0,0 +1,228 @@
+"""
+APIキー管理のLambda関数（cdk/src/lambda/manage_api_keys_function.py）のユニットテスト
+
+API Gateway のクライアントはメモリ上のスタブに差し替えるため、AWSへの接続は不要です。
+"""
+
+import importlib.util
+import itertools
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+LAMBDA_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "cdk"
+    / "src"
+    / "lambda"
+    / "manage_api_keys_function.py"
+)
+REGION = "ap-northeast-1"
+
+
+class FakeApiGateway:
+    """
+    APIキー・使用量プラン・関連付けを保持する API Gateway クライアントのスタブ
+    """
+
+    def __init__(self, client_error) -> None:
+        self._client_error = client_error
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.keys: dict = {}
+        self.plans: dict = {}
+        self.links: set = set()
+        self.fail_key_names: set = set()
+        self.throttle_remaining = 0
+
+    def _next_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}{next(self._ids)}"
+
+    def _throttle(self) -> None:
+        with self._lock:
+            if self.throttle_remaining:
+                self.throttle_remaining -= 1
+                raise self._client_error(
+                    {"Error": {"Code": "TooManyRequestsException"}}, "Throttled"
+                )
+
+    def create_api_key(self, name, description, enabled, generateDistinctId):
+        self._throttle()
+        key_id = self._next_id("key")
+        self.keys[key_id] = {"id": key_id, "name": name, "description": description}
+        return {"id": key_id, "value": f"value-{key_id}"}
+
+    def get_api_key(self, apiKey, includeValue):
+        return self.keys[apiKey]
+
+    def update_api_key(self, apiKey, patchOperations):
+        self.keys[apiKey]["enabled"] = False
+
+    def delete_api_key(self, apiKey):
+        del self.keys[apiKey]
+        self.links = {link for link in self.links if link[1] != apiKey}
+
+    def create_usage_plan(self, name, description, apiStages, throttle, quota):
+        plan_id = self._next_id("plan")
+        self.plans[plan_id] = {"stages": list(apiStages)}
+        return {"id": plan_id}
+
+    def update_usage_plan(self, usagePlanId, patchOperations):
+        self.plans[usagePlanId]["stages"] = []
+
+    def delete_usage_plan(self, usagePlanId):
+        assert not self.plans[usagePlanId]["stages"]
+        del self.plans[usagePlanId]
+
+    def create_usage_plan_key(self, usagePlanId, keyId, keyType):
+        if self.keys[keyId]["name"] in self.fail_key_names:
+            raise self._client_error({"Error": {"Code": "BadRequestException"}}, "Link")
+        self.links.add((usagePlanId, keyId))
+
+    def delete_usage_plan_key(self, usagePlanId, keyId):
+        self.links.discard((usagePlanId, keyId))
+
+    def get_usage_plan_keys(self, usagePlanId, limit):
+        return {"items": [key for plan, key in self.links if plan == usagePlanId]}
+
+    def get_paginator(self, operation):
+        fake = self
+
+        class Paginator:
+            def paginate(self, keyId=None, **kwargs):
+                if operation == "get_usage_plans":
+                    items = [{"id": plan} for plan, key in fake.links if key == keyId]
+                else:
+                    items = list(fake.keys.values())
+                return [{"items": items}]
+
+        return Paginator()
+
+
+@pytest.fixture
+def function(monkeypatch):
+    """
+    API Gateway クライアントをスタブに差し替えたLambda関数のモジュール
+    """
+    exceptions = pytest.importorskip("botocore.exceptions")
+    monkeypatch.setenv("AWS_REGION", REGION)
+    monkeypatch.setenv(
+        "API_GATEWAY_STAGE_ARN",
+        f"arn:aws:apigateway:{REGION}::/restapis/abc123/stages/dev",
+    )
+    spec = importlib.util.spec_from_file_location("manage_api_keys", LAMBDA_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module._clients[REGION] = FakeApiGateway(exceptions.ClientError)
+    module.RETRY_BASE_DELAY_SECONDS = 0
+    return module
+
+
+def invoke(function, event):
+    response = function.lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_batch_create_rolls_back_failed_keys(function) -> None:
+    """
+    一括作成で失敗したキーの作成済みリソースだけが削除されることのテスト
+    """
+    fake = function._clients[REGION]
+    fake.fail_key_names = {"broken"}
+    fake.throttle_remaining = 2
+    keys = [{"keyName": f"tenant-{i}"} for i in range(5)] + [{"keyName": "broken"}]
+
+    status, body = invoke(function, {"action": "batch_create", "keys": keys})
+
+    assert status == 207
+    assert (body["succeeded"], body["failed"]) == (5, 1)
+    assert body["results"][-1]["keyName"] == "broken"
+    assert len(fake.keys) == len(fake.plans) == len(fake.links) == 5
+
+
+def test_batch_create_atomic_rolls_back_everything(function) -> None:
+    """
+    atomic の一括作成で1件でも失敗した場合に全てのリソースが削除されることのテスト
+    """
+    fake = function._clients[REGION]
+    fake.fail_key_names = {"broken"}
+    keys = [{"keyName": "ok"}, {"keyName": "broken"}]
+
+    status, body = invoke(
+        function, {"action": "batch_create", "keys": keys, "atomic": True}
+    )
+
+    assert status == 500
+    assert body["leftovers"] == []
+    assert not fake.keys and not fake.plans and not fake.links
+
+
+def test_batch_create_validates_before_creating(function) -> None:
+    """
+    不正な指定がある場合は何も作成せずに 400 を返すことのテスト
+    """
+    keys = [{"keyName": "ok"}, {"keyName": "bad", "quotaPeriod": "YEAR"}]
+
+    status, _ = invoke(function, {"action": "batch_create", "keys": keys})
+
+    assert status == 400
+    assert not function._clients[REGION].keys
+
+
+def test_rotate_list_and_delete(function) -> None:
+    """
+    キーのローテーション・一覧・削除のテスト
+    """
+    fake = function._clients[REGION]
+    _, created = invoke(function, {"action": "create", "keyName": "tenant"})
+
+    status, rotated = invoke(
+        function, {"action": "rotate", "apiKeyId": created["apiKeyId"]}
+    )
+    assert status == 200
+    new_key = rotated["results"][0]
+    assert new_key["usagePlanIds"] == [created["usagePlanId"]]
+    assert created["apiKeyId"] not in fake.keys
+
+    _, listed = invoke(function, {"action": "list"})
+    assert [item["apiKeyId"] for item in listed["items"]] == [new_key["apiKeyId"]]
+
+    status, deleted = invoke(
+        function, {"action": "delete", "apiKeyIds": [new_key["apiKeyId"]]}
+    )
+    assert status == 200
+    assert deleted["results"][0]["deletedUsagePlanIds"] == [created["usagePlanId"]]
+    assert not fake.keys and not fake.plans
+
+
+@pytest.mark.parametrize("delete_old", [True, False])
+def test_rotate_rolls_back_new_key_when_old_key_fails(function, delete_old) -> None:
+    """
+    古いキーの削除・無効化に失敗した場合に、新しいキーを削除して古いキーを残すことのテスト
+    """
+    fake = function._clients[REGION]
+    _, created = invoke(function, {"action": "create", "keyName": "tenant"})
+    old_key_id = created["apiKeyId"]
+    delete_api_key = fake.delete_api_key
+
+    def fail_for_old_key(apiKey):
+        if apiKey == old_key_id:
+            raise RuntimeError("old key is locked")
+        delete_api_key(apiKey)
+
+    def fail_update(apiKey, patchOperations):
+        raise RuntimeError("old key is locked")
+
+    fake.delete_api_key = fail_for_old_key
+    fake.update_api_key = fail_update
+
+    status, rotated = invoke(
+        function, {"action": "rotate", "apiKeyId": old_key_id, "deleteOld": delete_old}
+    )
+    assert status == 500
+    assert "old key is locked" in rotated["results"][0]["error"]
+    assert list(fake.keys) == [old_key_id]
+    assert fake.links == {(created["usagePlanId"], old_key_id)}
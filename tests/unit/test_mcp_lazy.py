@@ -0,0 +1,55 @@
+"""
+MCPサーバー遅延初期化のユニットテスト
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import mcp_server
+from app.presentation.api.example_router import router as example_router
+from app.presentation.mcp.lazy import LazyFastApiMCP
+
+
+def create_lazy_app() -> tuple:
+    """
+    遅延初期化のMCPサーバーをマウントしたアプリケーションを作成
+
+    Returns:
+        tuple: (FastAPIアプリケーション, LazyFastApiMCP)
+    """
+    app = FastAPI()
+    app.include_router(example_router)
+    lazy = LazyFastApiMCP(app)
+    lazy.mount(mount_path="/mcp")
+
+    @app.get("/after-mount")
+    async def after_mount() -> dict:
+        return {}
+
+    return app, lazy
+
+
+def test_rest_requests_do_not_build_mcp_server() -> None:
+    """
+    REST のリクエストではMCPサーバーが構築されないことのテスト
+    """
+    app, lazy = create_lazy_app()
+    client = TestClient(app)
+    assert client.get("/api/examples/").status_code == 200
+    assert not lazy.is_initialized
+
+
+def test_first_mcp_request_builds_server_with_same_tools() -> None:
+    """
+    /mcp への最初のリクエストでMCPサーバーが構築され、即時初期化と同じツールになることのテスト
+    """
+    app, lazy = create_lazy_app()
+    client = TestClient(app)
+    # セッションIDがないため 400 になるが、MCPサーバーは構築される
+    response = client.post("/mcp/messages/", json={})
+    assert response.status_code == 400
+    assert lazy.is_initialized
+
+    tool_names = {tool.name for tool in lazy.get_server().tools}
+    assert "after_mount_after_mount_get" not in tool_names
+    assert tool_names == {tool.name for tool in mcp_server.tools}
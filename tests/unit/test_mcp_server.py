@@ -0,0 +1,86 @@
+"""
+MCPサーバーのユニットテスト
+"""
+
+import asyncio
+import json
+
+import mcp.types as types
+import pytest
+from pydantic import AnyUrl
+
+from app.core.config import settings
+from app.main import mcp_server
+from app.presentation.mcp.resources import EXPORT_RESOURCE_URI
+
+
+def test_get_examples_tool_returns_next_cursor() -> None:
+    """
+    get_examples ツールの結果に次ページのカーソルが含まれることのテスト
+    """
+    result = asyncio.run(
+        mcp_server._execute_api_tool(
+            client=mcp_server._http_client,
+            tool_name="get_examples",
+            arguments={"limit": 1},
+            operation_map=mcp_server.operation_map,
+        )
+    )
+    payload = json.loads(result[0].text)
+    assert len(payload["items"]) == 1
+    assert payload["next_cursor"]
+
+
+def test_get_examples_batch_tool() -> None:
+    """
+    get_examples_batch ツールで複数のサンプルを1回の呼び出しで取得できることのテスト
+    """
+    assert "batch_get_examples" not in mcp_server.operation_map
+    result = asyncio.run(
+        mcp_server._execute_api_tool(
+            client=mcp_server._http_client,
+            tool_name="get_examples_batch",
+            arguments={"ids": "1,2"},
+            operation_map=mcp_server.operation_map,
+        )
+    )
+    payload = json.loads(result[0].text)
+    assert [example["id"] for example in payload["items"]] == [1, 2]
+
+
+def test_export_resource_is_read_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    examples://export リソースをカーソルでたどって全件を読み出せることのテスト
+    """
+    monkeypatch.setattr(settings, "EXAMPLES_EXPORT_CHUNK_SIZE", 2)
+    assert "export_examples" not in mcp_server.operation_map
+    handler = mcp_server.server.request_handlers[types.ReadResourceRequest]
+
+    uri = EXPORT_RESOURCE_URI
+    ids = []
+    while uri is not None:
+        request = types.ReadResourceRequest(
+            method="resources/read", params=types.ReadResourceRequestParams(uri=AnyUrl(uri))
+        )
+        chunk, continuation = asyncio.run(handler(request)).root.contents
+        assert chunk.mimeType == "application/x-ndjson"
+        ids.extend(json.loads(line)["id"] for line in chunk.text.splitlines())
+        uri = json.loads(continuation.text)["next_uri"]
+    assert ids == [1, 2, 3]
+
+
+def test_search_examples_tool() -> None:
+    """
+    search_examples ツールで全文検索できることのテスト
+    """
+    result = asyncio.run(
+        mcp_server._execute_api_tool(
+            client=mcp_server._http_client,
+            tool_name="search_examples",
+            arguments={"q": "example 3", "limit": 1, "fields": "id,name"},
+            operation_map=mcp_server.operation_map,
+        )
+    )
+    payload = json.loads(result[0].text)
+    assert [item["id"] for item in payload] == [3]
+    assert set(payload[0]) == {"id", "name", "score"}
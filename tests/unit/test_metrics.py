@@ -0,0 +1,113 @@
+"""
+メトリクス収集のユニットテスト
+"""
+
+import asyncio
+import json
+from typing import Generator
+
+import mcp.types as types
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import AnyUrl
+
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    MCP_TOOL_DURATION,
+    LatencyHistogram,
+    MetricsRegistry,
+    metrics_registry,
+)
+from app.main import mcp_server
+from app.presentation.mcp.resources import METRICS_RESOURCE_URI
+
+
+@pytest.fixture
+def registry() -> Generator[MetricsRegistry, None, None]:
+    """
+    テストの前後で共有レジストリを空にするフィクスチャ
+    """
+    metrics_registry.clear()
+    yield metrics_registry
+    metrics_registry.clear()
+
+
+def test_histogram_percentiles_are_within_bucket_precision() -> None:
+    """
+    ヒストグラムのパーセンタイルがバケットの精度（1/16）以内であることのテスト
+    """
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value)
+    assert histogram.count == 100_000
+    assert histogram.max_us == 100_000
+    for quantile, expected in ((0.5, 50_000), (0.9, 90_000), (0.99, 99_000)):
+        assert abs(histogram.percentile(quantile) - expected) <= expected / 16
+
+
+def test_registry_limits_series() -> None:
+    """
+    系列数の上限を超えた観測が破棄されることのテスト
+    """
+    registry = MetricsRegistry(max_series=2)
+    for route in ("/a", "/b", "/c"):
+        registry.observe_request("GET", route, 200, "rest", 1_000_000)
+    assert len(registry) == 2
+    assert registry.dropped == 1
+    assert registry.get(HTTP_REQUEST_DURATION, ("GET", "/c", "200", "rest")) is None
+
+
+def test_metrics_endpoint(test_client: TestClient, registry: MetricsRegistry) -> None:
+    """
+    リクエストがルートのパステンプレートごとに記録され、/metrics で出力されることのテスト
+    """
+    test_client.get("/api/examples/1")
+    test_client.get("/api/examples/2")
+    test_client.get("/api/examples/999")
+
+    histogram = registry.get(
+        HTTP_REQUEST_DURATION, ("GET", "/api/examples/{example_id}", "200", "rest")
+    )
+    assert histogram is not None and histogram.count == 2
+    assert registry.get(
+        HTTP_REQUEST_DURATION, ("GET", "/api/examples/{example_id}", "404", "rest")
+    )
+
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds summary" in response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/examples/{example_id}",'
+        'status="200",source="rest"} 2'
+    ) in response.text
+
+
+def test_mcp_tool_metrics_and_resource(registry: MetricsRegistry) -> None:
+    """
+    MCPツールの呼び出しが記録され、MCPリソースとして取得できることのテスト
+    """
+    asyncio.run(
+        mcp_server._execute_api_tool(
+            client=mcp_server._http_client,
+            tool_name="get_example",
+            arguments={"example_id": 1},
+            operation_map=mcp_server.operation_map,
+        )
+    )
+    assert registry.get(MCP_TOOL_DURATION, ("get_example", "ok")) is not None
+    # ツールから呼び出された内部リクエストは source="mcp" として記録される
+    assert registry.get(
+        HTTP_REQUEST_DURATION, ("GET", "/api/examples/{example_id}", "200", "mcp")
+    )
+
+    handler = mcp_server.server.request_handlers[types.ReadResourceRequest]
+    request = types.ReadResourceRequest(
+        method="resources/read",
+        params=types.ReadResourceRequestParams(uri=AnyUrl(METRICS_RESOURCE_URI)),
+    )
+    result = asyncio.run(handler(request))
+    snapshot = json.loads(result.root.contents[0].text)
+    tools = [entry["labels"]["tool"] for entry in snapshot[MCP_TOOL_DURATION]]
+    assert tools == ["get_example"]
+    assert snapshot[MCP_TOOL_DURATION][0]["count"] == 1
@@ -0,0 +1,109 @@
+"""
+OpenAPIドキュメント提供のユニットテスト
+"""
+
+import gzip
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.presentation.api.openapi import (
+    FINGERPRINT_KEY,
+    OpenAPIProvider,
+    generate_openapi_schema,
+    route_fingerprint,
+)
+
+
+def test_openapi_json_is_served_pre_encoded(test_client: TestClient) -> None:
+    """
+    /openapi.json がgzip圧縮・ETag付きで返ることのテスト
+    """
+    response = test_client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["info"][FINGERPRINT_KEY] == route_fingerprint(app)
+
+    response = test_client.get(
+        "/openapi.json", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+    document = app.state.openapi_provider.document()
+    assert gzip.decompress(document.gzip_body) == document.body
+
+
+def test_openapi_json_variants_have_distinct_etags(test_client: TestClient) -> None:
+    """
+    gzip 圧縮と非圧縮のレスポンスが異なるETagを持ち、gzip;q=0 では圧縮しないことのテスト
+    """
+    compressed = test_client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    identity = test_client.get("/openapi.json", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] != compressed.headers["etag"]
+    assert compressed.headers["etag"] == "W/" + identity.headers["etag"]
+
+
+def test_matching_snapshot_is_used(tmp_path: Path) -> None:
+    """
+    ルート定義と一致するスナップショットが採用されることのテスト
+    """
+    snapshot = generate_openapi_schema(app)
+    snapshot["info"]["description"] = "from snapshot"
+    snapshot_path = tmp_path / "openapi.json"
+    snapshot_path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+    provider = OpenAPIProvider(app)
+    original_schema = app.openapi_schema
+    try:
+        assert provider.load_snapshot(str(snapshot_path))
+        assert provider.from_snapshot
+        assert provider.schema()["info"]["description"] == "from snapshot"
+    finally:
+        app.openapi_schema = original_schema
+
+
+def test_eager_mcp_server_uses_snapshot(tmp_path: Path) -> None:
+    """
+    即時初期化（MCP_LAZY_INIT=false）のMCPサーバーがスナップショットからツールを生成することのテスト
+    """
+    snapshot = generate_openapi_schema(app)
+    snapshot["paths"]["/api/examples/{example_id}"]["get"]["description"] = "from snapshot"
+    snapshot_path = tmp_path / "openapi.json"
+    snapshot_path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+    script = (
+        "from app.main import mcp_server\n"
+        "print(next(t.description for t in mcp_server.tools if t.name == 'get_example'))"
+    )
+    env = {**os.environ, "MCP_LAZY_INIT": "false", "OPENAPI_SNAPSHOT_PATH": str(snapshot_path)}
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert "from snapshot" in result.stdout
+
+
+@pytest.mark.parametrize("fingerprint", ["stale", None])
+def test_stale_snapshot_is_rejected(tmp_path: Path, fingerprint: object) -> None:
+    """
+    ルート定義と一致しないスナップショットが採用されないことのテスト
+    """
+    snapshot = generate_openapi_schema(app)
+    if fingerprint is None:
+        del snapshot["info"][FINGERPRINT_KEY]
+    else:
+        snapshot["info"][FINGERPRINT_KEY] = fingerprint
+    snapshot_path = tmp_path / "openapi.json"
+    snapshot_path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+    provider = OpenAPIProvider(app)
+    assert not provider.load_snapshot(str(snapshot_path))
+    assert not provider.from_snapshot
+    assert not provider.load_snapshot(str(tmp_path / "missing.json"))
@@ -0,0 +1,66 @@
+"""
+読み取り専用モードミドルウェアのユニットテスト
+"""
+
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.presentation.middleware.read_only import READ_ONLY_DETAIL
+
+
+@pytest.fixture
+def read_only_mode() -> Generator[None, None, None]:
+    """
+    テスト中のみ読み取り専用モードを有効化するフィクスチャ
+    """
+    original = settings.READ_ONLY_MODE
+    settings.READ_ONLY_MODE = True
+    try:
+        yield
+    finally:
+        settings.READ_ONLY_MODE = original
+
+
+def test_write_methods_are_rejected(test_client: TestClient, read_only_mode: None) -> None:
+    """
+    読み取り専用モードで書き込み系メソッドが 403 で拒否されることのテスト
+    """
+    response = test_client.post(
+        "/mcp/messages/?session_id=unknown", headers={"Origin": "http://example.com"}
+    )
+    assert response.status_code == 403
+    assert response.json() == {"detail": READ_ONLY_DETAIL}
+    # CORSミドルウェアの内側で拒否されるため、403 にもCORSヘッダーが付与される
+    assert "access-control-allow-origin" in response.headers
+
+
+def test_read_methods_pass_through(test_client: TestClient, read_only_mode: None) -> None:
+    """
+    読み取り専用モードでもGETリクエストは処理されることのテスト
+    """
+    response = test_client.get("/api/examples/1")
+    assert response.status_code == 200
+
+
+def test_write_methods_allowed_when_disabled(test_client: TestClient) -> None:
+    """
+    読み取り専用モードが無効な場合は書き込み系メソッドが拒否されないことのテスト
+    """
+    settings_value = settings.READ_ONLY_MODE
+    settings.READ_ONLY_MODE = False
+    try:
+        response = test_client.post("/mcp/messages/?session_id=unknown")
+    finally:
+        settings.READ_ONLY_MODE = settings_value
+    assert response.status_code != 403
+
+
+def test_batch_get_is_allowed(test_client: TestClient, read_only_mode: None) -> None:
+    """
+    読み取り専用モードでもデータを変更しないPOST（一括取得）は拒否されないことのテスト
+    """
+    response = test_client.post("/api/examples:batchGet", json={"ids": [1]})
+    assert response.status_code == 200
@@ -0,0 +1,183 @@
+"""
+非同期リポジトリ（インメモリ / SQLite）のユニットテスト
+"""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Awaitable, Generator, TypeVar
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.example_repository import EXAMPLES, ExampleRepository
+from app.infrastructure.repository import (
+    AsyncExampleRepository,
+    InMemoryAsyncExampleRepository,
+)
+from app.infrastructure.sqlite_repository import SQLiteExampleRepository
+from app.presentation.api import example_router
+
+T = TypeVar("T")
+
+
+def run(awaitable: Awaitable[T]) -> T:
+    async def wrapper() -> T:
+        return await awaitable
+
+    return asyncio.run(wrapper())
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Generator[AsyncExampleRepository, None, None]:
+    """
+    初期データを登録した各実装のリポジトリ
+    """
+    repo: AsyncExampleRepository
+    if request.param == "memory":
+        repo = InMemoryAsyncExampleRepository(ExampleRepository(EXAMPLES))
+    else:
+        repo = SQLiteExampleRepository(str(tmp_path / "examples.db"), pool_size=2)
+    yield repo
+    run(repo.close())
+
+
+def test_get_and_page(repository: AsyncExampleRepository) -> None:
+    """
+    主キーでの取得とキーセットページネーションのテスト
+    """
+    assert run(repository.get(1)) == EXAMPLES[0]
+    assert run(repository.get(999)) is None
+    examples, next_after_id = run(repository.page(2))
+    assert [example["id"] for example in examples] == [1, 2]
+    assert next_after_id == 2
+    examples, next_after_id = run(repository.page(2, after_id=2))
+    assert [example["id"] for example in examples] == [3]
+    assert next_after_id is None
+    examples, _ = run(repository.page(10, name="Example 2"))
+    assert [example["id"] for example in examples] == [2]
+
+
+def test_write_operations(repository: AsyncExampleRepository) -> None:
+    """
+    追加・更新・削除・一括登録のテスト
+    """
+    run(repository.add({"id": 10, "name": "Added", "description": "added"}))
+    with pytest.raises(ValueError):
+        run(repository.add({"id": 10, "name": "Duplicate", "description": ""}))
+    updated = run(repository.update(10, name="Renamed"))
+    assert updated is not None and updated["name"] == "Renamed"
+    assert run(repository.update(999, name="Missing")) is None
+    deleted = run(repository.delete(10))
+    assert deleted is not None and deleted["id"] == 10
+    assert run(repository.delete(10)) is None
+
+    loaded = run(
+        repository.bulk_load(
+            {"id": i, "name": f"Bulk {i}", "description": ""} for i in range(100, 200)
+        )
+    )
+    assert loaded == 100
+    assert run(repository.count()) == len(EXAMPLES) + 100
+
+
+def test_sqlite_persists_and_uses_wal(tmp_path: Path) -> None:
+    """
+    SQLiteのデータが再作成後も保持され、WALモードで開かれることのテスト
+    """
+    path = str(tmp_path / "examples.db")
+    repo = SQLiteExampleRepository(path)
+    run(repo.add({"id": 4, "name": "Example 4", "description": "persisted"}))
+    run(repo.close())
+
+    reopened = SQLiteExampleRepository(path)
+    assert run(reopened.count()) == len(EXAMPLES) + 1
+    assert run(reopened.get(4)) == {"id": 4, "name": "Example 4", "description": "persisted"}
+    run(reopened.close())
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_can_be_used_after_close(tmp_path: Path) -> None:
+    """
+    close() の後のクエリでスレッドプールと接続が作り直されることのテスト（Lambda の再利用）
+    """
+    repo = SQLiteExampleRepository(str(tmp_path / "examples.db"), pool_size=2)
+    assert run(repo.count()) == len(EXAMPLES)
+    run(repo.close())
+    assert run(repo.get(1)) == EXAMPLES[0]
+    run(repo.close())
+    run(repo.close())
+
+
+def test_sqlite_bulk_load_is_atomic(tmp_path: Path) -> None:
+    """
+    一括登録で重複があった場合に全件がロールバックされることのテスト
+    """
+    repo = SQLiteExampleRepository(str(tmp_path / "examples.db"), seed=None)
+    with pytest.raises(ValueError):
+        run(repo.bulk_load([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 1}]))
+    assert run(repo.count()) == 0
+    run(repo.close())
+
+
+def test_router_with_sqlite_backend(
+    test_client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    SQLiteのリポジトリでAPIエンドポイントが動作することのテスト
+    """
+    repo = SQLiteExampleRepository(str(tmp_path / "examples.db"))
+    monkeypatch.setattr(example_router, "async_example_repository", repo)
+    try:
+        response = test_client.get("/api/examples/?limit=2")
+        assert response.status_code == 200
+        assert [example["id"] for example in response.json()] == [1, 2]
+        assert response.headers["x-next-cursor"]
+        assert test_client.get("/api/examples/3").json() == EXAMPLES[2]
+        assert test_client.get("/api/examples/999").status_code == 404
+    finally:
+        run(repo.close())
+
+
+def test_get_many(repository: AsyncExampleRepository) -> None:
+    """
+    複数の主キーでの一括取得のテスト
+    """
+    found, missing = run(repository.get_many([3, 999, 1, 3]))
+    assert [example["id"] for example in found] == [3, 1]
+    assert missing == [999]
+    assert run(repository.get_many([])) == ([], [])
+
+
+def test_iter_chunks(repository: AsyncExampleRepository) -> None:
+    """
+    チャンク単位での全件取得のテスト
+    """
+
+    async def collect() -> list:
+        return [chunk async for chunk in repository.iter_chunks(2)]
+
+    chunks = run(collect())
+    assert [[example["id"] for example in chunk] for chunk in chunks] == [[1, 2], [3]]
+
+
+def test_search_reflects_writes(repository: AsyncExampleRepository) -> None:
+    """
+    全文検索に追加・更新・削除が反映されることのテスト
+    """
+    results = run(repository.search("exam", 10))
+    assert sorted(example["id"] for example, _ in results) == [1, 2, 3]
+
+    run(repository.add({"id": 10, "name": "Widget", "description": "a blue gadget"}))
+    run(repository.update(1, name="Gadget", description="renamed"))
+    run(repository.delete(2))
+
+    results = run(repository.search("gadg", 10))
+    assert [example["id"] for example, _ in results] == [1, 10]
+    assert all(score > 0 for _, score in results)
+    assert [example["id"] for example, _ in run(repository.search("exam", 10))] == [3]
+    assert run(repository.search("  ", 10)) == []
@@ -0,0 +1,73 @@
+"""
+レスポンスキャッシュミドルウェアのユニットテスト
+"""
+
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.infrastructure.example_repository import example_repository
+
+
+@pytest.fixture
+def read_only_mode() -> Generator[None, None, None]:
+    """
+    テスト中のみ読み取り専用モードを有効化するフィクスチャ
+    """
+    original = settings.READ_ONLY_MODE
+    settings.READ_ONLY_MODE = True
+    try:
+        yield
+    finally:
+        settings.READ_ONLY_MODE = original
+
+
+def test_etag_and_not_modified(test_client: TestClient) -> None:
+    """
+    ETagの付与とIf-None-Matchによる304レスポンスのテスト
+    """
+    response = test_client.get("/hello")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = test_client.get("/hello", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = test_client.get("/hello", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_read_only_mode_serves_cached_bytes(
+    test_client: TestClient, read_only_mode: None
+) -> None:
+    """
+    読み取り専用モードではキャッシュしたレスポンスを返し、モード解除で破棄されることのテスト
+    """
+    original_name = example_repository.get(1)["name"]
+    first = test_client.get("/api/examples/1")
+    assert first.status_code == 200
+    try:
+        example_repository.update(1, name="Changed behind the cache")
+        cached = test_client.get("/api/examples/1")
+        assert cached.content == first.content
+        assert cached.headers["etag"] == first.headers["etag"]
+
+        settings.READ_ONLY_MODE = False
+        fresh = test_client.get("/api/examples/1")
+        assert fresh.json()["name"] == "Changed behind the cache"
+        assert fresh.headers["etag"] != first.headers["etag"]
+    finally:
+        example_repository.update(1, name=original_name)
+
+
+def test_errors_are_not_cached(test_client: TestClient, read_only_mode: None) -> None:
+    """
+    エラーレスポンスはキャッシュ・ETag付与の対象外であることのテスト
+    """
+    response = test_client.get("/api/examples/999")
+    assert response.status_code == 404
+    assert "etag" not in response.headers
@@ -0,0 +1,58 @@
+"""
+全文検索の転置インデックスのユニットテスト
+"""
+
+from app.infrastructure.search_index import InvertedIndex, tokenize
+
+
+def test_tokenize_normalizes_case() -> None:
+    """
+    トークン分割で小文字化され、記号で区切られることのテスト
+    """
+    assert tokenize("Hello, World-42!") == ["hello", "world", "42"]
+    assert tokenize(None) == []
+
+
+def test_bm25_ranks_rarer_and_name_matches_higher() -> None:
+    """
+    出現数の少ない語と name での一致が上位になることのテスト
+    """
+    index = InvertedIndex()
+    index.add(1, "Common widget", "common common")
+    index.add(2, "Other", "rare widget")
+    index.add(3, "Rare", "common")
+
+    ranked = [doc_id for doc_id, _ in index.search("rare", 10)]
+    assert ranked == [3, 2]
+    # 複数の検索語は OR で、両方に一致するサンプルが上位になる
+    assert [doc_id for doc_id, _ in index.search("rare widget", 10)][0] == 2
+    assert index.search("missing", 10) == []
+
+
+def test_prefix_matching_and_incremental_updates() -> None:
+    """
+    前方一致で検索でき、置き換え・削除がインデックスに反映されることのテスト
+    """
+    index = InvertedIndex()
+    index.add(1, "Example", "searchable text")
+    index.add(2, "Sample", "search engine")
+
+    assert sorted(doc_id for doc_id, _ in index.search("sear", 10)) == [1, 2]
+    assert index.search("sear", 1)[0][0] in (1, 2)
+
+    index.add(1, "Example", "replaced")
+    assert [doc_id for doc_id, _ in index.search("sear", 10)] == [2]
+    index.remove(2)
+    assert index.search("sear", 10) == []
+    assert len(index) == 1
+    assert index._vocabulary == ["example", "replaced"]
+
+
+def test_search_without_any_tokens() -> None:
+    """
+    全てのドキュメントのトークンが0件（記号のみ・空）でもエラーにならないことのテスト
+    """
+    index = InvertedIndex()
+    index.add(1, "!!!", "")
+    index.add(2, None, "---")
+    assert index.search("example", 10) == []
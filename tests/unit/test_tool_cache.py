@@ -0,0 +1,113 @@
+"""
+MCPツールの結果キャッシュのユニットテスト
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import mcp.types as types
+from pydantic import AnyUrl
+
+from app.core.metrics import MCP_TOOL_DURATION, metrics_registry
+from app.infrastructure.example_repository import example_repository
+from app.main import mcp_server
+from app.presentation.mcp.resources import TOOL_CACHE_RESOURCE_URI
+from app.presentation.mcp.tool_cache import (
+    DEFAULT_TOOL_CACHE_TTLS,
+    ToolResultCache,
+    resolve_tool_cache_ttls,
+    tool_result_cache,
+)
+
+
+def call_tool(tool_name: str, arguments: Dict[str, Any]) -> List[Any]:
+    return asyncio.run(
+        mcp_server._execute_api_tool(
+            client=mcp_server._http_client,
+            tool_name=tool_name,
+            arguments=arguments,
+            operation_map=mcp_server.operation_map,
+        )
+    )
+
+
+def test_ttl_lru_and_canonical_arguments() -> None:
+    """
+    引数の順序に依存しないキー・TTLによる失効・対象外のツール・ツール単位の破棄のテスト
+    """
+    now = [0.0]
+    cache = ToolResultCache({"get_example": 10, "search_examples": 10}, clock=lambda: now[0])
+    key = cache.make_key("search_examples", {"q": "example", "limit": 2})
+    assert key == cache.make_key("search_examples", {"limit": 2, "q": "example"})
+    assert key != cache.make_key("search_examples", {"q": "example", "limit": 2}, "Bearer a")
+    assert not cache.enabled_for("get_examples")
+
+    assert cache.get(key) is None
+    cache.set(key, ["result"], version=0)
+    assert cache.get(key) == ["result"]
+    now[0] = 10.0
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == ({"search_examples": 1}, {"search_examples": 2})
+
+    other = cache.make_key("get_example", {"example_id": 1})
+    cache.set(key, ["result"], version=0)
+    cache.set(other, ["other"], version=0)
+    cache.invalidate("search_examples")
+    assert len(cache) == 1
+    assert cache.get(other) == ["other"]
+
+
+def test_tool_call_is_served_from_cache() -> None:
+    """
+    同じ引数のツール呼び出しがキャッシュから返されることのテスト
+    """
+    metrics_registry.clear()
+    first = call_tool("get_example", {"example_id": 1})
+    second = call_tool("get_example", {"example_id": 1})
+    assert second[0].text == first[0].text
+    assert tool_result_cache.hits["get_example"] >= 1
+    assert metrics_registry.get(MCP_TOOL_DURATION, ("get_example", "ok")).count == 1
+    assert metrics_registry.get(MCP_TOOL_DURATION, ("get_example", "cached")).count == 1
+    metrics_registry.clear()
+
+
+def test_write_invalidates_cached_results() -> None:
+    """
+    リポジトリへの書き込みでキャッシュした結果が使われなくなることのテスト
+    """
+    original_name = example_repository.get(2)["name"]
+    call_tool("get_example", {"example_id": 2})
+    try:
+        example_repository.update(2, name="Renamed")
+        result = call_tool("get_example", {"example_id": 2})
+        assert json.loads(result[0].text)["name"] == "Renamed"
+    finally:
+        example_repository.update(2, name=original_name)
+
+
+def test_tool_cache_resource() -> None:
+    """
+    ヒット数・ミス数がMCPリソースとして取得できることのテスト
+    """
+    call_tool("get_examples_batch", {"ids": "1,2"})
+    call_tool("get_examples_batch", {"ids": "1,2"})
+
+    handler = mcp_server.server.request_handlers[types.ReadResourceRequest]
+    request = types.ReadResourceRequest(
+        method="resources/read",
+        params=types.ReadResourceRequestParams(uri=AnyUrl(TOOL_CACHE_RESOURCE_URI)),
+    )
+    result = asyncio.run(handler(request))
+    stats = json.loads(result.root.contents[0].text)
+    assert stats["entries"] == 1
+    assert stats["tools"]["get_examples_batch"]["hits"] >= 1
+
+
+def test_default_ttls_depend_on_storage() -> None:
+    """
+    複数のプロセスから書き込まれる SQLite では、既定でキャッシュしないことのテスト
+    """
+    assert resolve_tool_cache_ttls(None, "memory") == DEFAULT_TOOL_CACHE_TTLS
+    assert resolve_tool_cache_ttls(None, "sqlite") == {}
+    assert resolve_tool_cache_ttls({"get_example": 5}, "sqlite") == {"get_example": 5}